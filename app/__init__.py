@@ -363,19 +363,42 @@ def _cleanup_stale_jobs(app):
 
 
 def _fix_difficulty_data(app):
-    """One-time fix: clamp problem difficulty values >7 down to 7."""
+    """One-time fix: clamp problem difficulty values >7 down to 7.
+
+    Goes through the ORM rather than a bulk UPDATE so the flush hooks refresh
+    ``Student.max_solved_difficulty`` for students who solved these problems.
+    """
     from app.models import Problem
     try:
-        count = Problem.query.filter(Problem.difficulty > 7).update(
-            {Problem.difficulty: 7}
-        )
-        if count:
+        problems = Problem.query.filter(Problem.difficulty > 7).all()
+        for problem in problems:
+            problem.difficulty = 7
+        if problems:
             db.session.commit()
-            app.logger.info(f'Fixed {count} problems with difficulty > 7')
+            app.logger.info(f'Fixed {len(problems)} problems with difficulty > 7')
     except Exception:
         db.session.rollback()
 
 
+def _rebuild_platform_period_stats(platform):
+    """Rebuild the period stats of every student with a *platform* account.
+
+    The timestamp fixers shift submitted_at with raw SQL, which bypasses the
+    flush hook and can move submissions into another week or month.
+    """
+    from app.models import PlatformAccount
+    from app.models.student_period_stat import rebuild_period_stats
+    student_ids = [
+        row[0]
+        for row in db.session.query(PlatformAccount.student_id)
+        .filter_by(platform=platform)
+        .distinct()
+    ]
+    connection = db.session.connection()
+    for student_id in student_ids:
+        rebuild_period_stats(connection, student_id)
+
+
 def _fix_ybt_timestamps(app):
     """One-time fix: convert existing YBT submitted_at from UTC+8 to UTC."""
     marker = os.path.join(app.instance_path, '.ybt_tz_fixed')
@@ -392,6 +415,7 @@ def _fix_ybt_timestamps(app):
         """))
         count = result.rowcount
         if count:
+            _rebuild_platform_period_stats('ybt')
             db.session.commit()
             app.logger.info(f'Fixed {count} YBT submission timestamps (UTC+8 → UTC)')
         else:
@@ -419,6 +443,7 @@ def _fix_coderlands_timestamps(app):
         """))
         count = result.rowcount
         if count:
+            _rebuild_platform_period_stats('coderlands')
             db.session.commit()
             app.logger.info(f'Fixed {count} Coderlands submission timestamps (UTC+8 → UTC)')
         else:
@@ -473,6 +498,7 @@ def _fix_bbcoj_timestamps(app):
         """))
         count = result.rowcount
         if count:
+            _rebuild_platform_period_stats('bbcoj')
             db.session.commit()
             app.logger.info(f'Fixed {count} BBCOJ submission timestamps (UTC+8 → UTC)')
         else:
@@ -0,0 +1,81 @@
+"""Process-level caches shared by the analysis components.
+
+Entries are keyed by a tuple whose first element is the student id and carry
+a fingerprint of the data they were computed from, so a changed fingerprint
+is a miss. The size bound evicts the oldest entry; the TTL bounds staleness
+across worker processes, which do not see each other's invalidations.
+"""
+from __future__ import annotations
+
+import threading
+import time
+
+from sqlalchemy import case, func
+
+from app.extensions import db
+from app.models import PlatformAccount, Submission
+
+
+class FingerprintCache:
+    """Bounded TTL mapping of key -> (fingerprint, value).
+
+    Args:
+        maxsize: Maximum number of entries kept; the oldest is evicted first.
+        ttl: Seconds an entry stays valid.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: dict[tuple, tuple[object, float, object]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple, fingerprint) -> object | None:
+        """Return the value stored for *key* and *fingerprint*, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != fingerprint or time.monotonic() >= entry[1]:
+                del self._entries[key]
+                return None
+            return entry[2]
+
+    def set(self, key: tuple, fingerprint, value) -> None:
+        """Store *value* for *key*, evicting the oldest entries when full."""
+        with self._lock:
+            self._entries.pop(key, None)
+            while len(self._entries) >= self.maxsize:
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (fingerprint, time.monotonic() + self.ttl, value)
+
+    def invalidate(self, student_id: int | None = None) -> None:
+        """Drop the entries of one student, or every entry."""
+        with self._lock:
+            if student_id is None:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if k[0] == student_id]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def submission_fingerprint(student_id: int) -> tuple:
+    """Cheap summary of a student's submissions for cache validation.
+
+    Adding or removing submissions changes the count or max id; a rejudge
+    between AC and another status changes the AC count.
+    """
+    count, max_id, ac_count = (
+        db.session.query(
+            func.count(Submission.id),
+            func.max(Submission.id),
+            func.sum(case((Submission.status == 'AC', 1), else_=0)),
+        )
+        .join(PlatformAccount, Submission.platform_account_id == PlatformAccount.id)
+        .filter(PlatformAccount.student_id == student_id)
+        .one()
+    )
+    return (count, max_id or 0, ac_count or 0)
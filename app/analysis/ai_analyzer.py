@@ -35,6 +35,7 @@ from .prompts.problem_solution import build_problem_solution_prompt
 from .prompts.problem_full_solution import build_problem_full_solution_prompt
 from .prompts.problem_comprehensive import build_problem_comprehensive_prompt
 from .prompts.submission_review import build_submission_review_prompt
+from .prompts._common import estimate_prompt_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -314,7 +315,7 @@ class AIAnalyzer:
         Returns:
             Tuple of (provider_instance, model_name).
         """
-        from .llm.config import MODEL_CONFIG
+        from .llm.config import get_model_for_tier
 
         # Determine provider name and API key
         user_key_map = {
@@ -350,13 +351,8 @@ class AIAnalyzer:
         provider = get_provider(provider_name, api_key=api_key)
 
         # Pick the right model for the requested tier
-        models = MODEL_CONFIG.get(provider_name, {}).get("models", {})
         target_tier = "basic" if tier == "basic" else "advanced"
-        model = None
-        for m_name, m_info in models.items():
-            if m_info.get("tier") == target_tier:
-                model = m_name
-                break
+        model = get_model_for_tier(provider_name, target_tier)
 
         # Final fallback to explicit config keys
         if not model:
@@ -912,6 +908,11 @@ class AIAnalyzer:
         try:
             provider, model = self._get_llm("basic", user_id=user_id)
             messages = self._inject_images_for_provider(messages, provider.PROVIDER_NAME)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Comprehensive prompt for %s: ~%d input tokens, max_tokens=%d",
+                    problem_id, estimate_prompt_tokens(messages), effective_max_tokens,
+                )
             response = provider.chat(messages, model=model, max_tokens=effective_max_tokens)
         except Exception as e:
             is_rate_limit = _ZHIPU_RATE_LIMIT_ERRORS and isinstance(e, _ZHIPU_RATE_LIMIT_ERRORS)
@@ -984,7 +985,7 @@ class AIAnalyzer:
                     f"retrying with reformat instruction "
                     f"(content preview: {response.content[:300]!r})"
                 )
-                retry_messages = messages + [
+                retry_messages = list(messages) + [
                     {"role": "assistant", "content": response.content},
                     {"role": "user", "content": (
                         "你的分析内容很好，但输出格式不正确。"
@@ -4,13 +4,16 @@ Core statistics engine for computing student metrics.
 Provides all the statistical computations needed for dashboards, reports,
 radar charts, heatmaps, and other analytical views.
 """
+from __future__ import annotations
 
 import json
 from datetime import datetime, timedelta
 from collections import Counter, defaultdict
 
+from sqlalchemy.orm import selectinload
+
 from app.extensions import db
-from app.models import Student, Submission, Problem, Tag, PlatformAccount
+from app.models import Student, Submission, Problem, PlatformAccount
 
 
 # Stage-adaptive 5-factor weights: (count, pass_rate, difficulty, first_ac, efficiency)
@@ -37,16 +40,17 @@ class AnalysisEngine:
     def __init__(self, student_id: int):
         self.student_id = student_id
         self._submissions = None
+        self._tag_scores: dict[int | None, dict] = {}
 
     @property
     def submissions(self):
         """Lazy-loaded list of all submissions for this student, newest first."""
         if self._submissions is None:
             account_ids = [
-                a.id
-                for a in PlatformAccount.query.filter_by(
-                    student_id=self.student_id
-                ).all()
+                row[0]
+                for row in PlatformAccount.query.with_entities(PlatformAccount.id)
+                .filter_by(student_id=self.student_id)
+                .all()
             ]
             if account_ids:
                 self._submissions = (
@@ -198,8 +202,11 @@ class AnalysisEngine:
         recent = [
             s for s in self.submissions if s.submitted_at and s.submitted_at >= since
         ]
-        daily = Counter(s.submitted_at.strftime("%Y-%m-%d") for s in recent)
-        return [{"date": k, "count": v} for k, v in sorted(daily.items())]
+        # Bucket on date objects; format only the distinct days at output
+        daily = Counter(s.submitted_at.date() for s in recent)
+        return [
+            {"date": d.isoformat(), "count": v} for d, v in sorted(daily.items())
+        ]
 
     @staticmethod
     def _time_decay(submitted_at):
@@ -219,10 +226,19 @@ class AnalysisEngine:
 
         Features time-decayed metrics and stage-adaptive weighting.
 
+        Results are memoized per ``max_stage`` for the lifetime of the engine,
+        like ``submissions``, so components sharing an engine score once.
+
         Returns:
             Dict mapping tag_name to dict with keys: score, display_name, stage,
             solved, attempted, pass_rate, first_ac_rate, avg_attempts, recent_activity.
         """
+        if max_stage not in self._tag_scores:
+            self._tag_scores[max_stage] = self._compute_tag_scores(max_stage)
+        return self._tag_scores[max_stage]
+
+    def _compute_tag_scores(self, max_stage: int | None) -> dict:
+        """Score every attempted tag from the loaded submissions."""
         now = datetime.utcnow()
         thirty_days_ago = now - timedelta(days=30)
 
@@ -252,8 +268,18 @@ class AnalysisEngine:
             }
         )
 
+        # Load every attempted problem with its tags in two queries instead
+        # of one query per problem plus one per problem's tag list
+        problems = {
+            p.id: p
+            for p in Problem.query.filter(
+                Problem.id.in_(problem_submissions)
+            ).options(selectinload(Problem.tags))
+        } if problem_submissions else {}
+        tags_by_name = {}
+
         for prob_id, subs in problem_submissions.items():
-            problem = Problem.query.get(prob_id)
+            problem = problems.get(prob_id)
             if not problem:
                 continue
             tags = problem.tags
@@ -264,28 +290,29 @@ class AnalysisEngine:
                 subs,
                 key=lambda x: x.submitted_at if x.submitted_at else datetime.min,
             )
-            has_ac = any(s.status == "AC" for s in subs_sorted)
-            first_is_ac = subs_sorted[0].status == "AC" if subs_sorted else False
-            attempts_to_ac = 0
-            if has_ac:
-                for i, s in enumerate(subs_sorted):
-                    if s.status == "AC":
-                        attempts_to_ac = i + 1
-                        break
+            statuses = [s.status for s in subs_sorted]
+            total_subs = len(statuses)
+            ac_subs = statuses.count("AC")
+            has_ac = ac_subs > 0
+            first_is_ac = statuses[0] == "AC"
+            attempts_to_ac = statuses.index("AC") + 1 if has_ac else 0
 
             # Time decay based on most recent submission for this problem
             most_recent = subs_sorted[-1].submitted_at if subs_sorted else None
             decay = self._time_decay(most_recent)
             is_recent = most_recent and most_recent >= thirty_days_ago
 
+            # Per-problem values are computed once above and shared by all
+            # of the problem's tags
             for tag in tags:
+                tags_by_name[tag.name] = tag
                 stats = tag_stats[tag.name]
                 stats["attempted"] += 1
-                stats["total_subs"] += len(subs)
-                stats["ac_subs"] += sum(1 for s in subs if s.status == "AC")
+                stats["total_subs"] += total_subs
+                stats["ac_subs"] += ac_subs
                 stats["weighted_attempted"] += decay
-                stats["weighted_total_subs"] += len(subs) * decay
-                stats["weighted_ac_subs"] += sum(1 for s in subs if s.status == "AC") * decay
+                stats["weighted_total_subs"] += total_subs * decay
+                stats["weighted_ac_subs"] += ac_subs * decay
                 if is_recent:
                     stats["has_recent"] = True
                 if has_ac:
@@ -303,9 +330,7 @@ class AnalysisEngine:
 
         result = {}
         for tag_name, stats in tag_stats.items():
-            tag = Tag.query.filter_by(name=tag_name).first()
-            if not tag:
-                continue
+            tag = tags_by_name[tag_name]
             if max_stage and tag.stage:
                 if tag.stage > max_stage:
                     continue
@@ -72,7 +72,7 @@ class KnowledgeAnalyzer:
 
         # Step 2: Analyze weaknesses
         yield {"step": "weakness", "message": "正在分析薄弱知识点..."}
-        weaknesses = WeaknessDetector(self.student_id).detect()
+        weaknesses = WeaknessDetector(self.student_id, self.engine).detect()
 
         # Step 2.5: Collect submission review insights
         submission_insights = self._collect_submission_insights()
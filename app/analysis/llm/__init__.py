@@ -6,6 +6,7 @@ Providers are auto-discovered from modules in this package.
 """
 
 import logging
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -18,9 +19,13 @@ def register_provider(cls):
     return cls
 
 
+@lru_cache(maxsize=16)
 def get_provider(name: str, api_key: str = None):
     """Get an instantiated LLM provider by name.
 
+    Instances are cached per (name, api_key) so repeated calls reuse the
+    SDK client and its HTTP connection pool instead of building new ones.
+
     Args:
         name: Provider name (e.g. 'claude', 'openai', 'zhipu').
         api_key: Optional API key override.
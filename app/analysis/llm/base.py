@@ -4,6 +4,7 @@ Base classes for LLM providers.
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from dataclasses import dataclass, field
 
 
@@ -55,6 +56,32 @@ class BaseLLMProvider(ABC):
         """
         ...
 
+    def chat_stream(
+        self,
+        messages: list,
+        model: str = None,
+        max_tokens: int = 4096,
+        temperature: float = 0,
+    ) -> Iterator[str]:
+        """Stream a chat completion as text chunks.
+
+        Providers whose SDK supports server-sent events override this. The
+        default falls back to a single blocking ``chat`` call and yields its
+        content as one chunk.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content' keys.
+            model: Model identifier. If None, uses provider default.
+            max_tokens: Maximum tokens in the response.
+            temperature: Sampling temperature (0 = deterministic).
+
+        Yields:
+            Successive pieces of the response text.
+        """
+        yield self.chat(
+            messages, model=model, max_tokens=max_tokens, temperature=temperature,
+        ).content
+
     @abstractmethod
     def list_models(self) -> list[str]:
         """Return a list of available model identifiers for this provider."""
@@ -8,6 +8,7 @@ from __future__ import annotations
 
 import logging
 import time
+from collections.abc import Iterator
 
 from .base import BaseLLMProvider, LLMResponse
 from .config import MODEL_CONFIG
@@ -91,25 +92,7 @@ class ClaudeProvider(BaseLLMProvider):
         """
         client = self._ensure_client()
         model = model or DEFAULT_MODEL
-
-        # Extract system message if present
-        system_message = None
-        chat_messages = []
-        for msg in messages:
-            if msg.get("role") == "system":
-                system_message = msg["content"]
-            else:
-                chat_messages.append(msg)
-
-        # Build request kwargs
-        kwargs = {
-            "model": model,
-            "max_tokens": max_tokens,
-            "messages": chat_messages,
-            "temperature": temperature,
-        }
-        if system_message:
-            kwargs["system"] = system_message
+        kwargs = self._request_kwargs(messages, model, max_tokens, temperature)
 
         start_time = time.time()
         response = client.messages.create(**kwargs)
@@ -136,6 +119,54 @@ class ClaudeProvider(BaseLLMProvider):
             finish_reason=response.stop_reason or "",
         )
 
+    def chat_stream(
+        self,
+        messages: list,
+        model: str = None,
+        max_tokens: int = 4096,
+        temperature: float = 0,
+    ) -> Iterator[str]:
+        """Stream a chat completion from Claude as text chunks.
+
+        Args:
+            messages: List of message dicts, as for ``chat``.
+            model: Model identifier. Defaults to claude-haiku-4-5.
+            max_tokens: Maximum tokens in the response.
+            temperature: Sampling temperature (0 = deterministic).
+
+        Yields:
+            Successive pieces of the response text.
+        """
+        client = self._ensure_client()
+        kwargs = self._request_kwargs(
+            messages, model or DEFAULT_MODEL, max_tokens, temperature,
+        )
+        with client.messages.stream(**kwargs) as stream:
+            yield from stream.text_stream
+
+    @staticmethod
+    def _request_kwargs(
+        messages: list, model: str, max_tokens: int, temperature: float,
+    ) -> dict:
+        """Build Messages API kwargs, lifting any 'system' message out."""
+        system_message = None
+        chat_messages = []
+        for msg in messages:
+            if msg.get("role") == "system":
+                system_message = msg["content"]
+            else:
+                chat_messages.append(msg)
+
+        kwargs = {
+            "model": model,
+            "max_tokens": max_tokens,
+            "messages": chat_messages,
+            "temperature": temperature,
+        }
+        if system_message:
+            kwargs["system"] = system_message
+        return kwargs
+
     def list_models(self) -> list[str]:
         """Return available Claude model identifiers."""
         return ["claude-haiku-4-5", "claude-opus-4-6"]
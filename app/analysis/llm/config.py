@@ -5,6 +5,8 @@ Prices are per million tokens in USD.
 """
 from __future__ import annotations
 
+from functools import lru_cache
+
 MODEL_CONFIG = {
     "claude": {
         "max_concurrency": 4,
@@ -63,6 +65,26 @@ def get_model_pricing(provider: str, model: str) -> dict | None:
     return provider_config.get("models", {}).get(model)
 
 
+@lru_cache(maxsize=None)
+def get_model_for_tier(provider: str, tier: str) -> str | None:
+    """Return the first model of *provider* in the given tier.
+
+    ``MODEL_CONFIG`` is static, so the lookup is memoized.
+
+    Args:
+        provider: Provider name (e.g. 'claude', 'openai', 'zhipu').
+        tier: 'basic' or 'advanced'.
+
+    Returns:
+        Model identifier, or None if the provider has no model in that tier.
+    """
+    models = MODEL_CONFIG.get(provider, {}).get("models", {})
+    for model_name, model_info in models.items():
+        if model_info.get("tier") == tier:
+            return model_name
+    return None
+
+
 def get_all_models_for_provider(provider: str) -> list[str]:
     """Return all model identifiers for a given provider."""
     provider_config = MODEL_CONFIG.get(provider, {})
@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import logging
 import time
+from collections.abc import Iterator
 
 from .base import BaseLLMProvider, LLMResponse
 from .config import MODEL_CONFIG
@@ -118,6 +119,36 @@ class OpenAIProvider(BaseLLMProvider):
             finish_reason=choice.finish_reason or "",
         )
 
+    def chat_stream(
+        self,
+        messages: list,
+        model: str = None,
+        max_tokens: int = 4096,
+        temperature: float = 0,
+    ) -> Iterator[str]:
+        """Stream a chat completion from OpenAI as text chunks.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content' keys.
+            model: Model identifier. Defaults to gpt-4.1-mini.
+            max_tokens: Maximum tokens in the response.
+            temperature: Sampling temperature (0 = deterministic).
+
+        Yields:
+            Successive pieces of the response text.
+        """
+        client = self._ensure_client()
+        stream = client.chat.completions.create(
+            model=model or DEFAULT_MODEL,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True,
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
     def list_models(self) -> list[str]:
         """Return available OpenAI model identifiers."""
         return ["gpt-4.1-mini", "gpt-5.2"]
@@ -0,0 +1,62 @@
+"""
+Shared helpers for prompt builders.
+"""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+# Knowledge stage display names, indexed by stage number (1-6).
+STAGE_NAMES = (None, "语法基础", "基础算法", "CSP-J", "CSP-S", "省选", "NOI")
+
+# One match ~= one token: a single CJK character, an ASCII word, a run of up
+# to three digits, or any other non-space character (punctuation, symbols).
+_TOKEN_RE = re.compile(r'[\u3400-\u9fff\uf900-\ufaff]|[A-Za-z]+|\d{1,3}|\S')
+
+
+def stage_name(stage: int | None, default: str) -> str:
+    """Return the display name of *stage*, or *default* if it is unknown."""
+    if isinstance(stage, int) and 0 < stage < len(STAGE_NAMES):
+        return STAGE_NAMES[stage]
+    return default
+
+
+@lru_cache(maxsize=256)
+def student_header(name: str, age: int | None, grade: str | None) -> str:
+    """Return the "学生：名字，N岁，年级" banner line used by prompts.
+
+    Cached because batch jobs render many prompts for the same student.
+    """
+    age_part = f"，{age}岁" if age else ""
+    grade_part = f"，{grade}" if grade else ""
+    return f"学生：{name}{age_part}{grade_part}"
+
+
+def estimate_tokens(text: str | None) -> int:
+    """Roughly estimate the LLM token count of *text*.
+
+    Uses a single precompiled regex instead of a tokenizer, which is close
+    enough for budget pre-checks and logging on mixed Chinese/English
+    prompts (where ``len(text) / 4`` badly undercounts Chinese).
+    """
+    if not text:
+        return 0
+    return sum(1 for _ in _TOKEN_RE.finditer(text))
+
+
+def estimate_prompt_tokens(messages) -> int:
+    """Estimate the total token count of a list of chat messages.
+
+    Handles both plain string content and multimodal block lists (only
+    ``text`` blocks are counted).
+    """
+    total = 0
+    for msg in messages:
+        content = msg.get('content', '')
+        if isinstance(content, str):
+            total += estimate_tokens(content)
+        else:
+            for block in content:
+                if block.get('type') == 'text':
+                    total += estimate_tokens(block.get('text'))
+    return total
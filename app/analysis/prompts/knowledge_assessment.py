@@ -6,6 +6,100 @@ tag scores, stage progress, and weakness data.
 """
 from __future__ import annotations
 
+import io
+from itertools import islice
+
+from ._common import stage_name, student_header
+
+_STAGE_IDS = range(1, 7)
+
+# Static output spec (JSON schema + requirements) appended to every prompt.
+_OUTPUT_SPEC = """
+请严格按以下 JSON 格式返回评估结果（不要包含任何 JSON 以外的文字）：
+```json
+{
+  "overall_level": "当前整体水平的简短描述，如：CSP-J 入门阶段",
+  "summary": "整体评价，2-3句话概括学生的学习状态和进度",
+  "strengths": ["优势1", "优势2", "优势3"],
+  "weaknesses": ["不足1", "不足2", "不足3"],
+  "stage_assessments": {
+    "1": "对语法基础阶段的简短评价",
+    "2": "对基础算法阶段的简短评价"
+  },
+  "training_plan": [
+    {"priority": 1, "tag": "知识点英文名", "tag_display": "知识点中文名", "suggestion": "具体训练建议"},
+    {"priority": 2, "tag": "知识点英文名", "tag_display": "知识点中文名", "suggestion": "具体训练建议"}
+  ],
+  "next_milestone": "建议的下一个学习目标",
+  "encouragement": "对学生近期学习的鼓励，1-2句话，要具体提到实际进步",
+  "contest_preparation": [
+    {"contest": "赛事名称", "days_until": 天数, "advice": "针对性备赛建议"}
+  ]
+}
+```
+
+要求：
+1. stage_assessments 只包含学生已有涉及的阶段
+2. training_plan 按优先级排列，最多5条
+3. 评价要结合学生年龄/年级，给出适龄的建议
+4. 语气专业但鼓励，面向家长阅读
+5. encouragement 要具体提到学生的实际进步，肯定努力
+6. 如有近期赛事，结合当前水平给出针对性备赛建议；无赛事时 contest_preparation 返回空数组 []
+7. 如有上次评估结果，对比分析进步和变化
+8. 如有AI代码分析洞察，结合代码审查中发现的具体优缺点来评估知识掌握程度"""
+
+_NO_PREVIOUS_SECTION = """
+## 上次分析的关键发现
+(首次分析，无历史数据)
+"""
+
+
+def _render_previous(
+    previous_assessment: dict | None, previous_findings: list | None,
+) -> str:
+    """Render the previous-analysis section of the prompt.
+
+    Prefers the full previous assessment, falls back to its key findings,
+    and returns a constant placeholder on the first analysis.
+    """
+    if not (previous_assessment or previous_findings):
+        return _NO_PREVIOUS_SECTION
+
+    if previous_assessment:
+        plan_lines = [
+            f"  - {item.get('tag_display', item.get('tag', ''))}: "
+            f"{item.get('suggestion', '')}"
+            for item in islice(previous_assessment.get("training_plan") or (), 3)
+        ]
+        plan_text = "\n".join(plan_lines) if plan_lines else "  (无)"
+        return f"""
+## 上次评估结果
+- 整体水平: {previous_assessment.get("overall_level", "")}
+- 总结: {previous_assessment.get("summary", "")}
+- 训练建议 (前3条):
+{plan_text}
+"""
+
+    findings_text = "\n".join(f"- {f}" for f in previous_findings)
+    return f"""
+## 上次分析的关键发现
+{findings_text}
+"""
+
+
+def _render_recent(recent_stats: dict | None) -> str:
+    """Render the recent-activity section, or an empty string if absent."""
+    if not recent_stats:
+        return ""
+    return f"""
+## 近期做题情况（自上次分析以来）
+- 提交次数: {recent_stats.get('submissions', 0)}
+- AC 次数: {recent_stats.get('ac_count', 0)}
+- 新解决题目: {recent_stats.get('unique_solved', 0)}
+- 活跃天数: {recent_stats.get('active_days', 0)}
+- 通过率: {recent_stats.get('pass_rate', 0)}%
+"""
+
 
 def build_knowledge_assessment_prompt(
     student_name: str,
@@ -20,7 +114,7 @@ def build_knowledge_assessment_prompt(
     recent_stats: dict | None = None,
     upcoming_contests: list[dict] | None = None,
     submission_insights: list[dict] | None = None,
-) -> list[dict]:
+) -> tuple[dict, ...]:
     """Build prompt messages for knowledge assessment.
 
     Args:
@@ -38,183 +132,84 @@ def build_knowledge_assessment_prompt(
         submission_insights: List of per-tag code review insights, or None.
 
     Returns:
-        List of message dicts suitable for LLM chat API.
+        Tuple of message dicts suitable for LLM chat API.
     """
-    age_part = f"，{student_age}岁" if student_age else ""
-    grade_part = f"，{student_grade}" if student_grade else ""
-
-    stage_names = {
-        1: "语法基础", 2: "基础算法", 3: "CSP-J",
-        4: "CSP-S", 5: "省选", 6: "NOI",
-    }
-
-    # Format stage progress
-    stage_lines = []
-    for sid in range(1, 7):
-        s = stage_stats.get(sid, stage_stats.get(str(sid), {}))
-        if not s:
-            continue
-        stage_lines.append(
-            f"- {stage_names.get(sid, f'阶段{sid}')}: "
-            f"覆盖率 {s.get('coverage', 0)}%, "
-            f"掌握率 {s.get('mastery', 0)}%, "
-            f"涉及 {s.get('involved', 0)}/{s.get('total', 0)} 个知识点, "
-            f"掌握 {s.get('mastered', 0)} 个"
-        )
-    stage_text = "\n".join(stage_lines) if stage_lines else "(无阶段数据)"
-
-    # Format top knowledge points
-    top_lines = []
-    for t in top_tags[:20]:
-        top_lines.append(
-            f"- {t['display_name']} (阶段{t['stage']}): "
-            f"评分 {t['score']}, 通过率 {t['pass_rate']}%, "
-            f"已解 {t['solved']}/{t['attempted']} 题"
-        )
-    top_text = "\n".join(top_lines) if top_lines else "(无知识点数据)"
-
-    # Format weaknesses
-    weak_lines = []
-    for w in weak_tags[:15]:
-        weak_lines.append(
-            f"- [{w['severity']}] {w['display_name']} (阶段{w['stage']}): "
-            f"{w['reason']}"
-        )
-    weak_text = "\n".join(weak_lines) if weak_lines else "(无明显薄弱点)"
-
-    # Format basic stats
-    stats_text = (
+    # All sections are streamed into a single buffer instead of being built
+    # as separate strings and concatenated by one large f-string.
+    buf = io.StringIO()
+    w = buf.write
+
+    w("你是一位资深信息学竞赛教练，请基于以下数据对学生的知识掌握情况进行综合评估。\n\n")
+    w(student_header(student_name, student_age, student_grade))
+    w("\n\n")
+
+    # Basic stats
+    w("## 总体统计\n")
+    w(
         f"总提交 {basic_stats.get('total_submissions', 0)} 次, "
         f"AC {basic_stats.get('ac_submissions', 0)} 次, "
         f"尝试 {basic_stats.get('unique_attempted', 0)} 题, "
         f"解决 {basic_stats.get('unique_solved', 0)} 题, "
-        f"通过率 {basic_stats.get('pass_rate', 0)}%"
+        f"通过率 {basic_stats.get('pass_rate', 0)}%\n\n"
     )
 
-    # Format previous assessment (full context, not just findings)
-    prev_section = ""
-    if previous_assessment:
-        prev_level = previous_assessment.get("overall_level", "")
-        prev_summary = previous_assessment.get("summary", "")
-        prev_plan_lines = []
-        for item in (previous_assessment.get("training_plan") or [])[:3]:
-            tag_display = item.get("tag_display", item.get("tag", ""))
-            suggestion = item.get("suggestion", "")
-            prev_plan_lines.append(f"  - {tag_display}: {suggestion}")
-        prev_plan_text = "\n".join(prev_plan_lines) if prev_plan_lines else "  (无)"
-
-        prev_section = f"""
-## 上次评估结果
-- 整体水平: {prev_level}
-- 总结: {prev_summary}
-- 训练建议 (前3条):
-{prev_plan_text}
-"""
-    elif previous_findings:
-        prev_text = "\n".join(f"- {f}" for f in previous_findings)
-        prev_section = f"""
-## 上次分析的关键发现
-{prev_text}
-"""
-    else:
-        prev_section = """
-## 上次分析的关键发现
-(首次分析，无历史数据)
-"""
+    # Stage progress (skip the per-stage lookups entirely when there is no data)
+    stage_rows = (
+        (sid, stage_stats.get(sid, stage_stats.get(str(sid))))
+        for sid in _STAGE_IDS
+    ) if stage_stats else ()
+    stage_lines = [
+        f"- {stage_name(sid, f'阶段{sid}')}: "
+        f"覆盖率 {s.get('coverage', 0)}%, "
+        f"掌握率 {s.get('mastery', 0)}%, "
+        f"涉及 {s.get('involved', 0)}/{s.get('total', 0)} 个知识点, "
+        f"掌握 {s.get('mastered', 0)} 个"
+        for sid, s in stage_rows if s
+    ]
+    w("## 各阶段进度\n")
+    w("\n".join(stage_lines) or "(无阶段数据)")
+
+    # Top knowledge points
+    top_lines = [
+        f"- {t['display_name']} (阶段{t['stage']}): "
+        f"评分 {t['score']}, 通过率 {t['pass_rate']}%, "
+        f"已解 {t['solved']}/{t['attempted']} 题"
+        for t in islice(top_tags, 20)
+    ]
+    w("\n\n## 知识点评分 TOP 20（按能力评分排序）\n")
+    w("\n".join(top_lines) or "(无知识点数据)")
+
+    # Weaknesses
+    weak_lines = [
+        f"- [{wk['severity']}] {wk['display_name']} (阶段{wk['stage']}): "
+        f"{wk['reason']}"
+        for wk in islice(weak_tags, 15)
+    ]
+    w("\n\n## 薄弱知识点\n")
+    w("\n".join(weak_lines) or "(无明显薄弱点)")
+    w("\n")
 
-    # Format recent stats
-    recent_section = ""
-    if recent_stats:
-        recent_section = f"""
-## 近期做题情况（自上次分析以来）
-- 提交次数: {recent_stats.get('submissions', 0)}
-- AC 次数: {recent_stats.get('ac_count', 0)}
-- 新解决题目: {recent_stats.get('unique_solved', 0)}
-- 活跃天数: {recent_stats.get('active_days', 0)}
-- 通过率: {recent_stats.get('pass_rate', 0)}%
-"""
+    w(_render_previous(previous_assessment, previous_findings))
+    w(_render_recent(recent_stats))
 
-    # Format submission insights
-    insights_section = ""
+    # Submission insights
     if submission_insights:
-        insight_lines = []
+        w("\n## AI 代码分析洞察（基于学生代码审查）\n")
         for ins in submission_insights:
-            parts = [f"- {ins['tag_display']} (阶段{ins['stage']})"]
+            w(f"- {ins['tag_display']} (阶段{ins['stage']})\n")
             if ins.get('strengths'):
-                parts.append(f"  优点: {'; '.join(ins['strengths'][:3])}")
+                w(f"  优点: {'; '.join(islice(ins['strengths'], 3))}\n")
             if ins.get('issues'):
-                parts.append(f"  问题: {'; '.join(ins['issues'][:3])}")
+                w(f"  问题: {'; '.join(islice(ins['issues'], 3))}\n")
             if ins.get('mastery_level'):
-                parts.append(f"  掌握度: {ins['mastery_level']}")
-            insight_lines.append("\n".join(parts))
-        insights_section = f"""
-## AI 代码分析洞察（基于学生代码审查）
-{chr(10).join(insight_lines)}
-"""
+                w(f"  掌握度: {ins['mastery_level']}\n")
 
-    # Format upcoming contests
-    contest_section = ""
+    # Upcoming contests
     if upcoming_contests:
-        contest_lines = []
+        w("\n## 近期重要赛事\n")
         for c in upcoming_contests:
-            contest_lines.append(
-                f"- {c['name']} ({c['date']}, 距今 {c['days_until']} 天): {c['description']}"
-            )
-        contest_section = f"""
-## 近期重要赛事
-{chr(10).join(contest_lines)}
-"""
-
-    return [
-        {
-            "role": "user",
-            "content": f"""你是一位资深信息学竞赛教练，请基于以下数据对学生的知识掌握情况进行综合评估。
-
-学生：{student_name}{age_part}{grade_part}
-
-## 总体统计
-{stats_text}
-
-## 各阶段进度
-{stage_text}
+            w(f"- {c['name']} ({c['date']}, 距今 {c['days_until']} 天): {c['description']}\n")
 
-## 知识点评分 TOP 20（按能力评分排序）
-{top_text}
+    w(_OUTPUT_SPEC)
 
-## 薄弱知识点
-{weak_text}
-{prev_section}{recent_section}{insights_section}{contest_section}
-请严格按以下 JSON 格式返回评估结果（不要包含任何 JSON 以外的文字）：
-```json
-{{
-  "overall_level": "当前整体水平的简短描述，如：CSP-J 入门阶段",
-  "summary": "整体评价，2-3句话概括学生的学习状态和进度",
-  "strengths": ["优势1", "优势2", "优势3"],
-  "weaknesses": ["不足1", "不足2", "不足3"],
-  "stage_assessments": {{
-    "1": "对语法基础阶段的简短评价",
-    "2": "对基础算法阶段的简短评价"
-  }},
-  "training_plan": [
-    {{"priority": 1, "tag": "知识点英文名", "tag_display": "知识点中文名", "suggestion": "具体训练建议"}},
-    {{"priority": 2, "tag": "知识点英文名", "tag_display": "知识点中文名", "suggestion": "具体训练建议"}}
-  ],
-  "next_milestone": "建议的下一个学习目标",
-  "encouragement": "对学生近期学习的鼓励，1-2句话，要具体提到实际进步",
-  "contest_preparation": [
-    {{"contest": "赛事名称", "days_until": 天数, "advice": "针对性备赛建议"}}
-  ]
-}}
-```
-
-要求：
-1. stage_assessments 只包含学生已有涉及的阶段
-2. training_plan 按优先级排列，最多5条
-3. 评价要结合学生年龄/年级，给出适龄的建议
-4. 语气专业但鼓励，面向家长阅读
-5. encouragement 要具体提到学生的实际进步，肯定努力
-6. 如有近期赛事，结合当前水平给出针对性备赛建议；无赛事时 contest_preparation 返回空数组 []
-7. 如有上次评估结果，对比分析进步和变化
-8. 如有AI代码分析洞察，结合代码审查中发现的具体优缺点来评估知识掌握程度""",
-        }
-    ]
+    return ({"role": "user", "content": buf.getvalue()},)
@@ -6,6 +6,8 @@ narrative report with sections, suitable for direct display to parents.
 """
 from __future__ import annotations
 
+from ._common import student_header
+
 
 def build_periodic_report_prompt(
     period_type: str,
@@ -18,7 +20,7 @@ def build_periodic_report_prompt(
     student_name: str,
     student_age: int | None = None,
     student_grade: str | None = None,
-) -> list[dict]:
+) -> tuple[dict, ...]:
     """Build prompt messages for generating a parent-facing report.
 
     Args:
@@ -34,17 +36,14 @@ def build_periodic_report_prompt(
         student_grade: Student's grade level, or None.
 
     Returns:
-        List of message dicts suitable for LLM chat API.
+        Tuple of message dicts suitable for LLM chat API.
     """
-    age_part = f"，{student_age}岁" if student_age else ""
-    grade_part = f"，{student_grade}" if student_grade else ""
-
-    return [
+    return (
         {
             "role": "user",
             "content": f"""你是一位信息学竞赛教练，请为家长生成一份{period_type}学习报告。
 
-学生：{student_name}{age_part}{grade_part}
+{student_header(student_name, student_age, student_grade)}
 
 ## 本期统计 ({period_start} 至 {period_end})
 {stats}
@@ -74,5 +73,5 @@ def build_periodic_report_prompt(
 - 用 `- 列表项` 列出建议和要点
 - 段落间用空行分隔
 - 不要使用 `---` 分割线""",
-        }
-    ]
+        },
+    )
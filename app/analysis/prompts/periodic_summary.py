@@ -17,7 +17,7 @@ def build_periodic_summary_prompt(
     previous_summary: str | None = None,
     student_age: int | None = None,
     student_grade: str | None = None,
-) -> list[dict]:
+) -> tuple[dict, ...]:
     """Build prompt messages for periodic summary analysis.
 
     Args:
@@ -32,7 +32,7 @@ def build_periodic_summary_prompt(
         student_grade: Student's grade level.
 
     Returns:
-        List of message dicts suitable for LLM chat API.
+        Tuple of message dicts suitable for LLM chat API.
     """
     prev_context = ""
     if previous_summary:
@@ -42,7 +42,7 @@ def build_periodic_summary_prompt(
     if student_age and student_grade:
         age_context = f"\n学生信息：{student_age}岁，{student_grade}\n"
 
-    return [
+    return (
         {
             "role": "user",
             "content": f"""你是一位信息学竞赛教练，请对学生的{period_type}学习情况进行综合分析。
@@ -68,5 +68,5 @@ def build_periodic_summary_prompt(
   "specific_recommendations": ["具体练习建议"],
   "encouragement": "给学生的鼓励语"
 }}""",
-        }
-    ]
+        },
+    )
@@ -10,15 +10,71 @@ from __future__ import annotations
 
 import time
 
+from sqlalchemy import event
+
 from app.models import Tag
+from ._common import stage_name
 
-# Simple TTL cache for tag reference text
+# Simple TTL cache for tag reference text. Writes to Tag in this process
+# invalidate it immediately; the TTL bounds staleness across workers.
 _tag_ref_cache: dict[str, object] = {'text': '', 'expires_at': 0.0}
 _TAG_REF_TTL = 300  # 5 minutes
 
 
-def _build_tag_reference() -> str:
-    """Build a tag reference list from the Tag table for the prompt.
+def invalidate_tag_reference() -> None:
+    """Drop the cached tag reference so the next call re-reads the Tag table."""
+    _tag_ref_cache['text'] = ''
+    _tag_ref_cache['expires_at'] = 0.0
+
+
+def _on_tag_write(_mapper, _connection, _target) -> None:
+    invalidate_tag_reference()
+
+
+for _evt in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(Tag, _evt, _on_tag_write)
+
+# JSON fields of the classify result and the tag-selection rules. Shared with
+# the comprehensive prompt so both stay in sync.
+CLASSIFY_SCHEMA_FIELDS = """  "problem_type": "题型简述",
+  "knowledge_points": [
+    {"tag_name": "标签名", "importance": "核心/辅助"}
+  ],
+  "difficulty_assessment": {
+    "thinking": 3,
+    "coding": 2,
+    "math": 1,
+    "overall": 3
+  }"""
+
+CLASSIFY_RULES = """1. 从标签参考列表中选择 1-5 个最相关的 tag_name（必须精确匹配列表中的 tag_name）
+2. 对每个选中的标签说明其重要性（核心/辅助）
+3. 给出综合难度评分 1-10（1=入门，3=普及，5=提高，7=省选，9=NOI）"""
+
+# Problem-independent parts of the classify prompt, rendered once at import.
+_SYSTEM_PROMPT = (
+    "你是信息学竞赛题目分类专家。"
+    "你必须严格只输出 JSON，不要输出任何其他文字、解释或 markdown 代码块标记。"
+    "JSON 字符串值中如果包含反斜杠（如 LaTeX 公式 \\max），请使用双反斜杠转义。"
+    "确保输出完整的 JSON，不要截断。"
+)
+
+_REQUIREMENTS = f"""## 要求
+{CLASSIFY_RULES}
+4. 如果平台有难度数据，作为参考但不完全依赖
+
+请严格返回以下 JSON 格式（不要包含其他文字）：
+{{
+{CLASSIFY_SCHEMA_FIELDS},
+  "brief_solution_idea": "简要解题思路(一句话)"
+}}"""
+
+
+def get_tag_reference() -> str:
+    """Return the tag reference list from the Tag table for the prompt.
+
+    Shared by the classify and comprehensive prompts, so one cached build
+    serves both.
 
     Results are cached in memory for 5 minutes to avoid repeated DB queries
     when classifying multiple problems in a batch.
@@ -30,14 +86,10 @@ def _build_tag_reference() -> str:
     tags = Tag.query.order_by(Tag.stage, Tag.name).all()
     lines = []
     current_stage = None
-    stage_names = {
-        1: '语法基础', 2: '基础算法', 3: 'CSP-J',
-        4: 'CSP-S', 5: '省选', 6: 'NOI',
-    }
     for tag in tags:
         if tag.stage != current_stage:
             current_stage = tag.stage
-            label = stage_names.get(current_stage, f'Stage {current_stage}')
+            label = stage_name(current_stage, f'Stage {current_stage}')
             lines.append(f"\n## Stage {current_stage} - {label}")
         lines.append(f"- {tag.name}: {tag.display_name}")
 
@@ -57,7 +109,7 @@ def build_classify_prompt(
     examples: str | None = None,
     hint: str | None = None,
     platform_tags: list[str] | None = None,
-) -> list[dict]:
+) -> tuple[dict, ...]:
     """Build prompt messages for problem classification.
 
     Args:
@@ -72,23 +124,18 @@ def build_classify_prompt(
         platform_tags: Original tags from the OJ platform.
 
     Returns:
-        List of message dicts for LLM chat API.
+        Tuple of message dicts for LLM chat API.
     """
-    tag_reference = _build_tag_reference()
+    tag_reference = get_tag_reference()
 
     platform_tags_str = ''
     if platform_tags:
         platform_tags_str = f"\n平台原始标签：{', '.join(platform_tags)}"
 
-    return [
+    return (
         {
             "role": "system",
-            "content": (
-                "你是信息学竞赛题目分类专家。"
-                "你必须严格只输出 JSON，不要输出任何其他文字、解释或 markdown 代码块标记。"
-                "JSON 字符串值中如果包含反斜杠（如 LaTeX 公式 \\max），请使用双反斜杠转义。"
-                "确保输出完整的 JSON，不要截断。"
-            ),
+            "content": _SYSTEM_PROMPT,
         },
         {
             "role": "user",
@@ -110,25 +157,6 @@ def build_classify_prompt(
 ## 标签参考列表（必须从以下 tag_name 中选择）
 {tag_reference}
 
-## 要求
-1. 从标签参考列表中选择 1-5 个最相关的 tag_name（必须精确匹配列表中的 tag_name）
-2. 对每个选中的标签说明其重要性（核心/辅助）
-3. 给出综合难度评分 1-10（1=入门，3=普及，5=提高，7=省选，9=NOI）
-4. 如果平台有难度数据，作为参考但不完全依赖
-
-请严格返回以下 JSON 格式（不要包含其他文字）：
-{{
-  "problem_type": "题型简述",
-  "knowledge_points": [
-    {{"tag_name": "标签名", "importance": "核心/辅助"}}
-  ],
-  "difficulty_assessment": {{
-    "thinking": 3,
-    "coding": 2,
-    "math": 1,
-    "overall": 3
-  }},
-  "brief_solution_idea": "简要解题思路(一句话)"
-}}""",
-        }
-    ]
+{_REQUIREMENTS}""",
+        },
+    )
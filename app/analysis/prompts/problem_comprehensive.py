@@ -6,7 +6,60 @@ LLM call to reduce latency from 3 serial requests to 1.
 """
 from __future__ import annotations
 
-from .problem_classify import _build_tag_reference
+import textwrap
+
+from .problem_classify import CLASSIFY_RULES, CLASSIFY_SCHEMA_FIELDS, get_tag_reference
+from .problem_full_solution import full_solution_schema_fields
+from .problem_solution import SOLUTION_SCHEMA_FIELDS
+
+# Per-stage JSON schemas nested one level deeper under their section keys.
+_CLASSIFY_BLOCK = textwrap.indent(CLASSIFY_SCHEMA_FIELDS, '  ')
+_SOLUTION_BLOCK = textwrap.indent(SOLUTION_SCHEMA_FIELDS, '  ')
+_FULL_SOLUTION_BLOCK = textwrap.indent(
+    full_solution_schema_fields(
+        code='完整的 C++ 代码', explanation='关键说明', brief='简要说明',
+    ),
+    '  ',
+)
+
+_SYSTEM_PROMPT = (
+    "你是信息学竞赛题目分类和解题专家。"
+    "你必须严格只输出 JSON，不要输出任何其他文字、解释或 markdown 代码块标记。"
+    "JSON 字符串值中如果包含反斜杠（如 LaTeX 公式 \\max），请使用双反斜杠转义。"
+    "确保输出完整的 JSON，不要截断。"
+)
+
+# Static tail of the user prompt (requirements + JSON schema). It does not
+# depend on the problem, so it is rendered once at import time and only the
+# problem header is formatted per call.
+_REQUIREMENTS = f"""## 要求
+请先仔细分析题目，然后一次性输出以下三部分。
+
+**classify 部分要求**：
+{CLASSIFY_RULES}
+
+**solution 部分要求**：
+- approach 限 2-3 句话
+- thinking_steps 清晰分步
+
+**full_solution 部分要求**：
+- code 为可直接提交的完整 C++ 代码，只保留必要注释
+- 代码风格：使用 #include <bits/stdc++.h> 和 using namespace std;，不要用 ios::sync_with_stdio / cin.tie
+- explanation 限 3-5 句关键说明
+- alternative_approaches 最多 2 个，每个一句话
+
+请严格返回以下 JSON 格式（不要包含任何 JSON 以外的文字）：
+{{
+  "classify": {{
+{_CLASSIFY_BLOCK}
+  }},
+  "solution": {{
+{_SOLUTION_BLOCK}
+  }},
+  "full_solution": {{
+{_FULL_SOLUTION_BLOCK}
+  }}
+}}"""
 
 
 def build_problem_comprehensive_prompt(
@@ -19,7 +72,7 @@ def build_problem_comprehensive_prompt(
     examples: str | None = None,
     hint: str | None = None,
     platform_tags: list[str] | None = None,
-) -> list[dict]:
+) -> tuple[dict, ...]:
     """Build prompt that combines classify + solution + full_solution.
 
     Args:
@@ -34,23 +87,18 @@ def build_problem_comprehensive_prompt(
         platform_tags: Original tags from the OJ platform.
 
     Returns:
-        List of message dicts for LLM chat API.
+        Tuple of message dicts for LLM chat API.
     """
-    tag_reference = _build_tag_reference()
+    tag_reference = get_tag_reference()
 
     platform_tags_str = ''
     if platform_tags:
         platform_tags_str = f"\n平台原始标签：{', '.join(platform_tags)}"
 
-    return [
+    return (
         {
             "role": "system",
-            "content": (
-                "你是信息学竞赛题目分类和解题专家。"
-                "你必须严格只输出 JSON，不要输出任何其他文字、解释或 markdown 代码块标记。"
-                "JSON 字符串值中如果包含反斜杠（如 LaTeX 公式 \\max），请使用双反斜杠转义。"
-                "确保输出完整的 JSON，不要截断。"
-            ),
+            "content": _SYSTEM_PROMPT,
         },
         {
             "role": "user",
@@ -72,55 +120,6 @@ def build_problem_comprehensive_prompt(
 ## 标签参考列表（classify 部分的 tag_name 必须从以下列表中选择）
 {tag_reference}
 
-## 要求
-请先仔细分析题目，然后一次性输出以下三部分。
-
-**classify 部分要求**：
-1. 从标签参考列表中选择 1-5 个最相关的 tag_name（必须精确匹配列表中的 tag_name）
-2. 对每个选中的标签说明其重要性（核心/辅助）
-3. 给出综合难度评分 1-10（1=入门，3=普及，5=提高，7=省选，9=NOI）
-
-**solution 部分要求**：
-- approach 限 2-3 句话
-- thinking_steps 清晰分步
-
-**full_solution 部分要求**：
-- code 为可直接提交的完整 C++ 代码，只保留必要注释
-- 代码风格：使用 #include <bits/stdc++.h> 和 using namespace std;，不要用 ios::sync_with_stdio / cin.tie
-- explanation 限 3-5 句关键说明
-- alternative_approaches 最多 2 个，每个一句话
-
-请严格返回以下 JSON 格式（不要包含任何 JSON 以外的文字）：
-{{
-  "classify": {{
-    "problem_type": "题型简述",
-    "knowledge_points": [
-      {{"tag_name": "标签名", "importance": "核心/辅助"}}
-    ],
-    "difficulty_assessment": {{
-      "thinking": 3,
-      "coding": 2,
-      "math": 1,
-      "overall": 3
-    }}
-  }},
-  "solution": {{
-    "approach": "解题思路概述（2-3句话）",
-    "algorithm": "核心算法/数据结构名称",
-    "complexity": {{"time": "O(...)", "space": "O(...)"}},
-    "key_points": ["关键实现要点1", "关键实现要点2"],
-    "common_pitfalls": ["常见错误1", "常见错误2"],
-    "thinking_steps": ["第一步：分析题意...", "第二步：设计算法...", "第三步：处理边界..."]
-  }},
-  "full_solution": {{
-    "approach": "解题思路概述",
-    "code": "完整的 C++ 代码",
-    "explanation": "关键说明",
-    "complexity": {{"time": "O(...)", "space": "O(...)"}},
-    "alternative_approaches": [
-      {{"name": "替代方法名称", "brief": "简要说明"}}
-    ]
-  }}
-}}""",
-        }
-    ]
+{_REQUIREMENTS}""",
+        },
+    )
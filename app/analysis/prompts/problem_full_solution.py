@@ -4,6 +4,42 @@ Prompt template for generating a complete AI solution for a problem.
 from __future__ import annotations
 
 
+def full_solution_schema_fields(code: str, explanation: str, brief: str) -> str:
+    """JSON fields of the full solution result, shared with the comprehensive prompt.
+
+    The field layout is shared; each prompt keeps its own wording for the
+    ``code``, ``explanation`` and ``alternative_approaches[].brief`` hints.
+    """
+    return f"""  "approach": "解题思路概述",
+  "code": "{code}",
+  "explanation": "{explanation}",
+  "complexity": {{"time": "O(...)", "space": "O(...)"}},
+  "alternative_approaches": [
+    {{"name": "替代方法名称", "brief": "{brief}"}}
+  ]"""
+
+
+FULL_SOLUTION_SCHEMA_FIELDS = full_solution_schema_fields(
+    code='完整的 C++ 代码（可以直接提交的）',
+    explanation='代码逐段解释，说明每个关键部分的作用',
+    brief='简要说明为什么不选择这个方法',
+)
+
+# Problem-independent tail of the prompt, rendered once at import.
+_INSTRUCTIONS = f"""要求：
+- approach 限 2-3 句话
+- code 只保留必要注释，不写多余空行
+- 代码风格：使用 #include <bits/stdc++.h> 和 using namespace std;，不要用 ios::sync_with_stdio / cin.tie
+- explanation 限 3-5 句关键说明，不要逐行解释
+- alternative_approaches 最多 2 个，每个一句话
+- 控制总回复在 2000 字以内
+
+请严格按以下 JSON 格式返回（不要包含任何 JSON 以外的文字）：
+{{
+{FULL_SOLUTION_SCHEMA_FIELDS}
+}}"""
+
+
 def build_problem_full_solution_prompt(
     problem_title: str,
     problem_description: str | None,
@@ -13,7 +49,7 @@ def build_problem_full_solution_prompt(
     hint: str | None = None,
     difficulty: int = 0,
     problem_type: str | None = None,
-) -> list[dict]:
+) -> tuple[dict, ...]:
     """Build prompt messages for generating a full problem solution.
 
     Args:
@@ -27,7 +63,7 @@ def build_problem_full_solution_prompt(
         problem_type: AI-classified problem type, if available.
 
     Returns:
-        List of message dicts suitable for LLM chat API.
+        Tuple of message dicts suitable for LLM chat API.
     """
     sections = [f"## 题目：{problem_title}"]
 
@@ -49,30 +85,13 @@ def build_problem_full_solution_prompt(
 
     problem_text = "\n".join(sections)
 
-    return [
+    return (
         {
             "role": "user",
             "content": f"""你是一位资深信息学竞赛教练，请为以下题目提供完整的解法，包括思路分析和 C++ 代码。
 
 {problem_text}
 
-要求：
-- approach 限 2-3 句话
-- code 只保留必要注释，不写多余空行
-- 代码风格：使用 #include <bits/stdc++.h> 和 using namespace std;，不要用 ios::sync_with_stdio / cin.tie
-- explanation 限 3-5 句关键说明，不要逐行解释
-- alternative_approaches 最多 2 个，每个一句话
-- 控制总回复在 2000 字以内
-
-请严格按以下 JSON 格式返回（不要包含任何 JSON 以外的文字）：
-{{
-  "approach": "解题思路概述",
-  "code": "完整的 C++ 代码（可以直接提交的）",
-  "explanation": "代码逐段解释，说明每个关键部分的作用",
-  "complexity": {{"time": "O(...)", "space": "O(...)"}},
-  "alternative_approaches": [
-    {{"name": "替代方法名称", "brief": "简要说明为什么不选择这个方法"}}
-  ]
-}}""",
-        }
-    ]
+{_INSTRUCTIONS}""",
+        },
+    )
@@ -10,7 +10,7 @@ def build_problem_journey_prompt(
     submissions_timeline: list[dict],
     student_age: int | None = None,
     student_grade: str | None = None,
-) -> list[dict]:
+) -> tuple[dict, ...]:
     """Build the prompt messages for problem journey analysis.
 
     Args:
@@ -26,7 +26,7 @@ def build_problem_journey_prompt(
         student_grade: Student's grade level.
 
     Returns:
-        List of message dicts suitable for LLM chat API.
+        Tuple of message dicts suitable for LLM chat API.
     """
     age_context = ""
     if student_age and student_grade:
@@ -41,7 +41,7 @@ def build_problem_journey_prompt(
             f"```cpp\n{sub['source_code'] or '(代码未获取)'}\n```\n"
         )
 
-    return [
+    return (
         {
             "role": "user",
             "content": f"""你是一位信息学竞赛教练，请分析学生攻克以下题目的全过程。
@@ -63,5 +63,5 @@ def build_problem_journey_prompt(
   "suggestions": ["后续改进建议"],
   "learned_knowledge": ["通过此题掌握的知识点"]
 }}""",
-        }
-    ]
+        },
+    )
@@ -4,6 +4,21 @@ Prompt template for analyzing a problem's solution approach (no code).
 from __future__ import annotations
 
 
+# JSON fields of the solution result, shared with the comprehensive prompt.
+SOLUTION_SCHEMA_FIELDS = """  "approach": "解题思路概述（2-3句话）",
+  "algorithm": "核心算法/数据结构名称",
+  "complexity": {"time": "O(...)", "space": "O(...)"},
+  "key_points": ["关键实现要点1", "关键实现要点2"],
+  "common_pitfalls": ["常见错误1", "常见错误2"],
+  "thinking_steps": ["第一步：分析题意...", "第二步：设计算法...", "第三步：处理边界..."]"""
+
+# Problem-independent tail of the prompt, rendered once at import.
+_INSTRUCTIONS = f"""请严格按以下 JSON 格式返回（不要包含任何 JSON 以外的文字）：
+{{
+{SOLUTION_SCHEMA_FIELDS}
+}}"""
+
+
 def build_problem_solution_prompt(
     problem_title: str,
     problem_description: str | None,
@@ -13,7 +28,7 @@ def build_problem_solution_prompt(
     hint: str | None = None,
     difficulty: int = 0,
     problem_type: str | None = None,
-) -> list[dict]:
+) -> tuple[dict, ...]:
     """Build prompt messages for problem solution approach analysis.
 
     Args:
@@ -27,7 +42,7 @@ def build_problem_solution_prompt(
         problem_type: AI-classified problem type, if available.
 
     Returns:
-        List of message dicts suitable for LLM chat API.
+        Tuple of message dicts suitable for LLM chat API.
     """
     sections = [f"## 题目：{problem_title}"]
 
@@ -49,21 +64,13 @@ def build_problem_solution_prompt(
 
     problem_text = "\n".join(sections)
 
-    return [
+    return (
         {
             "role": "user",
             "content": f"""你是一位资深信息学竞赛教练，请分析以下题目的解题思路。注意：只分析思路，不要给出代码。
 
 {problem_text}
 
-请严格按以下 JSON 格式返回（不要包含任何 JSON 以外的文字）：
-{{
-  "approach": "解题思路概述（2-3句话）",
-  "algorithm": "核心算法/数据结构名称",
-  "complexity": {{"time": "O(...)", "space": "O(...)"}},
-  "key_points": ["关键实现要点1", "关键实现要点2"],
-  "common_pitfalls": ["常见错误1", "常见错误2"],
-  "thinking_steps": ["第一步：分析题意...", "第二步：设计算法...", "第三步：处理边界..."]
-}}""",
-        }
-    ]
+{_INSTRUCTIONS}""",
+        },
+    )
@@ -12,7 +12,7 @@ def build_single_submission_prompt(
     score: int | None = None,
     student_age: int | None = None,
     student_grade: str | None = None,
-) -> list[dict]:
+) -> tuple[dict, ...]:
     """Build the prompt messages for single submission analysis.
 
     Args:
@@ -25,7 +25,7 @@ def build_single_submission_prompt(
         student_grade: Student's grade level.
 
     Returns:
-        List of message dicts suitable for LLM chat API.
+        Tuple of message dicts suitable for LLM chat API.
     """
     age_context = ""
     if student_age and student_grade:
@@ -34,7 +34,7 @@ def build_single_submission_prompt(
             f"请用适合该年龄段的语言给出建议。\n"
         )
 
-    return [
+    return (
         {
             "role": "user",
             "content": f"""你是一位信息学竞赛教练，请分析以下学生的代码提交。
@@ -59,5 +59,5 @@ def build_single_submission_prompt(
   "knowledge_points": ["涉及的知识点列表"],
   "difficulty_for_student": "对该学生而言的难度评估(简单/适中/困难)"
 }}""",
-        }
-    ]
+        },
+    )
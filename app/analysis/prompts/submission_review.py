@@ -13,7 +13,7 @@ def build_submission_review_prompt(
     language: str | None = None,
     student_age: int | None = None,
     student_grade: str | None = None,
-) -> list[dict]:
+) -> tuple[dict, ...]:
     """Build prompt messages for reviewing a student's code submission.
 
     Args:
@@ -27,7 +27,7 @@ def build_submission_review_prompt(
         student_grade: Student's grade level.
 
     Returns:
-        List of message dicts suitable for LLM chat API.
+        Tuple of message dicts suitable for LLM chat API.
     """
     age_context = ""
     if student_age and student_grade:
@@ -38,7 +38,7 @@ def build_submission_review_prompt(
 
     lang_label = language or "C++"
 
-    return [
+    return (
         {
             "role": "user",
             "content": f"""你是一位资深信息学竞赛教练，请对以下学生的代码提交进行详细审查和评价。
@@ -65,5 +65,5 @@ def build_submission_review_prompt(
   "knowledge_demonstrated": ["体现的知识点1", "体现的知识点2"],
   "mastery_level": "熟练/掌握/了解/不足"
 }}""",
-        }
-    ]
+        },
+    )
@@ -7,10 +7,49 @@ then moderate weaknesses, then unexplored knowledge areas.
 """
 from __future__ import annotations
 
-from app.models import Problem, Tag, Submission, PlatformAccount, Student
-from .weakness import WeaknessDetector, GRADE_STAGE_MAP
+from sqlalchemy import event
+from sqlalchemy.orm import load_only, selectinload
+
+from app.extensions import db
+from app.models import (
+    Problem, Tag, Student, StudentSolvedProblem,
+)
+from ._cache import FingerprintCache, submission_fingerprint
+from .weakness import WeaknessDetector, grade_max_stage
 from collections import defaultdict
 
+# Recommendation cache keyed by (student_id, max_stage, limit), so a grade
+# change picks a new entry. Each entry stores the submission fingerprint it
+# was computed for, so any new submission forces a recompute; Tag and Problem
+# writes in this process clear it, and the TTL bounds staleness across
+# workers. Only plain values are cached -- Problem rows are re-loaded per call
+# so callers never receive instances bound to another session.
+_recommend_cache = FingerprintCache(maxsize=512, ttl=3600)
+
+# Recommended problems are only displayed as a link with their tags, so skip
+# the large text columns and load tags for all rows in one extra query.
+_PROBLEM_LOAD_OPTIONS = (
+    load_only(
+        Problem.platform, Problem.problem_id, Problem.title,
+        Problem.difficulty, Problem.url,
+    ),
+    selectinload(Problem.tags),
+)
+
+
+def invalidate_recommendations(student_id: int | None = None) -> None:
+    """Drop cached recommendations for one student, or for all students."""
+    _recommend_cache.invalidate(student_id)
+
+
+def _on_catalog_write(_mapper, _connection, _target) -> None:
+    invalidate_recommendations()
+
+
+for _evt in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(Tag, _evt, _on_catalog_write)
+    event.listen(Problem, _evt, _on_catalog_write)
+
 
 class ProblemRecommender:
     """Recommends problems based on student weaknesses and progression.
@@ -33,7 +72,9 @@ class ProblemRecommender:
             3. Priority 3 (unexplored topics): Problems for tags not yet attempted
 
         Problems already solved by the student are excluded. Difficulty is
-        calibrated around the student's current level.
+        calibrated around the student's current level. Results are cached
+        until the student's submissions, grade or the problem catalog
+        change, or the TTL expires.
 
         Args:
             limit: Maximum number of recommendations to return.
@@ -45,108 +86,145 @@ class ProblemRecommender:
                 - priority: Numeric priority (1 = highest)
                 - tag: Display name of the relevant tag
         """
+        fingerprint = submission_fingerprint(self.student_id)
+        key = (self.student_id, self._get_max_stage(), limit)
+        cached = _recommend_cache.get(key, fingerprint)
+        if cached is not None:
+            return self._hydrate(cached)
+
+        recommendations = self._compute(limit)
+        _recommend_cache.set(key, fingerprint, [
+            (r["problem"].id, r["reason"], r["priority"], r["tag"])
+            for r in recommendations
+        ])
+        return recommendations
+
+    def _compute(self, limit: int) -> list[dict]:
+        """Build recommendations from scratch (uncached path of ``recommend``)."""
         weaknesses = self.weakness_detector.detect()
         max_stage = self._get_max_stage()
 
-        # Get already solved problem IDs
-        account_ids = [
-            a.id
-            for a in PlatformAccount.query.filter_by(
-                student_id=self.student_id
-            ).all()
-        ]
-        solved_ids = set()
-        if account_ids:
-            for sub in Submission.query.filter(
-                Submission.platform_account_id.in_(account_ids),
-                Submission.status == "AC",
-            ).all():
-                if sub.problem_id_ref:
-                    solved_ids.add(sub.problem_id_ref)
-
-        # Determine current max difficulty the student has solved
-        max_diff = 0
-        for pid in solved_ids:
-            p = Problem.query.get(pid)
-            if p and p.difficulty:
-                max_diff = max(max_diff, p.difficulty)
+        # Solved set and max solved difficulty are denormalized at write time;
+        # solved problems are excluded by subquery instead of a literal id list
+        solved_ids = (
+            db.session.query(StudentSolvedProblem.problem_id)
+            .filter(StudentSolvedProblem.student_id == self.student_id)
+            .scalar_subquery()
+        )
+        max_diff = (
+            db.session.query(Student.max_solved_difficulty)
+            .filter_by(id=self.student_id)
+            .scalar()
+        ) or 0
 
         recommendations = []
         seen_problem_ids = set()
 
+        # Resolve every tag either loop may need with a single IN query
+        top_weaknesses = [
+            w for w in weaknesses[:5] if w["severity"] in ("critical", "moderate")
+        ]
+        unexplored = [
+            w for w in weaknesses
+            if w["reason"] == "未涉及" and w["stage"] <= max_stage
+        ]
+        tag_names = {w["tag_name"] for w in top_weaknesses + unexplored}
+        tag_by_name = (
+            {t.name: t for t in Tag.query.filter(Tag.name.in_(tag_names)).all()}
+            if tag_names else {}
+        )
+
         # Priority 1 & 2: Problems for critical and moderate weaknesses
-        for weakness in weaknesses[:5]:
-            if weakness["severity"] in ("critical", "moderate"):
-                tag = Tag.query.filter_by(name=weakness["tag_name"]).first()
-                if not tag:
-                    continue
-
-                problems = (
-                    Problem.query.filter(
-                        Problem.tags.any(Tag.id == tag.id),
-                        Problem.difficulty.between(
-                            max(1, max_diff - 1), max_diff + 1
+        for weakness in top_weaknesses:
+            tag = tag_by_name.get(weakness["tag_name"])
+            if not tag:
+                continue
+
+            problems = (
+                Problem.query.options(*_PROBLEM_LOAD_OPTIONS)
+                .filter(
+                    Problem.tags.any(Tag.id == tag.id),
+                    Problem.difficulty.between(
+                        max(1, max_diff - 1), max_diff + 1
+                    ),
+                    ~Problem.id.in_(solved_ids),
+                    ~Problem.id.in_(seen_problem_ids),
+                )
+                .limit(3)
+                .all()
+            )
+
+            for p in problems:
+                seen_problem_ids.add(p.id)
+                recommendations.append(
+                    {
+                        "problem": p,
+                        "reason": (
+                            f"加强{tag.display_name}训练 "
+                            f"({weakness['severity']}弱项)"
                         ),
-                        ~Problem.id.in_(solved_ids | seen_problem_ids),
-                    )
-                    .limit(3)
-                    .all()
+                        "priority": (
+                            1 if weakness["severity"] == "critical" else 2
+                        ),
+                        "tag": tag.display_name,
+                    }
                 )
 
-                for p in problems:
-                    seen_problem_ids.add(p.id)
-                    recommendations.append(
-                        {
-                            "problem": p,
-                            "reason": (
-                                f"加强{tag.display_name}训练 "
-                                f"({weakness['severity']}弱项)"
-                            ),
-                            "priority": (
-                                1 if weakness["severity"] == "critical" else 2
-                            ),
-                            "tag": tag.display_name,
-                        }
-                    )
-
         # Priority 3: Problems for unexplored tags in current stage
-        for weakness in weaknesses:
-            if weakness["reason"] == "未涉及" and weakness["stage"] <= max_stage:
-                tag = Tag.query.filter_by(name=weakness["tag_name"]).first()
-                if not tag:
-                    continue
-
-                problems = (
-                    Problem.query.filter(
-                        Problem.tags.any(Tag.id == tag.id),
-                        Problem.difficulty.between(1, max(3, max_diff - 1)),
-                        ~Problem.id.in_(solved_ids | seen_problem_ids),
-                    )
-                    .limit(2)
-                    .all()
+        for weakness in unexplored:
+            tag = tag_by_name.get(weakness["tag_name"])
+            if not tag:
+                continue
+
+            problems = (
+                Problem.query.options(*_PROBLEM_LOAD_OPTIONS)
+                .filter(
+                    Problem.tags.any(Tag.id == tag.id),
+                    Problem.difficulty.between(1, max(3, max_diff - 1)),
+                    ~Problem.id.in_(solved_ids),
+                    ~Problem.id.in_(seen_problem_ids),
+                )
+                .limit(2)
+                .all()
+            )
+
+            for p in problems:
+                seen_problem_ids.add(p.id)
+                recommendations.append(
+                    {
+                        "problem": p,
+                        "reason": f"探索新知识点：{tag.display_name}",
+                        "priority": 3,
+                        "tag": tag.display_name,
+                    }
                 )
-
-                for p in problems:
-                    seen_problem_ids.add(p.id)
-                    recommendations.append(
-                        {
-                            "problem": p,
-                            "reason": f"探索新知识点：{tag.display_name}",
-                            "priority": 3,
-                            "tag": tag.display_name,
-                        }
-                    )
 
         # Sort by priority and limit
         recommendations.sort(key=lambda x: x["priority"])
         return recommendations[:limit]
 
+    @staticmethod
+    def _hydrate(entries: list[tuple]) -> list[dict]:
+        """Rebuild recommendation dicts from cached (problem_id, ...) tuples."""
+        if not entries:
+            return []
+        problems = {
+            p.id: p
+            for p in Problem.query.options(*_PROBLEM_LOAD_OPTIONS)
+            .filter(Problem.id.in_([e[0] for e in entries]))
+            .all()
+        }
+        return [
+            {"problem": problems[pid], "reason": reason,
+             "priority": priority, "tag": tag}
+            for pid, reason, priority, tag in entries
+            if pid in problems
+        ]
+
     def _get_max_stage(self) -> int:
         """Determine the maximum stage for this student's grade.
 
         Returns:
             Stage number (1-6). Defaults to 4 (CSP-S) if grade is unknown.
         """
-        if self.student and self.student.grade:
-            return GRADE_STAGE_MAP.get(self.student.grade, 4)
-        return 4
+        return grade_max_stage(self.student.grade if self.student else None)
@@ -7,9 +7,12 @@ reports suitable for parents and coaches.
 """
 from __future__ import annotations
 
+import heapq
 import json
 import logging
+from io import StringIO
 from datetime import datetime, timedelta
+from itertools import islice
 
 from flask import current_app
 
@@ -25,6 +28,26 @@ from .prompts.periodic_summary import build_periodic_summary_prompt
 
 logger = logging.getLogger(__name__)
 
+# Tag.category -> radar chart axis label. Categories are matched exactly, so
+# a dict lookup per tag is all the radar aggregation needs.
+CATEGORY_TO_RADAR = {
+    "search": "搜索",
+    "dp": "动态规划",
+    "graph": "图论",
+    "ds": "数据结构",
+    "math": "数学",
+    "string": "字符串",
+    "basic": "基础算法",
+}
+
+# Per report type: default period length, weeks of stats it summarizes, and
+# the label used in the prompt.
+REPORT_PERIODS = {
+    "weekly": (timedelta(weeks=1), 1, "周报"),
+    "monthly": (timedelta(days=30), 4, "月报"),
+    "quarterly": (timedelta(days=90), 13, "季报"),
+}
+
 
 class ReportGenerator:
     """Generates weekly and monthly performance reports for students.
@@ -35,15 +58,67 @@ class ReportGenerator:
     Args:
         student_id: Database ID of the student.
         app: Flask application instance. If None, uses current_app.
+        student: Already-loaded Student row for *student_id*, to skip the
+            lookup query (used by ``batch_generate``).
     """
 
-    def __init__(self, student_id: int, app=None):
+    def __init__(self, student_id: int, app=None, student: Student | None = None):
         self.student_id = student_id
         self.app = app or current_app._get_current_object()
+        # Whether the transaction the lookups below begin is this
+        # generator's own (see _generate_report)
+        self._owns_transaction = not db.session().in_transaction()
         self.engine = AnalysisEngine(student_id)
-        self.student = Student.query.get(student_id)
+        self.student = student or Student.query.get(student_id)
         self.log_manager = AnalysisLogManager(student_id)
 
+    @classmethod
+    def batch_generate(
+        cls, student_ids: list[int] | None, report_type: str, app=None,
+    ) -> list[Report]:
+        """Generate one report of *report_type* for each student.
+
+        Students are loaded with a single query up front instead of one
+        lookup per generator. A failure for one student is logged and does
+        not stop the batch.
+
+        Args:
+            student_ids: IDs of the students to report on, or None for all.
+            report_type: 'weekly', 'monthly' or 'quarterly'.
+            app: Flask application instance. If None, uses current_app.
+
+        Returns:
+            List of the reports that were generated.
+        """
+        app = app or current_app._get_current_object()
+        query = Student.query
+        if student_ids is not None:
+            query = query.filter(Student.id.in_(student_ids))
+
+        students = query.order_by(Student.id).all()
+        # Each report commits, which would expire these rows and re-select
+        # every student one by one. Generation only reads plain columns, so
+        # detach them and keep the values loaded by the batch query.
+        for student in students:
+            db.session.expunge(student)
+
+        reports = []
+        for student in students:
+            try:
+                report = cls(student.id, app, student=student)._generate_report(
+                    report_type
+                )
+            except Exception as e:
+                logger.error(
+                    f"{report_type} report failed for {student.name}: {e}"
+                )
+                db.session.rollback()
+                continue
+            if report:
+                logger.info('Generated %s report for %s', report_type, student.name)
+                reports.append(report)
+        return reports
+
     def generate_weekly_report(self, end_date: datetime = None, start_date: datetime = None) -> Report | None:
         """Generate a weekly report ending at the given date.
 
@@ -55,8 +130,6 @@ class ReportGenerator:
         Returns:
             Report model instance, or None if generation fails.
         """
-        end_date = end_date or datetime.utcnow()
-        start_date = start_date or (end_date - timedelta(weeks=1))
         return self._generate_report("weekly", start_date, end_date)
 
     def generate_monthly_report(self, end_date: datetime = None, start_date: datetime = None) -> Report | None:
@@ -70,8 +143,6 @@ class ReportGenerator:
         Returns:
             Report model instance, or None if generation fails.
         """
-        end_date = end_date or datetime.utcnow()
-        start_date = start_date or (end_date - timedelta(days=30))
         return self._generate_report("monthly", start_date, end_date)
 
     def generate_quarterly_report(self, end_date: datetime = None, start_date: datetime = None) -> Report | None:
@@ -85,12 +156,13 @@ class ReportGenerator:
         Returns:
             Report model instance, or None if generation fails.
         """
-        end_date = end_date or datetime.utcnow()
-        start_date = start_date or (end_date - timedelta(days=90))
         return self._generate_report("quarterly", start_date, end_date)
 
     def _generate_report(
-        self, report_type: str, start_date: datetime, end_date: datetime
+        self,
+        report_type: str,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
     ) -> Report | None:
         """Internal method to generate a report of the given type.
 
@@ -98,66 +170,71 @@ class ReportGenerator:
         and persists both the report and an analysis log entry.
 
         Args:
-            report_type: 'weekly' or 'monthly'.
-            start_date: Start of the report period.
-            end_date: End of the report period.
+            report_type: 'weekly', 'monthly' or 'quarterly'.
+            start_date: Start of the report period. Defaults to end_date
+                minus the report type's period length.
+            end_date: End of the report period. Defaults to now.
 
         Returns:
             Report model instance, or None if generation fails critically.
         """
+        period_length, stats_weeks, period_label = REPORT_PERIODS.get(
+            report_type, REPORT_PERIODS["weekly"]
+        )
+        end_date = end_date or datetime.utcnow()
+        start_date = start_date or (end_date - period_length)
+        # Only a transaction begun by this generator may be ended before the
+        # AI call; one the caller already had open may hold its flushed,
+        # uncommitted work
+        owns_transaction = (
+            self._owns_transaction or not db.session().in_transaction()
+        )
+        self._owns_transaction = False
+
         # Gather current statistics
-        weeks_map = {"weekly": 1, "monthly": 4, "quarterly": 13}
         current_stats = self.engine.get_basic_stats()
-        weekly_stats = self.engine.get_weekly_stats(
-            weeks_map.get(report_type, 1)
-        )
+        weekly_stats = self.engine.get_weekly_stats(stats_weeks)
         tag_scores = self.engine.get_tag_scores()
-        weaknesses = WeaknessDetector(self.student_id).detect()
+        weaknesses = WeaknessDetector(self.student_id, self.engine).detect()
 
         # Get previous report for comparison
+        # Only two columns are needed, so skip hydrating the full row
+        # (including its potentially large ai_content)
         prev_report = (
-            Report.query.filter_by(
-                student_id=self.student_id, report_type=report_type
-            )
+            db.session.query(Report.stats_json, Report.radar_data_curr)
+            .filter_by(student_id=self.student_id, report_type=report_type)
             .order_by(Report.period_end.desc())
             .first()
         )
 
-        # Get previous analysis log for context
-        prev_log = self.log_manager.get_latest_log(report_type)
-
-        # Build formatted text summaries for the prompt
+        # Build formatted text summaries for the prompt. The same text is
+        # stored as stats_json, so it is serialized only once and later
+        # reports quote previous stats in the same layout.
         stats_text = json.dumps(weekly_stats, ensure_ascii=False, indent=2)
-        prev_stats_text = prev_report.stats_json if prev_report else None
-
-        # Build weakness summary text
-        weakness_text = "\n".join(
-            [
-                f"- {w['display_name']}: {w['reason']} (严重度: {w['severity']})"
-                for w in weaknesses[:10]
-            ]
-        )
+        prev_stats_text, prev_radar = prev_report or (None, None)
+
+        # Build weakness summary text and the log's key findings (top 5 of
+        # the same entries) in one pass
+        weakness_lines = []
+        key_findings = []
+        for i, w in enumerate(islice(weaknesses, 10)):
+            finding = f"{w['display_name']}: {w['reason']}"
+            weakness_lines.append(f"- {finding} (严重度: {w['severity']})")
+            if i < 5:
+                key_findings.append(finding)
+        weakness_text = "\n".join(weakness_lines)
 
         # Build knowledge progress text
         knowledge_text = "\n".join(
             [
                 f"- {name}: 评分{info['score']}, 通过率{info['pass_rate']}%"
-                for name, info in sorted(
-                    tag_scores.items(), key=lambda x: -x[1]["score"]
-                )[:15]
+                for name, info in heapq.nlargest(
+                    15, tag_scores.items(), key=lambda x: x[1]["score"]
+                )
             ]
         )
 
         # Build radar chart data — map Tag.category to display labels
-        CATEGORY_TO_RADAR = {
-            "search": "搜索",
-            "dp": "动态规划",
-            "graph": "图论",
-            "ds": "数据结构",
-            "math": "数学",
-            "string": "字符串",
-            "basic": "基础算法",
-        }
         radar_curr = {}
         for tag_name, info in tag_scores.items():
             radar_label = CATEGORY_TO_RADAR.get(info.get("category", ""))
@@ -169,7 +246,7 @@ class ReportGenerator:
         # Call AI to generate report narrative
         try:
             from app.models import UserSetting
-            from .llm.config import MODEL_CONFIG
+            from .llm.config import get_model_for_tier
 
             user_id = self.student.parent_id if self.student else None
             user_key_map = {
@@ -203,22 +280,12 @@ class ReportGenerator:
             provider = get_provider(provider_name, api_key=api_key)
 
             # Pick advanced-tier model from MODEL_CONFIG
-            models = MODEL_CONFIG.get(provider_name, {}).get("models", {})
-            model = None
-            for m_name, m_info in models.items():
-                if m_info.get("tier") == "advanced":
-                    model = m_name
-                    break
+            model = get_model_for_tier(provider_name, "advanced")
             if not model:
                 model = self.app.config.get("AI_MODEL_ADVANCED")
 
-            period_type_map = {
-                "weekly": "周报",
-                "monthly": "月报",
-                "quarterly": "季报",
-            }
             messages = build_periodic_report_prompt(
-                period_type=period_type_map.get(report_type, "周报"),
+                period_type=period_label,
                 period_start=start_date.strftime("%Y.%m.%d"),
                 period_end=end_date.strftime("%Y.%m.%d"),
                 stats=stats_text,
@@ -230,8 +297,27 @@ class ReportGenerator:
                 student_grade=self.student.grade if self.student else None,
             )
 
-            response = provider.chat(messages, model=model, max_tokens=16384)
-            ai_content = response.content
+            # Everything the report needs from the DB has been read. When
+            # this method began the transaction it holds only those reads, so
+            # roll it back to release the connection (and SQLite's shared
+            # lock) while the model generates.
+            if owns_transaction:
+                db.session.rollback()
+
+            # Accumulate the response as it arrives, so text received before
+            # a dropped stream is kept in the report rather than lost
+            buffer = StringIO()
+            try:
+                for chunk in provider.chat_stream(
+                    messages, model=model, max_tokens=16384,
+                ):
+                    buffer.write(chunk)
+            except Exception as e:
+                if not buffer.tell():
+                    raise
+                logger.error('AI report stream interrupted: %s', e)
+                buffer.write(f"\n\n（AI报告生成中断: {e}）")
+            ai_content = buffer.getvalue()
 
         except Exception as e:
             logger.error(f"AI report generation failed: {e}")
@@ -245,11 +331,9 @@ class ReportGenerator:
             report_type=report_type,
             period_start=start_date,
             period_end=end_date,
-            stats_json=json.dumps(weekly_stats, ensure_ascii=False),
+            stats_json=stats_text,
             ai_content=ai_content,
-            radar_data_prev=(
-                prev_report.radar_data_curr if prev_report else None
-            ),
+            radar_data_prev=prev_radar,
             radar_data_curr=json.dumps(radar_curr, ensure_ascii=False),
         )
         db.session.add(report)
@@ -260,9 +344,7 @@ class ReportGenerator:
             period_start=start_date,
             period_end=end_date,
             content=ai_content[:2000],
-            key_findings=[
-                w["display_name"] + ": " + w["reason"] for w in weaknesses[:5]
-            ],
+            key_findings=key_findings,
         )
 
         db.session.commit()
@@ -7,9 +7,9 @@ AC counts, unique problems, and pass rates for charting and comparison.
 from __future__ import annotations
 
 from datetime import datetime, timedelta
-from collections import defaultdict
 
-from app.models import Submission, PlatformAccount
+from app.models import StudentPeriodStat
+from app.models.student_period_stat import PERIOD_FORMATS
 
 
 class TrendAnalyzer:
@@ -22,13 +22,36 @@ class TrendAnalyzer:
     def __init__(self, student_id: int):
         self.student_id = student_id
 
-    def _get_account_ids(self) -> list[int]:
-        """Get all platform account IDs for this student."""
+    def _period_stats(self, period_type: str, since: datetime) -> list[dict]:
+        """Read precomputed period aggregates from ``StudentPeriodStat``.
+
+        Args:
+            period_type: 'week' or 'month'; also the period field name in
+                the returned dicts.
+            since: Start of the look-back window; its period is included.
+
+        Returns:
+            List of trend dicts sorted by period.
+        """
+        since_key = since.strftime(PERIOD_FORMATS[period_type])
+        rows = (
+            StudentPeriodStat.query.filter(
+                StudentPeriodStat.student_id == self.student_id,
+                StudentPeriodStat.period_type == period_type,
+                StudentPeriodStat.period_key >= since_key,
+            )
+            .order_by(StudentPeriodStat.period_key)
+            .all()
+        )
         return [
-            a.id
-            for a in PlatformAccount.query.filter_by(
-                student_id=self.student_id
-            ).all()
+            {
+                period_type: row.period_key,
+                "submissions": row.submissions,
+                "ac_count": row.ac_count,
+                "unique_problems": row.unique_problems,
+                "pass_rate": row.pass_rate,
+            }
+            for row in rows
         ]
 
     def get_weekly_trend(self, weeks: int = 12) -> list[dict]:
@@ -45,45 +68,8 @@ class TrendAnalyzer:
                 - unique_problems: Number of distinct problems attempted
                 - pass_rate: AC percentage
         """
-        account_ids = self._get_account_ids()
-        if not account_ids:
-            return []
-
         since = datetime.utcnow() - timedelta(weeks=weeks)
-        submissions = (
-            Submission.query.filter(
-                Submission.platform_account_id.in_(account_ids),
-                Submission.submitted_at >= since,
-            )
-            .all()
-        )
-
-        weekly = defaultdict(lambda: {"total": 0, "ac": 0, "problems": set()})
-        for s in submissions:
-            if s.submitted_at:
-                week_key = s.submitted_at.strftime("%Y-W%W")
-                weekly[week_key]["total"] += 1
-                if s.status == "AC":
-                    weekly[week_key]["ac"] += 1
-                if s.problem_id_ref:
-                    weekly[week_key]["problems"].add(s.problem_id_ref)
-
-        result = []
-        for week, stats in sorted(weekly.items()):
-            result.append(
-                {
-                    "week": week,
-                    "submissions": stats["total"],
-                    "ac_count": stats["ac"],
-                    "unique_problems": len(stats["problems"]),
-                    "pass_rate": (
-                        round(stats["ac"] / stats["total"] * 100, 1)
-                        if stats["total"] > 0
-                        else 0
-                    ),
-                }
-            )
-        return result
+        return self._period_stats("week", since)
 
     def get_monthly_trend(self, months: int = 6) -> list[dict]:
         """Get monthly submission and AC trends.
@@ -99,42 +85,5 @@ class TrendAnalyzer:
                 - unique_problems: Number of distinct problems attempted
                 - pass_rate: AC percentage
         """
-        account_ids = self._get_account_ids()
-        if not account_ids:
-            return []
-
         since = datetime.utcnow() - timedelta(days=months * 30)
-        submissions = (
-            Submission.query.filter(
-                Submission.platform_account_id.in_(account_ids),
-                Submission.submitted_at >= since,
-            )
-            .all()
-        )
-
-        monthly = defaultdict(lambda: {"total": 0, "ac": 0, "problems": set()})
-        for s in submissions:
-            if s.submitted_at:
-                month_key = s.submitted_at.strftime("%Y-%m")
-                monthly[month_key]["total"] += 1
-                if s.status == "AC":
-                    monthly[month_key]["ac"] += 1
-                if s.problem_id_ref:
-                    monthly[month_key]["problems"].add(s.problem_id_ref)
-
-        result = []
-        for month, stats in sorted(monthly.items()):
-            result.append(
-                {
-                    "month": month,
-                    "submissions": stats["total"],
-                    "ac_count": stats["ac"],
-                    "unique_problems": len(stats["problems"]),
-                    "pass_rate": (
-                        round(stats["ac"] / stats["total"] * 100, 1)
-                        if stats["total"] > 0
-                        else 0
-                    ),
-                }
-            )
-        return result
+        return self._period_stats("month", since)
@@ -9,27 +9,98 @@ improvement suggestions.
 from __future__ import annotations
 
 import logging
+import time
 from collections import defaultdict
+from functools import cached_property
+from operator import itemgetter
+from types import MappingProxyType
+
+from sqlalchemy import event
 
 from app.models import Tag, Problem, Submission, PlatformAccount, Student
+from ._cache import FingerprintCache, submission_fingerprint
 from .engine import AnalysisEngine
 
 logger = logging.getLogger(__name__)
 
+# Weakness buckets keyed by (student_id, max_stage) and validated by the
+# student's submission fingerprint, so a hit skips loading and scoring the
+# submissions altogether. Tag and Problem writes in this process clear it
+# (tag scores depend on problem tags and difficulty); the TTL bounds
+# staleness across workers and from time-decayed scores.
+_detect_cache = FingerprintCache(maxsize=512, ttl=60)
+
+
+def invalidate_weaknesses(student_id: int | None = None) -> None:
+    """Drop cached weaknesses for one student, or for all students.
+
+    Clearing all students also drops the cached tag rows.
+    """
+    if student_id is None:
+        _tag_rows_cache['rows'] = None
+    _detect_cache.invalidate(student_id)
+
+
+# Tag rows (name, display_name, stage, category) shared by all detectors.
+# Tags are reference data, so they are read once per TTL; Tag writes in this
+# process drop them together with the weakness cache.
+_tag_rows_cache: dict[str, object] = {'rows': None, 'expires_at': 0.0}
+_TAG_ROWS_TTL = 300  # 5 minutes
+
+
+def _tag_rows() -> list:
+    """Return the cached plain rows of every tag, re-reading after the TTL."""
+    now = time.monotonic()
+    if _tag_rows_cache['rows'] is None or now >= _tag_rows_cache['expires_at']:
+        _tag_rows_cache['rows'] = Tag.query.with_entities(
+            Tag.name, Tag.display_name, Tag.stage, Tag.category,
+        ).all()
+        _tag_rows_cache['expires_at'] = now + _TAG_ROWS_TTL
+    return _tag_rows_cache['rows']
+
+
+def _on_tag_write(_mapper, _connection, _target) -> None:
+    invalidate_weaknesses()
+
+
+def _on_problem_write(_mapper, _connection, _target) -> None:
+    _detect_cache.invalidate()
+
+
+for _evt in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(Tag, _evt, _on_tag_write)
+    event.listen(Problem, _evt, _on_problem_write)
+
 # Expected ability scores by learning stage (1-6).
 # Higher stages naturally have lower expectations since the material is harder.
-STAGE_EXPECTATIONS = {
+STAGE_EXPECTATIONS = MappingProxyType({
     1: 70,  # Stage 1: Syntax basics
     2: 60,  # Stage 2: Basic algorithms
     3: 50,  # Stage 3: CSP-J level
     4: 40,  # Stage 4: CSP-S level
     5: 30,  # Stage 5: Provincial selection
     6: 20,  # Stage 6: NOI level
-}
+})
+
+# (expected, moderate cutoff, critical cutoff) per stage, precomputed so the
+# per-tag loop does a single lookup.
+_STAGE_THRESHOLDS = MappingProxyType({
+    stage: (expected, expected * 0.6, expected * 0.3)
+    for stage, expected in STAGE_EXPECTATIONS.items()
+})
+_DEFAULT_THRESHOLDS = (50, 30.0, 15.0)
+
+# Text of the weakness entries. %s keeps pass rates such as 66.7 as-is.
+_MILD_SUGGESTION_FMT = "建议开始练习%s相关题目"
+_REASON_FMT = "通过率%s%%，能力评分%s低于期望%s"
+_SUGGESTION_FMT = "建议加强%s训练，当前通过率%s%%"
+
+# Severities in output order, critical first.
+_SEVERITY_ORDER = ("critical", "moderate", "mild")
 
 # Mapping of grade level to maximum accessible stage.
 # Students should not be expected to master content above their grade's stage.
-GRADE_STAGE_MAP = {
+GRADE_STAGE_MAP = MappingProxyType({
     "小三": 1,
     "小四": 1,
     "小五": 2,
@@ -40,7 +111,12 @@ GRADE_STAGE_MAP = {
     "高一": 4,
     "高二": 5,
     "高三": 6,
-}
+})
+
+
+def grade_max_stage(grade: str | None) -> int:
+    """Return the maximum accessible stage for a grade, 4 (CSP-S) if unknown."""
+    return GRADE_STAGE_MAP.get(grade, 4) if grade else 4
 
 
 class WeaknessDetector:
@@ -51,12 +127,18 @@ class WeaknessDetector:
 
     Args:
         student_id: Database ID of the student to analyze.
+        engine: Existing AnalysisEngine for the same student to reuse its
+            loaded submissions and tag scores. A new one is created if None.
     """
 
-    def __init__(self, student_id: int):
+    def __init__(self, student_id: int, engine: AnalysisEngine | None = None):
         self.student_id = student_id
-        self.engine = AnalysisEngine(student_id)
-        self.student = Student.query.get(student_id)
+        self.engine = engine or AnalysisEngine(student_id)
+
+    @cached_property
+    def student(self) -> Student | None:
+        """The analyzed student, loaded on first access."""
+        return Student.query.get(self.student_id)
 
     def detect(self) -> list[dict]:
         """Detect weaknesses, return list sorted by severity.
@@ -71,20 +153,56 @@ class WeaknessDetector:
                 - suggestion: Improvement recommendation
                 - pass_rate, attempted, solved (when applicable)
         """
-        tag_scores = self.engine.get_tag_scores()
-        max_stage = self._get_max_stage()
+        buckets = self._detect_by_severity()
+
+        # Critical first, then moderate, then mild; within a severity, higher
+        # score first. Mild entries all score 0, so that bucket needs no sort.
         weaknesses = []
+        for severity in _SEVERITY_ORDER:
+            bucket = buckets[severity]
+            if severity != "mild":
+                bucket.sort(key=itemgetter("score"), reverse=True)
+            weaknesses.extend(bucket)
+        return weaknesses
 
-        # Check all tags in accessible stages
-        all_tags = Tag.query.filter(Tag.stage <= max_stage).all()
+    def _detect_by_severity(self) -> dict[str, list[dict]]:
+        """Build the unsorted weakness dicts grouped by severity.
+
+        Results are cached per student and stage until the student's
+        submissions change or the TTL expires; a hit does not score tags.
+        Each call gets fresh lists and dicts.
+        """
+        max_stage = self._get_max_stage()
+        key = (self.student_id, max_stage)
+        fingerprint = submission_fingerprint(self.student_id)
+        buckets = _detect_cache.get(key, fingerprint)
+        if buckets is None:
+            buckets = self._build_buckets(self.engine.get_tag_scores(), max_stage)
+            _detect_cache.set(key, fingerprint, buckets)
+        return {
+            severity: [dict(w) for w in weaknesses]
+            for severity, weaknesses in buckets.items()
+        }
 
-        for tag in all_tags:
+    def _build_buckets(
+        self, tag_scores: dict, max_stage: int,
+    ) -> dict[str, list[dict]]:
+        """Compare every accessible tag against its stage expectation."""
+        # One list per severity, so ordering only needs a per-bucket score sort
+        buckets = {severity: [] for severity in _SEVERITY_ORDER}
+
+        # Check all tags in accessible stages
+        for tag in _tag_rows():
+            if tag.stage is None or tag.stage > max_stage:
+                continue
             stats = tag_scores.get(tag.name)
-            expected = STAGE_EXPECTATIONS.get(tag.stage, 50)
+            expected, moderate_cut, critical_cut = _STAGE_THRESHOLDS.get(
+                tag.stage, _DEFAULT_THRESHOLDS
+            )
 
             if stats is None:
                 # Tag not attempted at all -- mild weakness (unknown skill)
-                weaknesses.append(
+                buckets["mild"].append(
                     {
                         "tag_name": tag.name,
                         "display_name": tag.display_name,
@@ -94,44 +212,36 @@ class WeaknessDetector:
                         "reason": "未涉及",
                         "score": 0,
                         "expected": expected,
-                        "suggestion": f"建议开始练习{tag.display_name}相关题目",
+                        "suggestion": _MILD_SUGGESTION_FMT % tag.display_name,
                     }
                 )
-            elif stats["score"] < expected * 0.6:
+            elif stats["score"] < moderate_cut:
                 # Score below 60% of expectation -- moderate or critical
                 severity = (
-                    "critical" if stats["score"] < expected * 0.3 else "moderate"
+                    "critical" if stats["score"] < critical_cut else "moderate"
                 )
-                weaknesses.append(
+                buckets[severity].append(
                     {
                         "tag_name": tag.name,
                         "display_name": tag.display_name,
                         "stage": tag.stage,
                         "category": tag.category,
                         "severity": severity,
-                        "reason": (
-                            f"通过率{stats['pass_rate']}%，"
-                            f"能力评分{stats['score']}低于期望{expected}"
+                        "reason": _REASON_FMT % (
+                            stats["pass_rate"], stats["score"], expected
                         ),
                         "score": stats["score"],
                         "expected": expected,
                         "pass_rate": stats["pass_rate"],
                         "attempted": stats["attempted"],
                         "solved": stats["solved"],
-                        "suggestion": (
-                            f"建议加强{tag.display_name}训练，"
-                            f"当前通过率{stats['pass_rate']}%"
+                        "suggestion": _SUGGESTION_FMT % (
+                            tag.display_name, stats["pass_rate"]
                         ),
                     }
                 )
 
-        # Sort: critical first, then moderate, then mild; within same severity, lower score first
-        severity_order = {"critical": 0, "moderate": 1, "mild": 2}
-        weaknesses.sort(
-            key=lambda x: (severity_order.get(x["severity"], 3), -x.get("score", 0))
-        )
-
-        return weaknesses
+        return buckets
 
     def _get_max_stage(self) -> int:
         """Determine the maximum stage accessible for this student's grade.
@@ -139,9 +249,7 @@ class WeaknessDetector:
         Returns:
             Stage number (1-6). Defaults to 4 (CSP-S) if grade is unknown.
         """
-        if self.student and self.student.grade:
-            return GRADE_STAGE_MAP.get(self.student.grade, 4)
-        return 4  # Default to CSP-S level
+        return grade_max_stage(self.student.grade if self.student else None)
 
     def get_critical_weaknesses(self) -> list[dict]:
         """Get only critical-severity weaknesses.
@@ -149,4 +257,6 @@ class WeaknessDetector:
         Returns:
             Filtered list of weakness dicts with severity == 'critical'.
         """
-        return [w for w in self.detect() if w["severity"] == "critical"]
+        critical = self._detect_by_severity()["critical"]
+        critical.sort(key=itemgetter("score"), reverse=True)
+        return critical
@@ -8,11 +8,25 @@ class BaseConfig:
     SECRET_KEY = os.environ.get('SECRET_KEY', 'fallback-secret-key-change-me')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     WTF_CSRF_ENABLED = True
+    # Password hashing; without an iteration count Werkzeug's default applies
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256'
 
     # Database
     SQLALCHEMY_DATABASE_URI = os.environ.get(
         'SQLALCHEMY_DATABASE_URI', 'sqlite:///dev.db'
     )
+    # Connection pool tuning. pool_pre_ping replaces connections the server
+    # dropped while idle (e.g. MySQL wait_timeout) instead of failing the
+    # request; pool_recycle retires connections before such limits hit.
+    # query_cache_size sizes the compiled-SQL cache; the default of 500
+    # is tight once every model's filter_by/IN variants are counted.
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': 10,
+        'max_overflow': 20,
+        'pool_pre_ping': True,
+        'pool_recycle': 1800,
+        'query_cache_size': 1200,
+    }
 
     # AI provider settings
     AI_PROVIDER = os.environ.get('AI_PROVIDER', 'zhipu')
@@ -72,8 +86,11 @@ class TestingConfig(BaseConfig):
     TESTING = True
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    # In-memory SQLite uses a static pool, so only the statement cache applies
+    SQLALCHEMY_ENGINE_OPTIONS = {'query_cache_size': 1200}
     WTF_CSRF_ENABLED = False
     SECRET_KEY = 'test-secret-key'
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'  # fast hashing for tests only
     SCHEDULER_ENABLED = False
     SERVER_NAME = 'localhost'
     LOG_FILE_MAX_BYTES = 0  # Disable file logging in tests
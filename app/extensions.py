@@ -1,7 +1,11 @@
+import sqlite3
+
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_migrate import Migrate
 from flask_wtf.csrf import CSRFProtect
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
 db = SQLAlchemy()
 
@@ -11,3 +15,24 @@ login_manager.login_message = '请先登录'
 
 migrate = Migrate()
 csrf = CSRFProtect()
+
+# Applied to every new SQLite connection. WAL lets readers (page loads,
+# analysis) run alongside a sync job's writes, and synchronous=NORMAL is
+# durable under WAL while skipping an fsync per commit. In-memory databases
+# ignore the journal mode.
+_SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',
+)
+
+
+@event.listens_for(Engine, 'connect')
+def _set_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    for pragma in _SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
@@ -9,6 +9,8 @@ from .analysis_log import AnalysisLog
 from .report import Report
 from .user_setting import UserSetting
 from .sync_job import SyncJob
+from .student_period_stat import StudentPeriodStat
+from .student_solved_problem import StudentSolvedProblem
 
 __all__ = [
     'User',
@@ -23,4 +25,6 @@ __all__ = [
     'Report',
     'UserSetting',
     'SyncJob',
+    'StudentPeriodStat',
+    'StudentSolvedProblem',
 ]
@@ -0,0 +1,46 @@
+"""Shared helpers for models exposing a JSON ``Text`` column as a dict.
+
+Uses ``orjson`` when it is installed and falls back to the stdlib ``json``
+module otherwise.
+"""
+import json
+
+try:
+    import orjson
+
+    def _loads(raw):
+        return orjson.loads(raw)
+
+    def dump_json(value) -> str:
+        """Serialize *value* to a JSON string for a ``Text`` column."""
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+except ImportError:
+    _loads = json.loads
+
+    def dump_json(value) -> str:
+        """Serialize *value* to a JSON string for a ``Text`` column."""
+        return json.dumps(value, ensure_ascii=False)
+
+
+def load_json_cached(obj, column: str) -> dict:
+    """Decode ``obj.<column>`` as JSON, reusing the last result for the same text.
+
+    The decoded value is kept in the instance ``__dict__`` together with the
+    raw string it came from, so repeated property reads (e.g. from templates)
+    only parse once. Assigning a new string to the column invalidates the
+    cache because the identity check no longer matches. Invalid or empty
+    JSON decodes to an empty dict.
+    """
+    raw = getattr(obj, column)
+    key = f'_{column}_cache'
+    cached = obj.__dict__.get(key)
+    if cached is not None and cached[0] is raw:
+        return cached[1]
+    try:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        value = _loads(raw) if raw else {}
+    except (json.JSONDecodeError, TypeError):
+        value = {}
+    obj.__dict__[key] = (raw, value)
+    return value
@@ -0,0 +1,50 @@
+"""Dialect-aware single-row upserts for tables maintained from flush hooks.
+
+SQLite and PostgreSQL use ``INSERT ... ON CONFLICT`` and MySQL/MariaDB use
+``INSERT ... ON DUPLICATE KEY UPDATE`` / ``INSERT IGNORE``. Any other engine
+falls back to an UPDATE-then-INSERT (or check-then-INSERT) pair inside the
+caller's transaction.
+"""
+from sqlalchemy import exists, insert, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+_ON_CONFLICT_INSERTS = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert,
+}
+_MYSQL_DIALECTS = frozenset({'mysql', 'mariadb'})
+
+
+def upsert(connection, table, keys: dict, values: dict) -> None:
+    """Insert ``keys | values`` into *table*, or update *values* on a key clash.
+
+    *keys* must name the columns of a primary key or unique constraint.
+    """
+    dialect = connection.dialect.name
+    if dialect in _ON_CONFLICT_INSERTS:
+        stmt = _ON_CONFLICT_INSERTS[dialect](table).values(**keys, **values)
+        connection.execute(
+            stmt.on_conflict_do_update(index_elements=list(keys), set_=values)
+        )
+    elif dialect in _MYSQL_DIALECTS:
+        stmt = mysql.insert(table).values(**keys, **values)
+        connection.execute(stmt.on_duplicate_key_update(**values))
+    else:
+        where = [table.c[name] == value for name, value in keys.items()]
+        if not connection.execute(update(table).where(*where).values(**values)).rowcount:
+            connection.execute(insert(table).values(**keys, **values))
+
+
+def insert_ignore(connection, table, row: dict) -> None:
+    """Insert *row* into *table* unless a row with the same key exists."""
+    dialect = connection.dialect.name
+    if dialect in _ON_CONFLICT_INSERTS:
+        connection.execute(
+            _ON_CONFLICT_INSERTS[dialect](table).values(**row).on_conflict_do_nothing()
+        )
+    elif dialect in _MYSQL_DIALECTS:
+        connection.execute(mysql.insert(table).values(**row).prefix_with('IGNORE'))
+    else:
+        where = [table.c[name] == value for name, value in row.items()]
+        if not connection.execute(select(exists().where(*where))).scalar():
+            connection.execute(insert(table).values(**row))
@@ -24,7 +24,7 @@ class Problem(db.Model):
     output_desc = db.Column(db.Text, nullable=True)
     examples = db.Column(db.Text, nullable=True)
     hint = db.Column(db.Text, nullable=True)
-    difficulty = db.Column(db.Integer, nullable=False, default=0)
+    difficulty = db.Column(db.Integer, nullable=False, default=0, index=True)
     difficulty_raw = db.Column(db.String(50), nullable=True)
     url = db.Column(db.String(500), nullable=True)
     source = db.Column(db.String(200), nullable=True)
@@ -50,6 +50,10 @@ class Problem(db.Model):
         'AnalysisResult', back_populates='problem',
         cascade='all, delete-orphan', lazy='dynamic',
     )
+    # Derived solved-set rows; removed with the problem
+    solved_by = db.relationship(
+        'StudentSolvedProblem', cascade='all, delete-orphan', lazy='dynamic',
+    )
 
     def __repr__(self) -> str:
         return f'<Problem {self.platform}:{self.problem_id} {self.title!r}>'
@@ -1,7 +1,9 @@
-import json
 from datetime import datetime
 
+from sqlalchemy.orm import defer
+
 from app.extensions import db
+from ._json import load_json_cached
 
 
 class Report(db.Model):
@@ -35,36 +37,35 @@ class Report(db.Model):
             f'period={self.period_start}..{self.period_end}>'
         )
 
+    @classmethod
+    def list_query(cls, student_id: int):
+        """Return a query for a student's reports without the heavy Text columns.
+
+        List views only show type, period and dates, so the AI content,
+        stats and radar JSON are deferred until a row actually reads them.
+        """
+        return cls.query.filter_by(student_id=student_id).options(
+            defer(cls.ai_content),
+            defer(cls.stats_json),
+            defer(cls.radar_data_prev),
+            defer(cls.radar_data_curr),
+        )
+
     @property
     def content(self):
         return self.ai_content
 
     @property
     def stats(self):
-        if not self.stats_json:
-            return {}
-        try:
-            return json.loads(self.stats_json)
-        except (json.JSONDecodeError, TypeError):
-            return {}
+        return load_json_cached(self, 'stats_json')
 
     @property
     def prev_scores(self):
-        if not self.radar_data_prev:
-            return {}
-        try:
-            return json.loads(self.radar_data_prev)
-        except (json.JSONDecodeError, TypeError):
-            return {}
+        return load_json_cached(self, 'radar_data_prev')
 
     @property
     def curr_scores(self):
-        if not self.radar_data_curr:
-            return {}
-        try:
-            return json.loads(self.radar_data_curr)
-        except (json.JSONDecodeError, TypeError):
-            return {}
+        return load_json_cached(self, 'radar_data_curr')
 
     @property
     def sections(self):
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from datetime import date, datetime
+from types import MappingProxyType
 
 from app.extensions import db
 
 # Mapping from grade strings to approximate math knowledge stages.
 # Stages represent cumulative mathematical maturity that informs
 # which competitive-programming topics the student can handle.
-_GRADE_TO_MATH_STAGE: dict[str, str] = {
+_GRADE_TO_MATH_STAGE: Mapping[str, str] = MappingProxyType({
     '小三': '小学中段：掌握整数四则运算、初步几何认知',
     '小四': '小学中段：掌握整数四则运算、初步几何认知',
     '小五': '小学高段：分数小数运算、简单方程、面积体积',
@@ -18,7 +20,7 @@ _GRADE_TO_MATH_STAGE: dict[str, str] = {
     '高一': '高中入门：集合、函数与导数初步、三角函数',
     '高二': '高中进阶：数列、排列组合、圆锥曲线',
     '高三': '高中完整：导数应用、概率与统计、综合运用',
-}
+})
 
 
 class Student(db.Model):
@@ -37,6 +39,10 @@ class Student(db.Model):
     level = db.Column(db.String(20), nullable=False, default='提高')
     target_stage = db.Column(db.Integer, nullable=False, default=3)  # 1=语法基础..6=NOI
     notes = db.Column(db.Text, nullable=True)
+    # Maintained from StudentSolvedProblem on submission/problem writes
+    max_solved_difficulty = db.Column(
+        db.Integer, nullable=False, default=0, server_default='0'
+    )
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
 
     # Relationships
@@ -47,6 +53,13 @@ class Student(db.Model):
         cascade='all, delete-orphan',
         lazy='dynamic',
     )
+    # Derived rows kept current by flush hooks; removed with the student
+    period_stats = db.relationship(
+        'StudentPeriodStat', cascade='all, delete-orphan', lazy='dynamic',
+    )
+    solved_problems = db.relationship(
+        'StudentSolvedProblem', cascade='all, delete-orphan', lazy='dynamic',
+    )
 
     # ------------------------------------------------------------------
     # Computed properties
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import (
+    case, delete, distinct, event, func, insert, inspect, select,
+)
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from ._upsert import upsert
+from .platform_account import PlatformAccount
+from .submission import Submission
+
+# strftime formats of the two period types. They match the keys TrendAnalyzer
+# has always returned ('2025-W03', '2025-01').
+PERIOD_FORMATS = {
+    'week': '%Y-W%W',
+    'month': '%Y-%m',
+}
+
+
+class StudentPeriodStat(db.Model):
+    """Precomputed weekly/monthly submission aggregates for a student.
+
+    Rows are kept in sync with the submission table by the flush hook
+    below, so trend reads never have to scan a student's full history.
+
+    The hook only sees ORM unit-of-work writes. Bulk statements such as
+    ``session.execute(update(Submission))``, raw SQL or ``Query.delete()``
+    bypass it; code using them must call ``rebuild_period_stats`` for every
+    student it touched.
+    """
+
+    __tablename__ = 'student_period_stat'
+    __table_args__ = (
+        db.UniqueConstraint(
+            'student_id', 'period_type', 'period_key',
+            name='uq_student_period_stat',
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(
+        db.Integer, db.ForeignKey('student.id', ondelete='CASCADE'),
+        nullable=False, index=True,
+    )
+    period_type = db.Column(db.String(10), nullable=False)  # week | month
+    period_key = db.Column(db.String(10), nullable=False)
+    submissions = db.Column(db.Integer, nullable=False, default=0)
+    ac_count = db.Column(db.Integer, nullable=False, default=0)
+    unique_problems = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.utcnow
+    )
+
+    @property
+    def pass_rate(self) -> float:
+        """AC percentage for the period."""
+        if not self.submissions:
+            return 0
+        return round(self.ac_count / self.submissions * 100, 1)
+
+    def __repr__(self) -> str:
+        return (
+            f'<StudentPeriodStat student={self.student_id} '
+            f'{self.period_type}={self.period_key} subs={self.submissions}>'
+        )
+
+
+def _period_range(period_type: str, at: datetime) -> tuple[datetime, datetime]:
+    """Return the [start, end) datetime range of the period containing *at*.
+
+    A '%W' week key includes the year, so a Monday-to-Sunday week that
+    straddles New Year is two periods; the range is clipped to *at*'s year.
+    """
+    day = datetime(at.year, at.month, at.day)
+    if period_type == 'week':
+        start = day - timedelta(days=day.weekday())
+        end = start + timedelta(days=7)
+        return (
+            max(start, datetime(at.year, 1, 1)),
+            min(end, datetime(at.year + 1, 1, 1)),
+        )
+    start = day.replace(day=1)
+    if start.month == 12:
+        return start, start.replace(year=start.year + 1, month=1)
+    return start, start.replace(month=start.month + 1)
+
+
+def refresh_period_stat(
+    connection, student_id: int, period_type: str, at: datetime,
+) -> None:
+    """Recompute the stat row of one student period from the submission table.
+
+    The period is matched with a plain range predicate (no SQL date
+    formatting), so the query runs on any database engine. Rows whose
+    period no longer has submissions are removed.
+    """
+    key = at.strftime(PERIOD_FORMATS[period_type])
+    start, end = _period_range(period_type, at)
+    account_ids = select(PlatformAccount.id).where(
+        PlatformAccount.student_id == student_id
+    ).scalar_subquery()
+
+    total, ac, problems = connection.execute(
+        select(
+            func.count(Submission.id),
+            func.coalesce(
+                func.sum(case((Submission.status == 'AC', 1), else_=0)), 0
+            ),
+            func.count(distinct(Submission.problem_id_ref)),
+        ).where(
+            Submission.platform_account_id.in_(account_ids),
+            Submission.submitted_at >= start,
+            Submission.submitted_at < end,
+        )
+    ).one()
+
+    table = StudentPeriodStat.__table__
+    if not total:
+        connection.execute(
+            delete(table).where(
+                table.c.student_id == student_id,
+                table.c.period_type == period_type,
+                table.c.period_key == key,
+            )
+        )
+        return
+
+    values = {
+        'submissions': total,
+        'ac_count': ac,
+        'unique_problems': problems,
+        'updated_at': datetime.utcnow(),
+    }
+    upsert(
+        connection, table,
+        {'student_id': student_id, 'period_type': period_type, 'period_key': key},
+        values,
+    )
+
+
+def rebuild_period_stats(connection, student_id: int) -> None:
+    """Recompute every weekly and monthly stat row of a student.
+
+    The backfill for writes that bypass the flush hook (see
+    ``StudentPeriodStat``). Periods are keyed in Python, as in
+    ``refresh_period_stat``, so this runs on any engine.
+    """
+    periods = {}
+    rows = connection.execute(
+        select(
+            Submission.submitted_at, Submission.status, Submission.problem_id_ref,
+        ).where(
+            Submission.platform_account_id.in_(
+                select(PlatformAccount.id).where(
+                    PlatformAccount.student_id == student_id
+                )
+            ),
+            Submission.submitted_at.is_not(None),
+        )
+    )
+    for submitted_at, status, problem_id in rows:
+        for period_type, fmt in PERIOD_FORMATS.items():
+            stat = periods.setdefault(
+                (period_type, submitted_at.strftime(fmt)), [0, 0, set()]
+            )
+            stat[0] += 1
+            stat[1] += status == 'AC'
+            if problem_id is not None:
+                stat[2].add(problem_id)
+
+    table = StudentPeriodStat.__table__
+    connection.execute(delete(table).where(table.c.student_id == student_id))
+    if not periods:
+        return
+    now = datetime.utcnow()
+    connection.execute(insert(table), [
+        {
+            'student_id': student_id, 'period_type': period_type,
+            'period_key': key, 'submissions': total, 'ac_count': ac,
+            'unique_problems': len(problems), 'updated_at': now,
+        }
+        for (period_type, key), (total, ac, problems) in periods.items()
+    ])
+
+
+_DIRTY_KEY = 'student_period_stat_dirty'
+_OWNER_KEY = 'submission_owner_cache'
+
+
+def resolve_student_id(session, connection, account_id: int) -> int | None:
+    """Return the student owning *account_id*, cached for the current flush.
+
+    Called from mapper events, where the account row is still present even
+    when a cascading delete removes it later in the same flush.
+    """
+    owners = session.info.setdefault(_OWNER_KEY, {})
+    if account_id not in owners:
+        owners[account_id] = connection.execute(
+            select(PlatformAccount.student_id).where(
+                PlatformAccount.id == account_id
+            )
+        ).scalar()
+    return owners[account_id]
+
+
+def _mark_dirty(_mapper, connection, target) -> None:
+    """Record the student periods touched by a submission write."""
+    session = Session.object_session(target)
+    if session is None:
+        return
+    student_id = resolve_student_id(
+        session, connection, target.platform_account_id
+    )
+    if student_id is None:
+        return
+
+    dirty = session.info.setdefault(_DIRTY_KEY, set())
+    # An update that moves submitted_at also invalidates the old periods
+    moved_from = inspect(target).attrs.submitted_at.history.deleted or ()
+    for at in (target.submitted_at, *moved_from):
+        if at is not None:
+            dirty.add((student_id, at))
+
+
+for _evt in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(Submission, _evt, _mark_dirty)
+
+
+@event.listens_for(Session, 'after_flush')
+def _refresh_dirty_periods(session, _flush_context) -> None:
+    """Refresh every student period touched by the submissions just flushed."""
+    session.info.pop(_OWNER_KEY, None)
+    dirty = session.info.pop(_DIRTY_KEY, None)
+    if not dirty:
+        return
+
+    # Period keys depend only on the date, so collapse a batch of inserts to
+    # distinct (student, day) pairs before formatting any keys
+    days = {(student_id, at.date()): at for student_id, at in dirty}
+
+    # One representative timestamp per (student, period type, period key)
+    periods = {}
+    for (student_id, _day), at in days.items():
+        for period_type, fmt in PERIOD_FORMATS.items():
+            periods.setdefault((student_id, period_type, at.strftime(fmt)), at)
+
+    connection = session.connection()
+    for (student_id, period_type, _key), at in periods.items():
+        refresh_period_stat(connection, student_id, period_type, at)
@@ -0,0 +1,183 @@
+from sqlalchemy import (
+    delete, event, exists, func, insert, inspect, literal, select, update,
+)
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from ._upsert import insert_ignore
+from .platform_account import PlatformAccount
+from .problem import Problem
+from .student import Student
+from .student_period_stat import resolve_student_id
+from .submission import Submission
+
+
+class StudentSolvedProblem(db.Model):
+    """A problem a student has at least one AC submission for.
+
+    Denormalized from the submission table (together with
+    ``Student.max_solved_difficulty``) by the flush hook below, so the
+    solved set can be read without scanning a student's submissions.
+
+    The hook only sees ORM unit-of-work writes. Bulk statements such as
+    ``session.execute(update(Submission))``, ``Query.delete()`` or the
+    ``bulk_*_mappings`` helpers bypass it; code using them must call
+    ``rebuild_solved_problems`` for every student it touched.
+    """
+
+    __tablename__ = 'student_solved_problem'
+
+    student_id = db.Column(
+        db.Integer, db.ForeignKey('student.id', ondelete='CASCADE'),
+        primary_key=True,
+    )
+    problem_id = db.Column(
+        db.Integer, db.ForeignKey('problem.id', ondelete='CASCADE'),
+        primary_key=True, index=True,
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f'<StudentSolvedProblem student={self.student_id} '
+            f'problem={self.problem_id}>'
+        )
+
+
+def refresh_solved_problem(connection, student_id: int, problem_id: int) -> None:
+    """Add or remove one (student, problem) pair based on its AC submissions."""
+    table = StudentSolvedProblem.__table__
+    solved = connection.execute(
+        select(
+            exists().where(
+                Submission.platform_account_id.in_(
+                    select(PlatformAccount.id).where(
+                        PlatformAccount.student_id == student_id
+                    )
+                ),
+                Submission.problem_id_ref == problem_id,
+                Submission.status == 'AC',
+            )
+        )
+    ).scalar()
+    if solved:
+        insert_ignore(
+            connection, table, {'student_id': student_id, 'problem_id': problem_id}
+        )
+    else:
+        connection.execute(
+            delete(table).where(
+                table.c.student_id == student_id,
+                table.c.problem_id == problem_id,
+            )
+        )
+
+
+def refresh_max_solved_difficulty(connection, student_id: int) -> None:
+    """Recompute ``Student.max_solved_difficulty`` from the solved set."""
+    max_difficulty = (
+        select(func.coalesce(func.max(Problem.difficulty), 0))
+        .join(StudentSolvedProblem, StudentSolvedProblem.problem_id == Problem.id)
+        .where(StudentSolvedProblem.student_id == student_id)
+        .scalar_subquery()
+    )
+    connection.execute(
+        update(Student.__table__)
+        .where(Student.__table__.c.id == student_id)
+        .values(max_solved_difficulty=max_difficulty)
+    )
+
+
+def rebuild_solved_problems(connection, student_id: int) -> None:
+    """Recompute a student's whole solved set and max difficulty.
+
+    The backfill for writes that bypass the flush hook (see
+    ``StudentSolvedProblem``).
+    """
+    table = StudentSolvedProblem.__table__
+    connection.execute(delete(table).where(table.c.student_id == student_id))
+    connection.execute(
+        insert(table).from_select(
+            ['student_id', 'problem_id'],
+            select(literal(student_id), Submission.problem_id_ref)
+            .distinct()
+            .where(
+                Submission.platform_account_id.in_(
+                    select(PlatformAccount.id).where(
+                        PlatformAccount.student_id == student_id
+                    )
+                ),
+                Submission.problem_id_ref.is_not(None),
+                Submission.status == 'AC',
+            ),
+        )
+    )
+    refresh_max_solved_difficulty(connection, student_id)
+
+
+_PAIRS_KEY = 'student_solved_problem_dirty'
+_STUDENTS_KEY = 'student_max_difficulty_dirty'
+
+
+def _mark_submission(_mapper, connection, target) -> None:
+    """Record (student, problem) pairs whose solved state may have changed."""
+    state = inspect(target)
+    status_hist = state.attrs.status.history
+    problem_hist = state.attrs.problem_id_ref.history
+    statuses = {target.status, *(status_hist.deleted or ())}
+    if 'AC' not in statuses:
+        return
+    session = Session.object_session(target)
+    if session is None:
+        return
+    student_id = resolve_student_id(
+        session, connection, target.platform_account_id
+    )
+    if student_id is None:
+        return
+
+    pairs = session.info.setdefault(_PAIRS_KEY, set())
+    for problem_id in (target.problem_id_ref, *(problem_hist.deleted or ())):
+        if problem_id is not None:
+            pairs.add((student_id, problem_id))
+
+
+def _mark_problem(_mapper, connection, target) -> None:
+    """Record students whose max difficulty depends on a re-rated problem."""
+    if not inspect(target).attrs.difficulty.history.has_changes():
+        return
+    session = Session.object_session(target)
+    if session is None:
+        return
+    session.info.setdefault(_STUDENTS_KEY, set()).update(
+        connection.execute(
+            select(StudentSolvedProblem.student_id).where(
+                StudentSolvedProblem.problem_id == target.id
+            )
+        ).scalars()
+    )
+
+
+for _evt in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(Submission, _evt, _mark_submission)
+event.listen(Problem, 'after_update', _mark_problem)
+
+
+@event.listens_for(Session, 'after_flush')
+def _refresh_solved(session, _flush_context) -> None:
+    """Apply the solved-set and max-difficulty changes of the last flush."""
+    pairs = session.info.pop(_PAIRS_KEY, None) or set()
+    students = session.info.pop(_STUDENTS_KEY, None) or set()
+    if not (pairs or students):
+        return
+
+    connection = session.connection()
+    for student_id, problem_id in pairs:
+        refresh_solved_problem(connection, student_id, problem_id)
+    for student_id in students | {student_id for student_id, _ in pairs}:
+        refresh_max_solved_difficulty(connection, student_id)
+        # The column was written with Core; drop any stale loaded value
+        student = session.identity_map.get(
+            session.identity_key(Student, student_id)
+        )
+        if student is not None:
+            session.expire(student, ['max_solved_difficulty'])
@@ -12,6 +12,9 @@ class Submission(db.Model):
             'platform_account_id', 'platform_record_id',
             name='uq_submission_account_record',
         ),
+        # Per-student time-window and AC lookups filter on the account first
+        db.Index('ix_sub_acct_time', 'platform_account_id', 'submitted_at'),
+        db.Index('ix_sub_acct_status', 'platform_account_id', 'status'),
     )
 
     id = db.Column(db.Integer, primary_key=True)
@@ -1,8 +1,8 @@
-import json
 import logging
 from datetime import datetime, timedelta
 
 from app.extensions import db
+from ._json import dump_json, load_json_cached
 
 logger = logging.getLogger(__name__)
 
@@ -11,6 +11,10 @@ class SyncJob(db.Model):
     """Tracks sync and AI backfill job execution history."""
 
     __tablename__ = 'sync_job'
+    __table_args__ = (
+        # cleanup_stale_running: status = 'running' AND started_at < cutoff
+        db.Index('ix_syncjob_status_started', 'status', 'started_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(
@@ -54,17 +58,12 @@ class SyncJob(db.Model):
     @property
     def stats(self):
         """Parse stats_json into dict."""
-        if self.stats_json:
-            try:
-                return json.loads(self.stats_json)
-            except (json.JSONDecodeError, TypeError):
-                return {}
-        return {}
+        return load_json_cached(self, 'stats_json')
 
     @stats.setter
     def stats(self, value):
         """Serialize dict to stats_json."""
-        self.stats_json = json.dumps(value, ensure_ascii=False) if value else None
+        self.stats_json = dump_json(value) if value else None
 
     @classmethod
     def cleanup_stale_running(cls, max_age_hours=2):
@@ -76,25 +75,33 @@ class SyncJob(db.Model):
 
         Returns the number of jobs cleaned up.
         """
-        cutoff = datetime.utcnow() - timedelta(hours=max_age_hours)
-        stale_jobs = cls.query.filter(
+        now = datetime.utcnow()
+        stale = cls.query.filter(
             cls.status == 'running',
-            cls.started_at < cutoff,
-        ).all()
-
-        for job in stale_jobs:
-            job.status = 'failed'
-            job.error_message = '任务超时，已自动标记为失败（进程可能被终止）'
-            job.finished_at = datetime.utcnow()
-            logger.warning(
-                f'Cleaned up stale SyncJob {job.id} '
-                f'(started_at={job.started_at})'
-            )
-
-        if stale_jobs:
+            cls.started_at < now - timedelta(hours=max_age_hours),
+        )
+
+        # The per-job log lines need their own SELECT; skip it when unused
+        if logger.isEnabledFor(logging.WARNING):
+            for job_id, started_at in stale.with_entities(cls.id, cls.started_at):
+                logger.warning(
+                    'Cleaned up stale SyncJob %s (started_at=%s)',
+                    job_id, started_at,
+                )
+
+        count = stale.update(
+            {
+                'status': 'failed',
+                'error_message': '任务超时，已自动标记为失败（进程可能被终止）',
+                'finished_at': now,
+            },
+            synchronize_session=False,
+        )
+
+        if count:
             db.session.commit()
 
-        return len(stale_jobs)
+        return count
 
     def __repr__(self):
         return (
@@ -33,7 +33,7 @@ class Tag(db.Model):
 
     # Relationship to Problem is established via backref in Problem.tags
     problems = db.relationship(
-        'Problem', secondary=problem_tags, back_populates='tags', lazy='dynamic'
+        'Problem', secondary=problem_tags, back_populates='tags', lazy='select'
     )
 
     def __repr__(self) -> str:
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 from datetime import datetime
 
+from flask import current_app, has_app_context
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 
 from app.extensions import db, login_manager
 
+_DEFAULT_PASSWORD_HASH_METHOD = 'pbkdf2:sha256'
+
 
 class User(UserMixin, db.Model):
     """Parent account that owns one or more Student profiles."""
@@ -20,11 +23,19 @@ class User(UserMixin, db.Model):
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
 
     # Relationships
-    students = db.relationship('Student', back_populates='parent', lazy='dynamic')
+    students = db.relationship('Student', back_populates='parent', lazy='select')
 
     def set_password(self, password: str) -> None:
-        """Hash and store the user's password."""
-        self.password_hash = generate_password_hash(password, method='pbkdf2:sha256')
+        """Hash and store the user's password.
+
+        The hash method comes from the ``PASSWORD_HASH_METHOD`` config key,
+        so tests can use a cheap iteration count. Existing hashes keep
+        verifying because the method is stored in each hash.
+        """
+        method = _DEFAULT_PASSWORD_HASH_METHOD
+        if has_app_context():
+            method = current_app.config.get('PASSWORD_HASH_METHOD', method)
+        self.password_hash = generate_password_hash(password, method=method)
 
     def check_password(self, password: str) -> bool:
         """Verify a plaintext password against the stored hash."""
@@ -36,5 +47,9 @@ class User(UserMixin, db.Model):
 
 @login_manager.user_loader
 def load_user(user_id: str) -> User | None:
-    """Flask-Login user loader callback."""
-    return User.query.get(int(user_id))
+    """Flask-Login user loader callback.
+
+    Flask-Login calls this at most once per request and keeps the result on
+    ``g._login_user``; ``Session.get`` also answers from the identity map.
+    """
+    return db.session.get(User, int(user_id))
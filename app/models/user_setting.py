@@ -1,5 +1,11 @@
+from flask import g, has_app_context
+
 from app.extensions import db
 
+# Attribute on flask.g holding {user_id: {key: value}} for the current
+# app context (one request, or one background job).
+_CACHE_ATTR = '_user_settings_cache'
+
 
 class UserSetting(db.Model):
     """Key-value store for per-user configuration (AI provider, API keys, etc.)."""
@@ -18,15 +24,36 @@ class UserSetting(db.Model):
 
     user = db.relationship('User', backref='settings')
 
+    @staticmethod
+    def get_all(user_id) -> dict:
+        """Return all of a user's settings as a dict, loaded with one query.
+
+        The result is memoized on ``flask.g`` for the rest of the app
+        context, so several ``get`` calls in one request share it.
+        """
+        cache = g.setdefault(_CACHE_ATTR, {}) if has_app_context() else {}
+        if user_id not in cache:
+            cache[user_id] = dict(
+                db.session.query(UserSetting.key, UserSetting.value)
+                .filter_by(user_id=user_id)
+            )
+        return cache[user_id]
+
+    @staticmethod
+    def invalidate(user_id) -> None:
+        """Drop the memoized settings of *user_id* in this app context."""
+        if has_app_context():
+            g.get(_CACHE_ATTR, {}).pop(user_id, None)
+
     @staticmethod
     def get(user_id, key, default=None):
         """Read a single setting value, returning *default* if not found."""
-        s = UserSetting.query.filter_by(user_id=user_id, key=key).first()
-        return s.value if s else default
+        return UserSetting.get_all(user_id).get(key, default)
 
     @staticmethod
     def set(user_id, key, value):
         """Create or update a setting. Caller must commit the session."""
+        UserSetting.invalidate(user_id)
         s = UserSetting.query.filter_by(user_id=user_id, key=key).first()
         if s:
             s.value = value
@@ -36,6 +36,7 @@ def get_scraper_instance(platform_name: str, **kwargs):
 
 
 def _auto_discover():
+    """Import every scraper module in this package, for plugin development."""
     package_dir = os.path.dirname(__file__)
     for _, module_name, _ in pkgutil.iter_modules([package_dir]):
         if module_name not in ('base', 'common', 'rate_limiter', '__init__'):
@@ -45,4 +46,10 @@ def _auto_discover():
                 logger.error(f"Failed to load scraper module {module_name}: {e}")
 
 
-_auto_discover()
+# Scraper modules register themselves on import. The list is explicit so
+# worker boot does not scan the package directory; set
+# OJ_TRACKER_AUTODISCOVER to also pick up modules not listed here.
+from . import bbcoj, coderlands, ctoj, luogu, ybt  # noqa: E402,F401
+
+if os.environ.get('OJ_TRACKER_AUTODISCOVER'):
+    _auto_discover()
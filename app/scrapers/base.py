@@ -1,14 +1,57 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import requests
 import logging
+import threading
 import time
 from abc import ABC, abstractmethod
 from typing import Generator
 from datetime import datetime
+from requests.adapters import HTTPAdapter
 from .common import ScrapedSubmission, ScrapedProblem
 from .rate_limiter import RateLimiter, get_platform_limiter
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# One HTTPAdapter (and so one urllib3 connection pool) per platform, mounted
+# on every scraper session for that platform. Sessions stay per-instance so
+# cookies and auth headers are never shared between accounts, while repeated
+# scrapes reuse kept-alive connections instead of a new TCP+TLS handshake.
+# Retries stay in _request_with_retry so each attempt passes the rate limiter.
+_platform_adapters: dict[str, HTTPAdapter] = {}
+_adapter_lock = threading.Lock()
+
+# Thread pool size for scrapers that fetch pages or problems concurrently.
+# Every request still passes the shared platform rate limiter, so the pool
+# only overlaps round trips; it never raises the request rate.
+FETCH_WORKERS = 4
+
+
+def get_platform_adapter(platform: str) -> HTTPAdapter:
+    """Get or create the shared HTTP connection pool adapter for a platform."""
+    with _adapter_lock:
+        if platform not in _platform_adapters:
+            _platform_adapters[platform] = HTTPAdapter(
+                pool_connections=10, pool_maxsize=32, max_retries=0,
+            )
+        return _platform_adapters[platform]
+
+
+# Authenticated session state (auth headers and cookies) from recent logins,
+# keyed by (platform, platform_uid, password digest), so a scraper built for
+# the same account skips the login round trip. The password is part of the
+# key so a changed or wrong password never reuses another login. Entries
+# expire well before the platforms' token lifetimes.
+_LOGIN_TTL = 30 * 60
+_login_cache: dict[tuple[str, str, str], tuple[dict, dict, float]] = {}
+_login_lock = threading.Lock()
+
 
 class BaseScraper(ABC):
     PLATFORM_NAME: str = ""
@@ -60,6 +103,9 @@ class BaseScraper(ABC):
 
     def _create_session(self) -> requests.Session:
         session = requests.Session()
+        adapter = get_platform_adapter(self.PLATFORM_NAME)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
         session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
@@ -83,3 +129,38 @@ class BaseScraper(ABC):
 
     def _rate_limited_get(self, url, **kwargs):
         return self._request_with_retry(url, method='GET', **kwargs)
+
+    def _login_cache_key(self, platform_uid: str) -> tuple[str, str, str]:
+        digest = hashlib.sha256((self.auth_password or '').encode('utf-8')).hexdigest()
+        return self.PLATFORM_NAME, platform_uid, digest
+
+    def _remember_login(self, platform_uid: str, headers: dict) -> None:
+        """Cache this session's login state for later scrapers of the account."""
+        entry = (dict(headers), self.session.cookies.get_dict(), time.monotonic())
+        with _login_lock:
+            _login_cache[self._login_cache_key(platform_uid)] = entry
+
+    def _restore_login(self, platform_uid: str) -> bool:
+        """Apply a cached, unexpired login to this session; return True if found."""
+        key = self._login_cache_key(platform_uid)
+        with _login_lock:
+            entry = _login_cache.get(key)
+            if entry is not None and time.monotonic() - entry[2] >= _LOGIN_TTL:
+                del _login_cache[key]
+                entry = None
+        if entry is None:
+            return False
+        headers, cookies, _logged_in_at = entry
+        self.session.headers.update(headers)
+        self.session.cookies.update(cookies)
+        return True
+
+    def _forget_login(self, platform_uid: str) -> None:
+        """Drop the account's cached login, e.g. after the server rejected its token."""
+        with _login_lock:
+            _login_cache.pop(self._login_cache_key(platform_uid), None)
+
+    @staticmethod
+    def _json(resp):
+        """Decode a UTF-8 JSON response body, with orjson when installed."""
+        return _json_loads(resp.content)
@@ -2,11 +2,17 @@ from __future__ import annotations
 
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from itertools import chain
 from typing import Generator
 
-from .base import BaseScraper
-from .common import ScrapedSubmission, ScrapedProblem, SubmissionStatus
+import requests
+
+from .base import BaseScraper, FETCH_WORKERS
+from .common import (
+    ScrapedSubmission, ScrapedProblem, SubmissionStatus, parse_utc_timestamp,
+)
 from . import register_scraper
 
 logger = logging.getLogger(__name__)
@@ -31,6 +37,39 @@ _STATUS_MAP = {
     9: SubmissionStatus.UNKNOWN,     # Submitting
 }
 
+# Final status strings keyed by the numeric code and by its string form,
+# so map_status is a plain dict lookup per record
+_STATUS_VALUES: dict[int, str] = {k: v.value for k, v in _STATUS_MAP.items()}
+_STATUS_VALUES_BY_STR: dict[str, str] = {
+    str(k): v for k, v in _STATUS_VALUES.items()
+}
+
+# HOJ difficulty labels, Chinese and English
+_DIFFICULTY_MAP = {
+    '简单': 1,
+    '中等': 2,
+    '困难': 3,
+    'Easy': 1,
+    'Medium': 2,
+    'Hard': 3,
+}
+
+# Errors that end submission paging: transport failures, undecodable
+# bodies (JSON decode errors subclass ValueError) and API error statuses
+# raised by _fetch_submission_page. Anything else is a bug and propagates.
+_PAGE_ERRORS = (requests.RequestException, ValueError, RuntimeError)
+# Errors from malformed fields in a submission record
+_RECORD_ERRORS = (ValueError, TypeError, AttributeError)
+
+# HTTP and HOJ body statuses meaning the session's token was rejected
+_AUTH_STATUSES = frozenset({401, 403})
+
+# Submission list paging: records per page, records per page when a cursor
+# is known (incremental syncs usually meet it within the newest few), and
+# concurrent page fetches during a full sync
+_PAGE_SIZE = 20
+_CURSOR_PAGE_SIZE = 5
+
 # HOJ language mapping (common)
 _LANG_MAP = {
     'C': 'C',
@@ -52,6 +91,10 @@ _LANG_MAP = {
 }
 
 
+class BBCOJAuthExpired(RuntimeError):
+    """Raised when BBC OJ rejects the session's token (expired or revoked)."""
+
+
 @register_scraper
 class BBCOJScraper(BaseScraper):
     PLATFORM_NAME = "bbcoj"
@@ -60,6 +103,13 @@ class BBCOJScraper(BaseScraper):
     SUPPORT_CODE_FETCH = True
     REQUIRES_LOGIN = True
 
+    # API endpoints, built once from BASE_URL; query strings go in params=
+    _LOGIN_URL = f"{BASE_URL}/api/login"
+    _SUBMISSION_LIST_URL = f"{BASE_URL}/api/get-submission-list"
+    _PROBLEM_DETAIL_URL = f"{BASE_URL}/api/get-problem-detail"
+    _PROBLEM_TAGS_URL = f"{BASE_URL}/api/get-problem-tags-and-classification"
+    _SUBMISSION_DETAIL_URL = f"{BASE_URL}/api/get-submission-detail"
+
     def __init__(self, auth_cookie: str = None, auth_password: str = None, rate_limit: float = 2.0):
         super().__init__(auth_cookie=auth_cookie, auth_password=auth_password, rate_limit=rate_limit)
         self._logged_in = False
@@ -68,16 +118,15 @@ class BBCOJScraper(BaseScraper):
     def login(self, username: str, password: str) -> bool:
         """Authenticate with BBC OJ and set up session headers."""
         try:
-            url = f"{self.BASE_URL}/api/login"
-            self.logger.debug(f"BBC OJ login request URL: {url}")
+            url = self._LOGIN_URL
+            self.logger.debug("BBC OJ login request URL: %s", url)
             payload = {
                 'username': username,
                 'password': password,
             }
             resp = self._request_with_retry(url, method='POST', json=payload)
-            self.logger.debug(f"BBC OJ login response status: {resp.status_code}")
-            resp.encoding = 'utf-8'
-            data = resp.json()
+            self.logger.debug("BBC OJ login response status: %s", resp.status_code)
+            data = self._json(resp)
 
             status = data.get('status', None)
             if status != 200:
@@ -102,6 +151,7 @@ class BBCOJScraper(BaseScraper):
 
             # JSESSIONID should be set automatically via cookie jar from Set-Cookie
             self._logged_in = True
+            self._remember_login(username, {'Authorization': token})
             self.logger.info(f"BBC OJ login successful for user: {username}")
             return True
 
@@ -111,6 +161,7 @@ class BBCOJScraper(BaseScraper):
 
     def _ensure_logged_in(self, platform_uid: str) -> bool:
         """Ensure we are logged in. Attempt login if not already authenticated."""
+        self.platform_uid = platform_uid
         if self._logged_in:
             return True
 
@@ -118,13 +169,25 @@ class BBCOJScraper(BaseScraper):
             self.logger.error("BBC OJ requires a password for authentication")
             return False
 
+        if self._restore_login(platform_uid):
+            self._logged_in = True
+            return True
+
         self.logger.info(f"BBC OJ attempting login for user: {platform_uid}")
         return self.login(platform_uid, self.auth_password)
 
-    def validate_account(self, platform_uid: str) -> bool:
-        """Validate account by attempting to login."""
+    def _relogin(self, platform_uid: str) -> bool:
+        """Discard the current (possibly cached) login and authenticate again."""
+        self._forget_login(platform_uid)
+        self._logged_in = False
+        self.session.headers.pop('Authorization', None)
+        self.session.cookies.clear()
         return self._ensure_logged_in(platform_uid)
 
+    def validate_account(self, platform_uid: str) -> bool:
+        """Validate account by logging in; a cached login is not trusted here."""
+        return self._relogin(platform_uid)
+
     def fetch_submissions(
         self, platform_uid: str, since: datetime = None, cursor: str = None,
         problem_id: str = None,
@@ -133,114 +196,169 @@ class BBCOJScraper(BaseScraper):
         if not self._ensure_logged_in(platform_uid):
             raise RuntimeError(f"BBC OJ 登录失败，请检查用户名和密码是否正确 (用户: {platform_uid})")
 
-        page = 1
-        limit = 20
-        reached_end = False
-
-        while not reached_end:
-            try:
-                url = (
-                    f"{self.BASE_URL}/api/get-submission-list"
-                    f"?limit={limit}&currentPage={page}&onlyMine=true"
-                )
-                if problem_id:
-                    url += f"&problemID={problem_id}"
-                resp = self._rate_limited_get(url)
-                self.logger.debug(f"BBC OJ submissions page {page} response status: {resp.status_code}")
-                resp.encoding = 'utf-8'
-                data = resp.json()
-
-                status = data.get('status', None)
-                if status != 200:
-                    self.logger.error(f"BBC OJ submission list error: {data.get('msg', 'Unknown')}")
-                    break
-
-                result = data.get('data', {})
-                records = result.get('records', [])
+        page_size = _CURSOR_PAGE_SIZE if cursor else _PAGE_SIZE
+        list_params = {'limit': page_size, 'onlyMine': 'true'}
+        if problem_id:
+            list_params['problemID'] = problem_id
 
+        try:
+            records, total = self._fetch_submission_page(list_params, 1)
+        except BBCOJAuthExpired:
+            # The token, often one restored from the login cache, was
+            # rejected: log in again once. Failing now is an error, not an
+            # empty page, so the sync does not report success.
+            self.logger.info(f"BBC OJ token rejected, logging in again for user: {platform_uid}")
+            if not self._relogin(platform_uid):
+                raise RuntimeError(f"BBC OJ 登录失败，请检查用户名和密码是否正确 (用户: {platform_uid})")
+            records, total = self._fetch_submission_page(list_params, 1)
+        except _PAGE_ERRORS as e:
+            self.logger.error(f"Error fetching BBC OJ submissions page 1: {e}")
+            return
+
+        num_pages = -(-total // page_size)
+        # A full sync needs every page, so fetch the rest concurrently. An
+        # incremental sync (cursor/since) usually stops within the first
+        # pages, so it keeps fetching one page at a time.
+        if cursor or since:
+            rest = self._iter_pages_serial(list_params, num_pages)
+        else:
+            rest = self._iter_pages_parallel(list_params, num_pages)
+
+        pages = chain([(1, records)], rest)
+        try:
+            for page, records in pages:
                 if not records:
                     break
-
-                for record in records:
-                    submit_id = str(record.get('submitId', ''))
-
-                    # If we have a cursor, stop at the last seen submission
-                    if cursor and submit_id == cursor:
-                        reached_end = True
-                        break
-
-                    # Parse submission time
-                    submit_time_str = record.get('submitTime', None)
-                    submitted_at = datetime.utcnow()
-                    if submit_time_str:
-                        try:
-                            # HOJ returns ISO-8601 or epoch-style timestamps
-                            if isinstance(submit_time_str, str):
-                                # HOJ returns UTC timestamps (ISO-8601, possibly Z-suffixed)
-                                clean_time = submit_time_str.replace('T', ' ').replace('Z', '')
-                                if '.' in clean_time:
-                                    clean_time = clean_time.split('.')[0]
-                                submitted_at = datetime.strptime(clean_time, '%Y-%m-%d %H:%M:%S')
-                            elif isinstance(submit_time_str, (int, float)):
-                                # Epoch timestamps are already UTC
-                                submitted_at = datetime.utcfromtimestamp(submit_time_str / 1000.0)
-                        except (ValueError, TypeError) as e:
-                            self.logger.debug(f"Could not parse submit time '{submit_time_str}': {e}")
-
-                    # Check since boundary
-                    if since and submitted_at < since:
-                        reached_end = True
-                        break
-
-                    # Map fields
-                    problem_id = str(record.get('displayPid', record.get('pid', '')))
-                    raw_status = record.get('status', -10)
-                    status_str = self.map_status(raw_status)
-
-                    score = record.get('score', None)
-                    if score is not None:
-                        score = int(score)
-
-                    language = record.get('language', None)
-                    if language and language in _LANG_MAP:
-                        language = _LANG_MAP[language]
-
-                    time_ms = record.get('time', None)
-                    if time_ms is not None:
-                        time_ms = int(time_ms)
-
-                    memory_kb = record.get('memory', None)
-                    if memory_kb is not None:
-                        memory_kb = int(memory_kb)
-
-                    yield ScrapedSubmission(
-                        platform_record_id=submit_id,
-                        problem_id=problem_id,
-                        status=status_str,
-                        score=score,
-                        language=language,
-                        time_ms=time_ms,
-                        memory_kb=memory_kb,
-                        submitted_at=submitted_at,
-                    )
-
-                # Pagination check
-                total = result.get('total', 0)
-                if page * limit >= total:
+                try:
+                    for record in records:
+                        submission = self._parse_submission(record)
+
+                        # If we have a cursor, stop at the last seen submission
+                        if cursor and submission.platform_record_id == cursor:
+                            return
+                        # Check since boundary
+                        if since and submission.submitted_at < since:
+                            return
+
+                        yield submission
+                except _RECORD_ERRORS as e:
+                    self.logger.error(f"Error fetching BBC OJ submissions page {page}: {e}")
                     break
-                page += 1
+        finally:
+            rest.close()
 
-            except Exception as e:
+    def _fetch_submission_page(self, list_params: dict, page: int) -> tuple[list, int]:
+        """Fetch one page of the submission list as (records, total)."""
+        try:
+            resp = self._rate_limited_get(
+                self._SUBMISSION_LIST_URL, params={**list_params, 'currentPage': page},
+            )
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code in _AUTH_STATUSES:
+                raise self._auth_expired(f"HTTP {e.response.status_code}") from e
+            raise
+        self.logger.debug("BBC OJ submissions page %s response status: %s", page, resp.status_code)
+        data = self._json(resp)
+
+        status = data.get('status', None)
+        if status in _AUTH_STATUSES:
+            raise self._auth_expired(data.get('msg', 'Unauthorized'))
+        if status != 200:
+            raise RuntimeError(f"submission list error: {data.get('msg', 'Unknown')}")
+        result = data.get('data', {})
+        return result.get('records', []), result.get('total', 0)
+
+    def _auth_expired(self, msg: str) -> BBCOJAuthExpired:
+        """Drop the rejected login from the cache and return the error to raise."""
+        if self.platform_uid:
+            self._forget_login(self.platform_uid)
+        return BBCOJAuthExpired(f"submission list error: {msg}")
+
+    def _iter_pages_serial(self, list_params: dict, num_pages: int):
+        """Yield (page, records) for pages 2..num_pages, fetched on demand."""
+        for page in range(2, num_pages + 1):
+            try:
+                records, _total = self._fetch_submission_page(list_params, page)
+            except _PAGE_ERRORS as e:
                 self.logger.error(f"Error fetching BBC OJ submissions page {page}: {e}")
-                break
+                return
+            yield page, records
+
+    def _iter_pages_parallel(self, list_params: dict, num_pages: int):
+        """Yield (page, records) for pages 2..num_pages in order, fetched concurrently."""
+        if num_pages < 2:
+            return
+        executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS)
+        try:
+            futures = [
+                (page, executor.submit(self._fetch_submission_page, list_params, page))
+                for page in range(2, num_pages + 1)
+            ]
+            for page, future in futures:
+                try:
+                    records, _total = future.result()
+                except _PAGE_ERRORS as e:
+                    self.logger.error(f"Error fetching BBC OJ submissions page {page}: {e}")
+                    return
+                yield page, records
+        finally:
+            # Stop queued page fetches if the caller stops iterating early
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _parse_submission(self, record: dict) -> ScrapedSubmission:
+        """Map one HOJ submission record to a ScrapedSubmission."""
+        submit_id = str(record.get('submitId', ''))
+
+        # Parse submission time
+        submit_time_str = record.get('submitTime', None)
+        submitted_at = datetime.utcnow()
+        if submit_time_str:
+            try:
+                # HOJ returns UTC timestamps: ISO-8601 (possibly Z-suffixed)
+                # or epoch milliseconds
+                submitted_at = parse_utc_timestamp(submit_time_str)
+            except (ValueError, TypeError) as e:
+                self.logger.debug("Could not parse submit time '%s': %s", submit_time_str, e)
+
+        # Map fields
+        problem_id = str(record.get('displayPid', record.get('pid', '')))
+        raw_status = record.get('status', -10)
+        status_str = self.map_status(raw_status)
+
+        score = record.get('score', None)
+        if score is not None:
+            score = int(score)
+
+        language = record.get('language', None)
+        if language and language in _LANG_MAP:
+            language = _LANG_MAP[language]
+
+        time_ms = record.get('time', None)
+        if time_ms is not None:
+            time_ms = int(time_ms)
+
+        memory_kb = record.get('memory', None)
+        if memory_kb is not None:
+            memory_kb = int(memory_kb)
+
+        return ScrapedSubmission(
+            platform_record_id=submit_id,
+            problem_id=problem_id,
+            status=status_str,
+            score=score,
+            language=language,
+            time_ms=time_ms,
+            memory_kb=memory_kb,
+            submitted_at=submitted_at,
+        )
 
     def fetch_problem(self, problem_id: str) -> ScrapedProblem | None:
         """Fetch problem details from BBC OJ."""
         try:
-            url = f"{self.BASE_URL}/api/get-problem-detail?problemId={problem_id}"
-            resp = self._rate_limited_get(url)
-            resp.encoding = 'utf-8'
-            data = resp.json()
+            resp = self._rate_limited_get(
+                self._PROBLEM_DETAIL_URL, params={'problemId': problem_id},
+            )
+            data = self._json(resp)
 
             status = data.get('status', None)
             if status != 200:
@@ -315,10 +433,10 @@ class BBCOJScraper(BaseScraper):
         """Fetch tags for a specific problem from the tags API."""
         try:
             if self._tag_cache is None:
-                url = f"{self.BASE_URL}/api/get-problem-tags-and-classification?oj=ME"
-                resp = self._rate_limited_get(url)
-                resp.encoding = 'utf-8'
-                data = resp.json()
+                resp = self._rate_limited_get(
+                    self._PROBLEM_TAGS_URL, params={'oj': 'ME'},
+                )
+                data = self._json(resp)
                 if data.get('status') == 200:
                     self._tag_cache = data.get('data', {})
                 else:
@@ -329,16 +447,17 @@ class BBCOJScraper(BaseScraper):
             return []
 
         except Exception as e:
-            self.logger.debug(f"Error fetching tags: {e}")
+            self.logger.debug("Error fetching tags: %s", e)
             return []
 
     def fetch_submission_code(self, record_id: str) -> str | None:
         """Fetch source code for a specific submission."""
         try:
-            url = f"{self.BASE_URL}/api/get-submission-detail?submitId={record_id}&cid=0"
-            resp = self._rate_limited_get(url)
-            resp.encoding = 'utf-8'
-            data = resp.json()
+            resp = self._rate_limited_get(
+                self._SUBMISSION_DETAIL_URL,
+                params={'submitId': record_id, 'cid': 0},
+            )
+            data = self._json(resp)
 
             status = data.get('status', None)
             if status != 200:
@@ -357,14 +476,10 @@ class BBCOJScraper(BaseScraper):
 
     def map_status(self, raw_status) -> str:
         """Map HOJ numeric status code to SubmissionStatus string."""
-        if isinstance(raw_status, str):
-            try:
-                raw_status = int(raw_status)
-            except (ValueError, TypeError):
-                return SubmissionStatus.UNKNOWN.value
-
-        status = _STATUS_MAP.get(raw_status, SubmissionStatus.UNKNOWN)
-        return status.value if isinstance(status, SubmissionStatus) else str(status)
+        status = _STATUS_VALUES.get(raw_status)
+        if status is None and isinstance(raw_status, str):
+            status = _STATUS_VALUES_BY_STR.get(raw_status.strip())
+        return status or SubmissionStatus.UNKNOWN.value
 
     def map_difficulty(self, raw_difficulty) -> int:
         """Map BBC OJ difficulty to numeric level (0-7).
@@ -372,22 +487,14 @@ class BBCOJScraper(BaseScraper):
         HOJ typically uses string difficulty labels or numeric levels.
         Maps: 简单=1, 中等=2, 困难=3. Numeric values are clamped to 0-7.
         """
-        difficulty_map = {
-            '简单': 1,
-            '中等': 2,
-            '困难': 3,
-            'Easy': 1,
-            'Medium': 2,
-            'Hard': 3,
-        }
-
         if isinstance(raw_difficulty, int):
             return min(max(raw_difficulty, 0), 7)
 
         if isinstance(raw_difficulty, str):
             # Check label mapping first
-            if raw_difficulty in difficulty_map:
-                return difficulty_map[raw_difficulty]
+            level = _DIFFICULTY_MAP.get(raw_difficulty)
+            if level is not None:
+                return level
             # Numeric string — clamp to range
             try:
                 return min(max(int(raw_difficulty), 0), 7)
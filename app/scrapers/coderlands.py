@@ -3,10 +3,17 @@ from __future__ import annotations
 import hashlib
 import logging
 import re
-from datetime import datetime, timedelta
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from typing import Generator
 
-from .base import BaseScraper
+from sqlalchemy import and_, case, func
+
+from app.extensions import db
+from app.models import PlatformAccount, Problem, Submission
+
+from .base import BaseScraper, FETCH_WORKERS
 from .common import ScrapedSubmission, ScrapedProblem, SubmissionStatus
 from . import register_scraper
 
@@ -51,8 +58,70 @@ _LANG_MAP: dict[str, str] = {
 
 # 32-hex-char UUID pattern
 _UUID_RE = re.compile(r'^[0-9a-fA-F]{32}$')
-# P{number} problem ID pattern
-_PNO_RE = re.compile(r'^P(\d+)$', re.IGNORECASE)
+
+_parse_iso = datetime.fromisoformat
+_UTC8_OFFSET = timedelta(hours=8)
+
+# Separator in the exercise API's acStr/unAcStr problem lists
+_ID_SPLIT_RE = re.compile(r'[,\s]+')
+
+# How far before the previous sync's exercise snapshot to re-read
+# submissions. last_sync_at is stamped when a sync finishes, so a submission
+# made while it ran can predate it on a problem that was already fetched.
+_SYNC_OVERLAP = timedelta(minutes=15)
+
+# Problem IDs per IN (...) query, well under SQLite's bound-parameter limit
+_DB_CHUNK_SIZE = 500
+
+# Lesson item names look like "P11311 digit函数"
+_LESSON_ITEM_RE = re.compile(r'^P(\d+)\s')
+
+# problemNo → UUID, shared by all scraper instances in this process. UUIDs
+# never change, so later syncs skip both the DB load and getProbelmUuid for
+# problems resolved before, including ones with no Problem row to store
+# them on. Problem.platform_uuid remains the copy that survives restarts.
+_shared_uuid_cache: dict[str, str] = {}
+# problemNos of the cache already checked against the Problem table: their
+# UUID is stored there, or they had no row yet (rows created later take it
+# from ScrapedProblem.platform_uuid). Shared with the cache it tracks.
+_persisted_uuid_nos: set[str] = set()
+# Guards both; concurrent syncs and the lesson/UUID thread pools write them
+_uuid_lock = threading.Lock()
+
+
+def _problem_no(problem_id: str) -> str | None:
+    """Return the number of a P{number} problem ID (case-insensitive), else None.
+
+    A slice and str.isdecimal() instead of a regex: this runs for every
+    problem ID in exercise lists and DB scans.
+    """
+    if problem_id[:1] in ('P', 'p') and problem_id[1:].isdecimal():
+        return problem_id[1:]
+    return None
+
+
+def _add_problem_nos(ids_str: str, dst: set[str]) -> None:
+    """Add the problem numbers in a comma/space separated list to *dst*."""
+    for pid in _ID_SPLIT_RE.split(ids_str):
+        if pid:
+            # Strip P/p prefix if present
+            dst.add(_problem_no(pid) or pid)
+
+
+def _result_data(result) -> dict:
+    """Return the record in an API result, which may be wrapped as {data: {...}}."""
+    if not isinstance(result, dict):
+        return {}
+    data = result.get('data', result)
+    return data if isinstance(data, dict) else {}
+
+
+def _result_items(result) -> list:
+    """Return the items of a list API result: its dataList, or the bare list."""
+    if isinstance(result, dict):
+        items = result.get('dataList')
+        return items if isinstance(items, list) else []
+    return result if isinstance(result, list) else []
 
 
 class CoderlandsSessionExpired(Exception):
@@ -81,8 +150,12 @@ class CoderlandsScraper(BaseScraper):
                 auth_cookie = f'JSESSIONID={auth_cookie}'
         super().__init__(auth_cookie=auth_cookie, auth_password=auth_password,
                          rate_limit=rate_limit, platform_uid=platform_uid)
-        self._uuid_cache: dict[str, str] = {}  # problemNo → UUID
+        self._uuid_cache: dict[str, str] = _shared_uuid_cache  # problemNo → UUID
+        self._persisted_uuid_nos: set[str] = _persisted_uuid_nos
         self._lesson_cache: list[dict] | None = None
+        # problemNos that neither getProbelmUuid nor the lesson sweep resolved
+        self._uuid_negative: set[str] = set()
+        self._account_ids: dict[str, int | None] = {}  # platform_uid → account id
 
     # ── Session management ──
 
@@ -90,8 +163,7 @@ class CoderlandsScraper(BaseScraper):
         """GET a Coderlands API endpoint, return parsed JSON result."""
         url = f"{self.BASE_URL}{path}"
         resp = self._rate_limited_get(url, **kwargs)
-        resp.encoding = 'utf-8'
-        data = resp.json()
+        data = self._json(resp)
         if not isinstance(data, dict) or data.get('code') != 1:
             msg = data.get('msg', '') if isinstance(data, dict) else str(data)
             if '登录' in msg or '未登录' in msg or data.get('code') == -1:
@@ -105,8 +177,7 @@ class CoderlandsScraper(BaseScraper):
         """POST a Coderlands API endpoint, return parsed JSON result."""
         url = f"{self.BASE_URL}{path}"
         resp = self._request_with_retry(url, method='POST', **kwargs)
-        resp.encoding = 'utf-8'
-        data = resp.json()
+        data = self._json(resp)
         if not isinstance(data, dict) or data.get('code') != 1:
             msg = data.get('msg', '') if isinstance(data, dict) else str(data)
             if '登录' in msg or '未登录' in msg or data.get('code') == -1:
@@ -146,9 +217,14 @@ class CoderlandsScraper(BaseScraper):
         2. Filter out problems that already have AC in DB (skip entirely)
         3. Hash-based change detection via cursor to minimise API calls
         4. Map problem IDs → UUIDs → fetch submissions per problem
+
+        The cursor is ``"{exercise_hash}|{snapshot time}"``; the snapshot
+        time bounds ``since`` so a sync never skips submissions made while
+        the previous one was running.
         """
         try:
             # Step 1: Get exercise data
+            captured_at = datetime.utcnow()
             exercise_data = self._fetch_exercise_data()
             if exercise_data is None:
                 return
@@ -161,18 +237,20 @@ class CoderlandsScraper(BaseScraper):
                 return
 
             # Step 2: Filter out locally-AC'd problems
-            from app.models import Submission, PlatformAccount, Problem
-            locally_ac_ids = self._get_locally_ac_problem_ids(platform_uid)
+            db_known_ids, locally_ac_ids = self._get_db_problem_status(platform_uid)
 
             # Step 3: Hash-based change detection
             exercise_hash = self._compute_exercise_hash(all_ac_ids, all_unac_ids)
-            hash_changed = (cursor != exercise_hash) if cursor else True
+            prev_hash, prev_captured_at = self._split_cursor(cursor)
+            hash_changed = (prev_hash != exercise_hash) if prev_hash else True
+            new_cursor = f"{exercise_hash}|{captured_at.isoformat(timespec='seconds')}"
+            if since:
+                since = min(since, (prev_captured_at or since) - _SYNC_OVERLAP)
 
             # Determine which problems to sync
             problems_to_sync: set[str] = set()
 
             # Always sync problems never seen in DB
-            db_known_ids = self._get_db_known_problem_ids(platform_uid)
             new_problems = all_problem_ids - db_known_ids
             problems_to_sync |= new_problems
 
@@ -197,30 +275,18 @@ class CoderlandsScraper(BaseScraper):
                 # Still need to update cursor to current hash
                 # Yield a sentinel-less return; SyncService will keep old cursor
                 # We store the hash as new_cursor via a special attribute
-                self._new_cursor = exercise_hash
+                self._new_cursor = new_cursor
                 return
 
             # Step 4: Map problem numbers to UUIDs
             uuid_map = self._resolve_uuids(problems_to_sync)
 
-            # Step 5: Fetch submissions per problem
+            # Step 5: Fetch submissions per problem, several problems at once
             # For new-to-DB problems, ignore `since` — we need their full history
-            for problem_no, uuid in uuid_map.items():
-                problem_id = f"P{problem_no}"
-                effective_since = None if problem_no in new_problems else since
-                try:
-                    yield from self._fetch_problem_submissions(
-                        problem_id, uuid, effective_since
-                    )
-                except CoderlandsSessionExpired:
-                    raise
-                except Exception as e:
-                    self.logger.error(
-                        f"Error fetching submissions for {problem_id}: {e}"
-                    )
+            yield from self._iter_submissions_parallel(uuid_map, new_problems, since)
 
             # Store the new cursor hash
-            self._new_cursor = exercise_hash
+            self._new_cursor = new_cursor
 
         except CoderlandsSessionExpired:
             raise Exception("Session 已过期，请重新复制 JSESSIONID Cookie")
@@ -238,19 +304,19 @@ class CoderlandsScraper(BaseScraper):
                 f'/server/student/stady/getClassWorkOne'
                 f'?uuid={uuid_param}&lessonUuid=personalCenter'
             )
-            data = result.get('data', result) if isinstance(result, dict) else result
+            data = _result_data(result)
 
-            if not data or not isinstance(data, dict):
+            if not data:
                 self.logger.warning(f"Coderlands: empty data for problem {problem_id}")
                 return None
 
             problem_no = str(data.get('problemNo', ''))
             canonical_id = f"P{problem_no}" if problem_no else problem_id
 
-            # Cache UUID mapping if available and persist to DB
+            # Cache UUID mapping if available; callers store it on the
+            # Problem row from ScrapedProblem.platform_uuid
             if problem_no and data.get('uuid'):
-                self._uuid_cache[problem_no] = data['uuid']
-                self._persist_single_uuid(problem_no, data['uuid'])
+                self._cache_uuids({problem_no: data['uuid']})
 
             title = data.get('problemName', '')
             difficulty_raw = data.get('difficultLevel', '')
@@ -318,8 +384,8 @@ class CoderlandsScraper(BaseScraper):
             result = self._api_get(
                 f'/server/student/stady/mDetail?uuid={submission_uuid}'
             )
-            data = result.get('data', result) if isinstance(result, dict) else result
-            if not data or not isinstance(data, dict):
+            data = _result_data(result)
+            if not data:
                 return None
 
             return data.get('code')
@@ -359,7 +425,7 @@ class CoderlandsScraper(BaseScraper):
                 json={},
             )
 
-            data_list = result.get('dataList', []) if isinstance(result, dict) else []
+            data_list = _result_items(result)
             ac_ids: set[str] = set()
             unac_ids: set[str] = set()
 
@@ -367,18 +433,9 @@ class CoderlandsScraper(BaseScraper):
                 ac_str = item.get('acStr', '')
                 unac_str = item.get('unAcStr', '')
                 if ac_str:
-                    for pid in re.split(r'[,\s]+', ac_str):
-                        pid = pid.strip()
-                        if pid:
-                            # Strip P/p prefix if present
-                            m = _PNO_RE.match(pid)
-                            ac_ids.add(m.group(1) if m else pid)
+                    _add_problem_nos(ac_str, ac_ids)
                 if unac_str:
-                    for pid in re.split(r'[,\s]+', unac_str):
-                        pid = pid.strip()
-                        if pid:
-                            m = _PNO_RE.match(pid)
-                            unac_ids.add(m.group(1) if m else pid)
+                    _add_problem_nos(unac_str, unac_ids)
 
             return ac_ids, unac_ids
 
@@ -388,6 +445,20 @@ class CoderlandsScraper(BaseScraper):
             self.logger.error(f"Error fetching exercise data: {e}")
             return None
 
+    @staticmethod
+    def _split_cursor(cursor: str | None) -> tuple[str | None, datetime | None]:
+        """Split a sync cursor into (exercise hash, snapshot time).
+
+        Cursors stored before the snapshot time was added are a bare hash.
+        """
+        if not cursor:
+            return None, None
+        exercise_hash, _, captured = cursor.partition('|')
+        try:
+            return exercise_hash, datetime.fromisoformat(captured)
+        except ValueError:
+            return exercise_hash, None
+
     def _compute_exercise_hash(self, ac_ids: set[str], unac_ids: set[str]) -> str:
         """Compute a stable hash of the exercise data for change detection."""
         content = (
@@ -397,55 +468,44 @@ class CoderlandsScraper(BaseScraper):
 
     # ── DB queries for incremental sync ──
 
-    def _get_locally_ac_problem_ids(self, platform_uid: str) -> set[str]:
-        """Return set of problem numbers (without P prefix) that have AC submissions locally."""
-        from app.models import Submission, PlatformAccount, Problem
+    def _get_account_id(self, platform_uid: str) -> int | None:
+        """Return the PlatformAccount id for *platform_uid*, looked up once."""
+        if platform_uid not in self._account_ids:
+            row = db.session.query(PlatformAccount.id).filter_by(
+                platform=self.PLATFORM_NAME, platform_uid=platform_uid
+            ).first()
+            self._account_ids[platform_uid] = row[0] if row else None
+        return self._account_ids[platform_uid]
 
-        account = PlatformAccount.query.filter_by(
-            platform=self.PLATFORM_NAME, platform_uid=platform_uid
-        ).first()
-        if not account:
-            return set()
+    def _get_db_problem_status(self, platform_uid: str) -> tuple[set[str], set[str]]:
+        """Return (known, locally_ac) problem numbers (without P prefix).
 
-        # Find problems with AC submissions for this account
-        ac_problems = (
-            Problem.query
-            .join(Submission, Submission.problem_id_ref == Problem.id)
+        *known* holds every problem of this platform in the DB, and
+        *locally_ac* those with an AC submission from this account. Both
+        come from one query over Problem left-joined to the account's
+        submissions.
+        """
+        account_id = self._get_account_id(platform_uid)
+        has_ac = func.max(case(
+            (Submission.status == SubmissionStatus.AC.value, 1), else_=0,
+        ))
+        # The DB strips the P/p prefix, so rows come back as bare numbers
+        rows = (
+            db.session.query(func.substr(Problem.problem_id, 2), has_ac)
+            .outerjoin(Submission, and_(
+                Submission.problem_id_ref == Problem.id,
+                Submission.platform_account_id == account_id,
+            ))
             .filter(
-                Submission.platform_account_id == account.id,
-                Submission.status == SubmissionStatus.AC.value,
                 Problem.platform == self.PLATFORM_NAME,
+                Problem.problem_id.ilike('P%'),
             )
-            .with_entities(Problem.problem_id)
-            .distinct()
+            .group_by(Problem.problem_id)
             .all()
         )
-
-        # Extract number from P{number}
-        result = set()
-        for (pid,) in ac_problems:
-            m = _PNO_RE.match(pid)
-            if m:
-                result.add(m.group(1))
-        return result
-
-    def _get_db_known_problem_ids(self, platform_uid: str) -> set[str]:
-        """Return set of problem numbers that exist in DB for this platform."""
-        from app.models import Problem
-
-        problems = (
-            Problem.query
-            .filter_by(platform=self.PLATFORM_NAME)
-            .with_entities(Problem.problem_id)
-            .all()
-        )
-
-        result = set()
-        for (pid,) in problems:
-            m = _PNO_RE.match(pid)
-            if m:
-                result.add(m.group(1))
-        return result
+        known = {no for no, _ac in rows if no.isdecimal()}
+        locally_ac = {no for no, ac in rows if ac and no in known}
+        return known, locally_ac
 
     # ── UUID resolution ──
 
@@ -461,20 +521,22 @@ class CoderlandsScraper(BaseScraper):
         """
         if _UUID_RE.match(problem_id):
             return problem_id
-        m = _PNO_RE.match(problem_id)
-        no = m.group(1) if m else problem_id
+        no = _problem_no(problem_id) or problem_id
         # Try cache
         if no in self._uuid_cache:
             return self._uuid_cache[no]
+        if no in self._uuid_negative:
+            return problem_id
         # Try getProbelmUuid API (fast, 100% hit rate)
         uuid = self._fetch_problem_uuid(no)
         if uuid:
-            self._uuid_cache[no] = uuid
+            self._cache_uuids({no: uuid})
             return uuid
         # Fall back to lesson traversal (for edge cases)
         self._build_uuid_map_from_lessons()
         if no in self._uuid_cache:
             return self._uuid_cache[no]
+        self._uuid_negative.add(no)
         self.logger.warning(
             f"Coderlands: could not resolve UUID for problem {problem_id}, "
             f"getClassWorkOne will likely fail"
@@ -509,11 +571,13 @@ class CoderlandsScraper(BaseScraper):
         self.logger.info(
             f"Coderlands: {len(remaining)} problems need UUID via getProbelmUuid"
         )
-        for no in sorted(remaining):
-            uuid = self._fetch_problem_uuid(no)
+        ordered = sorted(remaining)
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            uuids = list(executor.map(self._fetch_problem_uuid, ordered))
+        for no, uuid in zip(ordered, uuids):
             if uuid:
-                self._uuid_cache[no] = uuid
                 result[no] = uuid
+        self._cache_uuids({no: result[no] for no in ordered if no in result})
 
         # Persist all newly discovered UUIDs to DB
         self._persist_uuids_to_db()
@@ -536,7 +600,6 @@ class CoderlandsScraper(BaseScraper):
     def _load_uuids_from_db(self, problem_nos: set[str]) -> None:
         """Load persisted platform_uuid values from DB into _uuid_cache."""
         try:
-            from app.models import Problem
             pid_list = [f'P{no}' for no in problem_nos if no not in self._uuid_cache]
             if not pid_list:
                 return
@@ -545,49 +608,63 @@ class CoderlandsScraper(BaseScraper):
                 Problem.problem_id.in_(pid_list),
                 Problem.platform_uuid.isnot(None),
             ).all()
-            loaded = 0
+            found = {}
             for p in db_problems:
-                m = _PNO_RE.match(p.problem_id)
-                if m:
-                    self._uuid_cache[m.group(1)] = p.platform_uuid
-                    loaded += 1
+                no = _problem_no(p.problem_id)
+                if no:
+                    found[no] = p.platform_uuid
+            self._cache_uuids(found, persisted=True)
+            loaded = len(found)
             if loaded:
                 self.logger.info(f"Coderlands: loaded {loaded} UUIDs from DB")
         except Exception as e:
-            self.logger.debug(f"Coderlands: DB UUID load failed (ok outside app ctx): {e}")
+            self.logger.debug("Coderlands: DB UUID load failed (ok outside app ctx): %s", e)
+
+    def _cache_uuids(self, uuids: dict[str, str], persisted: bool = False) -> None:
+        """Add problemNo → UUID pairs to the shared cache.
+
+        *persisted* marks them as already stored on their Problem rows.
+        """
+        if not uuids:
+            return
+        with _uuid_lock:
+            self._uuid_cache.update(uuids)
+            if persisted:
+                self._persisted_uuid_nos.update(uuids)
 
     def _persist_uuids_to_db(self) -> None:
-        """Write newly discovered UUIDs back to Problem.platform_uuid."""
+        """Write newly discovered UUIDs back to Problem.platform_uuid.
+
+        Problems are looked up with one IN query per chunk of cache entries
+        not yet checked. Every checked number is marked, including ones with
+        no Problem row, so each is queried once per process.
+        """
         try:
-            from app.models import Problem
-            from app.extensions import db
+            with _uuid_lock:
+                pending = [
+                    (no, uuid) for no, uuid in list(self._uuid_cache.items())
+                    if no not in self._persisted_uuid_nos
+                ]
             updated = 0
-            for pno, puuid in self._uuid_cache.items():
-                problem = Problem.query.filter_by(
-                    platform=self.PLATFORM_NAME, problem_id=f'P{pno}'
-                ).first()
-                if problem and not problem.platform_uuid:
-                    problem.platform_uuid = puuid
-                    updated += 1
+            for start in range(0, len(pending), _DB_CHUNK_SIZE):
+                chunk = dict(pending[start:start + _DB_CHUNK_SIZE])
+                problems = Problem.query.filter(
+                    Problem.platform == self.PLATFORM_NAME,
+                    Problem.problem_id.in_([f'P{no}' for no in chunk]),
+                    Problem.platform_uuid.is_(None),
+                )
+                for problem in problems:
+                    no = _problem_no(problem.problem_id)
+                    if no in chunk:
+                        problem.platform_uuid = chunk[no]
+                        updated += 1
+                with _uuid_lock:
+                    self._persisted_uuid_nos.update(chunk)
             if updated:
                 db.session.flush()
                 self.logger.info(f"Coderlands: persisted {updated} UUIDs to DB")
         except Exception as e:
-            self.logger.debug(f"Coderlands: DB UUID persist failed (ok outside app ctx): {e}")
-
-    def _persist_single_uuid(self, problem_no: str, uuid: str) -> None:
-        """Write a single UUID back to Problem.platform_uuid if not already set."""
-        try:
-            from app.models import Problem
-            from app.extensions import db
-            problem = Problem.query.filter_by(
-                platform=self.PLATFORM_NAME, problem_id=f'P{problem_no}'
-            ).first()
-            if problem and not problem.platform_uuid:
-                problem.platform_uuid = uuid
-                db.session.flush()
-        except Exception:
-            pass  # Best-effort; bulk persist handles the rest
+            self.logger.debug("Coderlands: DB UUID persist failed (ok outside app ctx): %s", e)
 
     def _fetch_problem_uuid(self, problem_no: str) -> str | None:
         """Resolve a single problem number to UUID via getProbelmUuid API.
@@ -604,8 +681,7 @@ class CoderlandsScraper(BaseScraper):
                 data=f'problemNo=P{problem_no}',
                 headers={'Content-Type': 'application/x-www-form-urlencoded'},
             )
-            resp.encoding = 'utf-8'
-            data = resp.json()
+            data = self._json(resp)
             # Response may be flat {isSuccess, data} or wrapped {code, result: {isSuccess, data}}
             inner = data
             if isinstance(data, dict) and 'result' in data and isinstance(data['result'], dict):
@@ -616,7 +692,7 @@ class CoderlandsScraper(BaseScraper):
                     return uuid
             return None
         except Exception as e:
-            self.logger.debug(f"getProbelmUuid failed for {problem_no}: {e}")
+            self.logger.debug("getProbelmUuid failed for %s: %s", problem_no, e)
             return None
 
     def _build_uuid_map_from_lessons(self) -> None:
@@ -660,47 +736,17 @@ class CoderlandsScraper(BaseScraper):
                 f"classUuid={class_uuid[:8]}..."
             )
 
-            # Traverse each lesson to discover problems
+            # Traverse each lesson to discover problems. A
+            # CoderlandsSessionExpired from any lesson is re-raised here by
+            # map().
             problems_found = 0
-            for lesson in lesson_infos:
-                if not isinstance(lesson, dict):
-                    continue
-                lesson_uuid = lesson.get('uuid', '')
-                lesson_name = lesson.get('lessonName', '')
-                if not lesson_uuid:
-                    continue
-
-                try:
-                    params = f'uuid={lesson_uuid}'
-                    if class_uuid:
-                        params += f'&classUuid={class_uuid}'
-                    lesson_result = self._api_get(
-                        f'/server/student/stady/getlesconNew?{params}'
-                    )
-                    data_list = (
-                        lesson_result.get('dataList', [])
-                        if isinstance(lesson_result, dict) else []
-                    )
-                    for item in data_list:
-                        if not isinstance(item, dict):
-                            continue
-                        puuid = item.get('uuid', '')
-                        name = item.get('name', '')
-                        if not puuid or not name:
-                            continue
-                        # Extract problem number from name like "P11311 digit函数"
-                        m = re.match(r'^P(\d+)\s', name)
-                        if m:
-                            pno = m.group(1)
-                            self._uuid_cache[pno] = puuid
-                            problems_found += 1
-
-                except CoderlandsSessionExpired:
-                    raise
-                except Exception as e:
-                    self.logger.debug(
-                        f"Error traversing lesson '{lesson_name}': {e}"
-                    )
+            with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+                for found in executor.map(
+                    lambda lesson: self._fetch_lesson_problems(lesson, class_uuid),
+                    lesson_infos,
+                ):
+                    self._cache_uuids(dict(found))
+                    problems_found += len(found)
 
             self.logger.info(
                 f"Coderlands: lesson traversal complete — "
@@ -716,6 +762,43 @@ class CoderlandsScraper(BaseScraper):
         except Exception as e:
             self.logger.error(f"Error building UUID map from lessons: {e}")
 
+    def _fetch_lesson_problems(
+        self, lesson, class_uuid: str
+    ) -> list[tuple[str, str]]:
+        """Return (problemNo, UUID) pairs listed by one lesson's getlesconNew."""
+        if not isinstance(lesson, dict):
+            return []
+        lesson_uuid = lesson.get('uuid', '')
+        if not lesson_uuid:
+            return []
+
+        found: list[tuple[str, str]] = []
+        try:
+            params = f'uuid={lesson_uuid}'
+            if class_uuid:
+                params += f'&classUuid={class_uuid}'
+            lesson_result = self._api_get(
+                f'/server/student/stady/getlesconNew?{params}'
+            )
+            data_list = _result_items(lesson_result)
+            for item in data_list:
+                if not isinstance(item, dict):
+                    continue
+                puuid = item.get('uuid', '')
+                name = item.get('name', '')
+                if not puuid or not name:
+                    continue
+                m = _LESSON_ITEM_RE.match(name)
+                if m:
+                    found.append((m.group(1), puuid))
+        except CoderlandsSessionExpired:
+            raise
+        except Exception as e:
+            self.logger.debug(
+                "Error traversing lesson '%s': %s", lesson.get('lessonName', ''), e,
+            )
+        return found
+
     # ── Per-problem submission fetching ──
 
     def _fetch_problem_submissions(
@@ -726,9 +809,7 @@ class CoderlandsScraper(BaseScraper):
             result = self._api_get(
                 f'/server/student/stady/listSubNew?problemUuid={problem_uuid}'
             )
-            data_list = result.get('dataList', []) if isinstance(result, dict) else []
-            if isinstance(result, list):
-                data_list = result
+            data_list = _result_items(result)
 
             for item in data_list:
                 if not isinstance(item, dict):
@@ -796,6 +877,42 @@ class CoderlandsScraper(BaseScraper):
                 f"Error fetching submissions for problem {problem_id}: {e}"
             )
 
+    def _iter_submissions_parallel(
+        self, uuid_map: dict[str, str], new_problems: set[str],
+        since: datetime | None,
+    ) -> Generator[ScrapedSubmission, None, None]:
+        """Yield each problem's submissions in uuid_map order, fetched concurrently.
+
+        A session expiry on any problem cancels the remaining fetches and
+        propagates.
+        """
+        def fetch(problem_no: str, uuid: str) -> list[ScrapedSubmission]:
+            effective_since = None if problem_no in new_problems else since
+            return list(self._fetch_problem_submissions(
+                f"P{problem_no}", uuid, effective_since
+            ))
+
+        executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS)
+        try:
+            futures = [
+                (problem_no, executor.submit(fetch, problem_no, uuid))
+                for problem_no, uuid in uuid_map.items()
+            ]
+            for problem_no, future in futures:
+                try:
+                    submissions = future.result()
+                except CoderlandsSessionExpired:
+                    raise
+                except Exception as e:
+                    self.logger.error(
+                        f"Error fetching submissions for P{problem_no}: {e}"
+                    )
+                    continue
+                yield from submissions
+        finally:
+            # Stop queued fetches on error or if the caller stops early
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def fetch_problem_submissions_by_uuid(
         self, problem_uuid: str
     ) -> list[ScrapedSubmission]:
@@ -810,8 +927,7 @@ class CoderlandsScraper(BaseScraper):
                 f'/server/student/stady/getClassWorkOne'
                 f'?uuid={problem_uuid}&lessonUuid=personalCenter'
             )
-            data = result.get('data', result) if isinstance(result, dict) else result
-            problem_no = str(data.get('problemNo', '')) if isinstance(data, dict) else ''
+            problem_no = str(_result_data(result).get('problemNo', ''))
             problem_id = f"P{problem_no}" if problem_no else problem_uuid
         except Exception:
             problem_id = problem_uuid
@@ -828,9 +944,12 @@ class CoderlandsScraper(BaseScraper):
         """
         if not time_str:
             return None
-        for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M'):
-            try:
-                return datetime.strptime(time_str, fmt) - timedelta(hours=8)
-            except ValueError:
-                continue
-        return None
+        # fromisoformat covers the 'YYYY-MM-DD HH:MM[:SS]' forms (space or
+        # 'T' separated) and is several times faster than strptime
+        try:
+            parsed = _parse_iso(time_str)
+        except (ValueError, TypeError):
+            return None
+        if parsed.tzinfo is not None:
+            return parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed - _UTC8_OFFSET
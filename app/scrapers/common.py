@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 
+_parse_iso = datetime.fromisoformat
+# Fractional seconds; fromisoformat() before Python 3.11 only accepts exactly
+# 3 or 6 digits, and the result is truncated to whole seconds anyway.
+_FRACTION_RE = re.compile(r'(?<=:\d\d)\.\d+')
+_MS_TO_S = 1 / 1000.0
+
 
 class SubmissionStatus(str, Enum):
     AC = 'AC'
@@ -45,3 +52,23 @@ class ScrapedProblem:
     output_desc: str | None = None
     examples: str | None = None
     hint: str | None = None
+
+
+def parse_utc_timestamp(value: str | int | float) -> datetime:
+    """Parse an ISO-8601 string or epoch-millisecond UTC timestamp.
+
+    Returns a naive UTC datetime truncated to whole seconds. A trailing 'Z'
+    is accepted; strings with an explicit offset are converted to UTC.
+
+    Raises:
+        ValueError: If the string is not ISO-8601.
+        TypeError: If *value* is neither a string nor a number.
+    """
+    if isinstance(value, str):
+        parsed = _parse_iso(_FRACTION_RE.sub('', value.rstrip('Z'), count=1))
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed.replace(microsecond=0)
+    if isinstance(value, (int, float)):
+        return datetime.utcfromtimestamp(value * _MS_TO_S)
+    raise TypeError(f'unsupported timestamp type: {type(value).__name__}')
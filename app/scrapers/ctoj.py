@@ -6,7 +6,9 @@ from datetime import datetime
 from typing import Generator
 
 from .base import BaseScraper
-from .common import ScrapedSubmission, ScrapedProblem, SubmissionStatus
+from .common import (
+    ScrapedSubmission, ScrapedProblem, SubmissionStatus, parse_utc_timestamp,
+)
 from . import register_scraper
 
 logger = logging.getLogger(__name__)
@@ -180,15 +182,9 @@ class CTOJScraper(BaseScraper):
                     judge_at = record.get('judgeAt', None)
                     if judge_at:
                         try:
-                            if isinstance(judge_at, str):
-                                clean_time = judge_at.replace('T', ' ').replace('Z', '')
-                                if '.' in clean_time:
-                                    clean_time = clean_time.split('.')[0]
-                                submitted_at = datetime.strptime(clean_time, '%Y-%m-%d %H:%M:%S')
-                            elif isinstance(judge_at, (int, float)):
-                                submitted_at = datetime.utcfromtimestamp(judge_at / 1000.0)
+                            submitted_at = parse_utc_timestamp(judge_at)
                         except (ValueError, TypeError) as e:
-                            self.logger.debug(f"Could not parse judgeAt '{judge_at}': {e}")
+                            self.logger.debug("Could not parse judgeAt '%s': %s", judge_at, e)
 
                     # Check since boundary
                     if since and submitted_at < since:
@@ -220,7 +220,7 @@ class YBTScraper(BaseScraper):
         try:
             fields = record_str.split('`')
             if len(fields) < 7:
-                self.logger.debug(f"Record has insufficient fields ({len(fields)}): {record_str[:80]}")
+                self.logger.debug("Record has insufficient fields (%s): %s", len(fields), record_str[:80])
                 return None
 
             # Field 0: Username:DisplayName
@@ -233,7 +233,7 @@ class YBTScraper(BaseScraper):
 
             flag_runid = fields[1]
             if len(flag_runid) < 2:
-                self.logger.debug(f"Invalid FLAG_RUNID: {flag_runid}")
+                self.logger.debug("Invalid FLAG_RUNID: %s", flag_runid)
                 return None
 
             # visibility_flag = flag_runid[0]  # '1' means source viewable
@@ -265,7 +265,7 @@ class YBTScraper(BaseScraper):
                     try:
                         submitted_at = datetime.strptime(submit_time_str, '%Y-%m-%d %H:%M') - timedelta(hours=8)
                     except ValueError:
-                        self.logger.debug(f"Could not parse submit time: {submit_time_str}")
+                        self.logger.debug("Could not parse submit time: %s", submit_time_str)
 
             return ScrapedSubmission(
                 platform_record_id=actual_runid,
@@ -277,7 +277,7 @@ class YBTScraper(BaseScraper):
             )
 
         except Exception as e:
-            self.logger.debug(f"Error parsing record '{record_str[:80]}': {e}")
+            self.logger.debug("Error parsing record '%s': %s", record_str[:80], e)
             return None
 
     def _parse_result(self, result_raw: str) -> tuple[str, int | None]:
@@ -467,7 +467,7 @@ class YBTScraper(BaseScraper):
                 code = html.unescape(code)
                 return code
 
-            self.logger.debug(f"No <pre> tag found for YBT record {record_id}")
+            self.logger.debug("No <pre> tag found for YBT record %s", record_id)
             return None
 
         except Exception as e:
@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import logging
 from datetime import datetime
+from itertools import islice
 from sqlalchemy import func
 
 from app.extensions import db
@@ -13,6 +14,17 @@ from app.services.tag_mapper import TagMapper
 
 logger = logging.getLogger(__name__)
 
+# Scraped submissions are checked against the database in batches of this
+# size; well under SQLite's bound-parameter limit.
+_SUBMISSION_BATCH_SIZE = 500
+
+
+def _batched(iterable, size: int):
+    """Yield lists of up to *size* items from *iterable*."""
+    it = iter(iterable)
+    while batch := list(islice(it, size)):
+        yield batch
+
 
 class SyncService:
     def sync_account(self, account_id: int) -> dict:
@@ -36,88 +48,93 @@ class SyncService:
         _skip_pids = set()  # problems to skip (e.g. CTOJ objective/MCQ)
 
         try:
-            for scraped_sub in scraper.fetch_submissions(
+            submissions = scraper.fetch_submissions(
                 platform_uid=account.platform_uid,
                 since=account.last_sync_at,
                 cursor=account.sync_cursor,
-            ):
-                if first_record_id is None:
-                    first_record_id = scraped_sub.platform_record_id
-                # Skip compile error submissions – no analytical value
-                if scraped_sub.status == SubmissionStatus.CE.value:
-                    continue
-
-                # Skip problems known to be non-programming (e.g. MCQ)
-                pid_key = (account.platform, scraped_sub.problem_id)
-                if pid_key in _skip_pids:
-                    continue
-
-                try:
-                    # Check if submission already exists
-                    existing = Submission.query.filter_by(
-                        platform_account_id=account.id,
-                        platform_record_id=scraped_sub.platform_record_id,
-                    ).first()
-                    if existing:
+            )
+            for batch in _batched(submissions, _SUBMISSION_BATCH_SIZE):
+                # One existence query per batch instead of one per record
+                known_ids = self._existing_record_ids(account.id, batch)
+                for scraped_sub in batch:
+                    if first_record_id is None:
+                        first_record_id = scraped_sub.platform_record_id
+                    # Skip compile error submissions – no analytical value
+                    if scraped_sub.status == SubmissionStatus.CE.value:
                         continue
 
-                    # Track new problems
-                    problem_key = f"{account.platform}:{scraped_sub.problem_id}"
-                    if problem_key not in seen_new_problems:
-                        existing_problem = Problem.query.filter_by(
-                            platform=account.platform,
-                            problem_id=scraped_sub.problem_id,
-                        ).first()
-                        if not existing_problem:
-                            seen_new_problems.add(problem_key)
-                            stats['new_problems'] += 1
-
-                    # Ensure problem exists in DB
-                    problem = self._ensure_problem(
-                        account.platform, scraped_sub.problem_id, scraper
-                    )
-
-                    # fetch_problem returned None (e.g. CTOJ objective problem)
-                    if problem is None and pid_key not in _skip_pids:
-                        _skip_pids.add(pid_key)
+                    # Skip problems known to be non-programming (e.g. MCQ)
+                    pid_key = (account.platform, scraped_sub.problem_id)
+                    if pid_key in _skip_pids:
                         continue
 
-                    # Create submission
-                    submission = Submission(
-                        platform_account_id=account.id,
-                        problem_id_ref=problem.id if problem else None,
-                        platform_record_id=scraped_sub.platform_record_id,
-                        status=scraped_sub.status,
-                        score=scraped_sub.score,
-                        language=scraped_sub.language,
-                        time_ms=scraped_sub.time_ms,
-                        memory_kb=scraped_sub.memory_kb,
-                        source_code=scraped_sub.source_code,
-                        submitted_at=scraped_sub.submitted_at,
-                    )
-                    db.session.add(submission)
-                    stats['new_submissions'] += 1
-
-                    # Try to fetch source code if not included and scraper supports it
-                    if not scraped_sub.source_code and scraper.SUPPORT_CODE_FETCH:
-                        try:
-                            code = scraper.fetch_submission_code(
-                                scraped_sub.platform_record_id
-                            )
-                            if code:
-                                submission.source_code = code
-                        except Exception as e:
-                            logger.debug(
-                                f"Failed to fetch code for "
-                                f"{scraped_sub.platform_record_id}: {e}"
+                    try:
+                        # Skip submissions already stored (or seen this sync)
+                        if scraped_sub.platform_record_id in known_ids:
+                            continue
+
+                        # The problem lookups must not autoflush the pending
+                        # submissions: every flush runs the period-stat and
+                        # solved-set hooks, which should run once per batch.
+                        with db.session.no_autoflush:
+                            # Track new problems
+                            problem_key = f"{account.platform}:{scraped_sub.problem_id}"
+                            if problem_key not in seen_new_problems:
+                                existing_problem = Problem.query.filter_by(
+                                    platform=account.platform,
+                                    problem_id=scraped_sub.problem_id,
+                                ).first()
+                                if not existing_problem:
+                                    seen_new_problems.add(problem_key)
+                                    stats['new_problems'] += 1
+
+                            # Ensure problem exists in DB
+                            problem = self._ensure_problem(
+                                account.platform, scraped_sub.problem_id, scraper
                             )
 
-                except Exception as e:
-                    logger.error(
-                        f"Error processing submission "
-                        f"{scraped_sub.platform_record_id}: {e}"
-                    )
-                    stats['errors'] += 1
+                        # fetch_problem returned None (e.g. CTOJ objective problem)
+                        if problem is None and pid_key not in _skip_pids:
+                            _skip_pids.add(pid_key)
+                            continue
+
+                        # Create submission
+                        submission = Submission(
+                            platform_account_id=account.id,
+                            problem_id_ref=problem.id if problem else None,
+                            platform_record_id=scraped_sub.platform_record_id,
+                            status=scraped_sub.status,
+                            score=scraped_sub.score,
+                            language=scraped_sub.language,
+                            time_ms=scraped_sub.time_ms,
+                            memory_kb=scraped_sub.memory_kb,
+                            source_code=scraped_sub.source_code,
+                            submitted_at=scraped_sub.submitted_at,
+                        )
+                        db.session.add(submission)
+                        known_ids.add(scraped_sub.platform_record_id)
+                        stats['new_submissions'] += 1
+
+                        # Try to fetch source code if not included and scraper supports it
+                        if not scraped_sub.source_code and scraper.SUPPORT_CODE_FETCH:
+                            try:
+                                code = scraper.fetch_submission_code(
+                                    scraped_sub.platform_record_id
+                                )
+                                if code:
+                                    submission.source_code = code
+                            except Exception as e:
+                                logger.debug(
+                                    "Failed to fetch code for %s: %s",
+                                    scraped_sub.platform_record_id, e,
+                                )
+
+                    except Exception as e:
+                        logger.error(
+                            f"Error processing submission "
+                            f"{scraped_sub.platform_record_id}: {e}"
+                        )
+                        stats['errors'] += 1
 
             # Update sync cursor and clear any previous error
             if first_record_id:
@@ -164,6 +181,16 @@ class SyncService:
 
         return stats
 
+    @staticmethod
+    def _existing_record_ids(account_id: int, batch: list) -> set[str]:
+        """Return the platform_record_ids in *batch* already stored for the account."""
+        record_ids = {s.platform_record_id for s in batch}
+        rows = db.session.query(Submission.platform_record_id).filter(
+            Submission.platform_account_id == account_id,
+            Submission.platform_record_id.in_(record_ids),
+        )
+        return {record_id for (record_id,) in rows}
+
     def _ensure_problem(
         self, platform: str, problem_id: str, scraper
     ) -> Problem | None:
@@ -188,8 +215,10 @@ class SyncService:
                         # Update URL if we got a more specific one
                         if scraped.url and scraped.url != problem.url:
                             problem.url = scraped.url
+                        if needs_uuid and scraped.platform_uuid:
+                            problem.platform_uuid = scraped.platform_uuid
                 except Exception as e:
-                    logger.debug(f"Backfill failed for {platform}:{problem_id}: {e}")
+                    logger.debug("Backfill failed for %s:%s: %s", platform, problem_id, e)
             return problem
 
         try:
@@ -117,42 +117,16 @@ def init_scheduler(app):
     def weekly_report_job():
         with app.app_context():
             from app.analysis.report_generator import ReportGenerator
-            from app.models import Student
-
-            students = Student.query.all()
-            for student in students:
-                try:
-                    generator = ReportGenerator(student.id, app)
-                    report = generator.generate_weekly_report()
-                    if report:
-                        logger.info(
-                            f"Generated weekly report for {student.name}"
-                        )
-                except Exception as e:
-                    logger.error(
-                        f"Weekly report failed for {student.name}: {e}"
-                    )
+
+            ReportGenerator.batch_generate(None, "weekly", app)
 
     # Monthly report - 1st of month at 9am
     @scheduler.scheduled_job('cron', day=1, hour=9, id='monthly_report')
     def monthly_report_job():
         with app.app_context():
             from app.analysis.report_generator import ReportGenerator
-            from app.models import Student
-
-            students = Student.query.all()
-            for student in students:
-                try:
-                    generator = ReportGenerator(student.id, app)
-                    report = generator.generate_monthly_report()
-                    if report:
-                        logger.info(
-                            f"Generated monthly report for {student.name}"
-                        )
-                except Exception as e:
-                    logger.error(
-                        f"Monthly report failed for {student.name}: {e}"
-                    )
+
+            ReportGenerator.batch_generate(None, "monthly", app)
 
     try:
         scheduler.start()
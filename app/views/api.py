@@ -712,6 +712,8 @@ def problem_resync(problem_id):
         problem.url = scraped.url or scraper.get_problem_url(problem.problem_id)
         problem.source = scraped.source
         problem.difficulty_raw = scraped.difficulty_raw
+        if scraped.platform_uuid:
+            problem.platform_uuid = scraped.platform_uuid
         if scraped.tags:
             problem.platform_tags = json.dumps(scraped.tags, ensure_ascii=False)
             mapper = TagMapper(problem.platform)
@@ -35,7 +35,7 @@ def list_reports():
         current_student = None
 
     if current_student:
-        query = Report.query.filter_by(student_id=current_student.id)
+        query = Report.list_query(current_student.id)
         if report_type:
             query = query.filter_by(report_type=report_type)
         reports = query.order_by(Report.created_at.desc()).all()
@@ -46,9 +46,10 @@ def list_reports():
     existing_reports_map = {}
     all_student_ids = [s.id for s in students]
     if all_student_ids:
-        all_reports = Report.query.filter(
-            Report.student_id.in_(all_student_ids)
-        ).all()
+        all_reports = Report.query.with_entities(
+            Report.student_id, Report.report_type,
+            Report.period_start, Report.period_end,
+        ).filter(Report.student_id.in_(all_student_ids)).all()
         for r in all_reports:
             sid = str(r.student_id)
             rt = r.report_type
@@ -667,7 +667,7 @@ def check_new():
                         'check_method': 'api_check',
                     })
             except Exception as e:
-                logger.debug(f'check-new: error checking {account.platform}:{account.platform_uid}: {e}')
+                logger.debug('check-new: error checking %s:%s: %s', account.platform, account.platform_uid, e)
 
         # ── Write cache, clear lock ──
         UserSetting.set(user_id, 'check_new_result', json.dumps(accounts_with_new))
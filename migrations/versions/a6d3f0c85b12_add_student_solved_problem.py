@@ -0,0 +1,67 @@
+"""Add student_solved_problem table and max_solved_difficulty to student
+
+Revision ID: a6d3f0c85b12
+Revises: f2c9a7d31e58
+Create Date: 2026-10-17 11:47:05.630194
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6d3f0c85b12'
+down_revision = 'f2c9a7d31e58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    from sqlalchemy import inspect
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    # Create table if not already present (db.create_all may have run)
+    if 'student_solved_problem' not in inspector.get_table_names():
+        op.create_table('student_solved_problem',
+            sa.Column('student_id', sa.Integer(), nullable=False),
+            sa.Column('problem_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['problem_id'], ['problem.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['student_id'], ['student.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('student_id', 'problem_id')
+        )
+        with op.batch_alter_table('student_solved_problem', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_student_solved_problem_problem_id'), ['problem_id'], unique=False)
+
+    student_cols = [c['name'] for c in inspector.get_columns('student')]
+    if 'max_solved_difficulty' not in student_cols:
+        with op.batch_alter_table('student', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('max_solved_difficulty', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill solved set and max difficulty from AC submissions. The table
+    # is rebuilt rather than merged so the SQL is portable across engines.
+    op.execute("DELETE FROM student_solved_problem")
+    op.execute(
+        "INSERT INTO student_solved_problem (student_id, problem_id)"
+        " SELECT DISTINCT pa.student_id, s.problem_id_ref"
+        " FROM submission s"
+        " JOIN platform_account pa ON pa.id = s.platform_account_id"
+        " WHERE s.status = 'AC' AND s.problem_id_ref IS NOT NULL"
+    )
+    op.execute(
+        "UPDATE student SET max_solved_difficulty = COALESCE(("
+        "  SELECT MAX(p.difficulty) FROM student_solved_problem ssp"
+        "  JOIN problem p ON p.id = ssp.problem_id"
+        "  WHERE ssp.student_id = student.id"
+        "), 0)"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('student', schema=None) as batch_op:
+        batch_op.drop_column('max_solved_difficulty')
+
+    with op.batch_alter_table('student_solved_problem', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_student_solved_problem_problem_id'))
+
+    op.drop_table('student_solved_problem')
@@ -0,0 +1,33 @@
+"""Add sync_job (status, started_at) index
+
+Revision ID: c7e1d94b2a30
+Revises: a6d3f0c85b12
+Create Date: 2026-10-17 14:22:09.518304
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e1d94b2a30'
+down_revision = 'a6d3f0c85b12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    from sqlalchemy import inspect
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    # Skip the index if db.create_all already created it
+    indexes = {ix['name'] for ix in inspector.get_indexes('sync_job')}
+    if 'ix_syncjob_status_started' not in indexes:
+        with op.batch_alter_table('sync_job', schema=None) as batch_op:
+            batch_op.create_index('ix_syncjob_status_started', ['status', 'started_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('sync_job', schema=None) as batch_op:
+        batch_op.drop_index('ix_syncjob_status_started')
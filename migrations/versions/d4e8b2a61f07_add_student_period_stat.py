@@ -0,0 +1,91 @@
+"""Add student_period_stat table of precomputed weekly/monthly aggregates
+
+Revision ID: d4e8b2a61f07
+Revises: b1f2a3c4d5e6
+Create Date: 2026-10-17 10:12:31.402117
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4e8b2a61f07'
+down_revision = 'b1f2a3c4d5e6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    from sqlalchemy import inspect
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    # Create table if not already present (db.create_all may have run)
+    if 'student_period_stat' not in inspector.get_table_names():
+        op.create_table('student_period_stat',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('student_id', sa.Integer(), nullable=False),
+            sa.Column('period_type', sa.String(length=10), nullable=False),
+            sa.Column('period_key', sa.String(length=10), nullable=False),
+            sa.Column('submissions', sa.Integer(), nullable=False),
+            sa.Column('ac_count', sa.Integer(), nullable=False),
+            sa.Column('unique_problems', sa.Integer(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['student_id'], ['student.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('student_id', 'period_type', 'period_key', name='uq_student_period_stat')
+        )
+        with op.batch_alter_table('student_period_stat', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_student_period_stat_student_id'), ['student_id'], unique=False)
+
+    # Backfill aggregates from existing submissions. Periods are keyed in
+    # Python rather than with a SQL date function, so this runs on any engine.
+    periods = {}
+    rows = bind.execute(sa.text(
+        "SELECT pa.student_id, s.submitted_at, s.status, s.problem_id_ref"
+        " FROM submission s"
+        " JOIN platform_account pa ON pa.id = s.platform_account_id"
+        " WHERE s.submitted_at IS NOT NULL"
+    ))
+    for student_id, submitted_at, status, problem_id in rows:
+        if isinstance(submitted_at, str):
+            submitted_at = datetime.fromisoformat(submitted_at)
+        for period_type, fmt in (('week', '%Y-W%W'), ('month', '%Y-%m')):
+            stat = periods.setdefault(
+                (student_id, period_type, submitted_at.strftime(fmt)),
+                [0, 0, set()],
+            )
+            stat[0] += 1
+            stat[1] += status == 'AC'
+            if problem_id is not None:
+                stat[2].add(problem_id)
+
+    stat_table = sa.table(
+        'student_period_stat',
+        sa.column('student_id'), sa.column('period_type'),
+        sa.column('period_key'), sa.column('submissions'),
+        sa.column('ac_count'), sa.column('unique_problems'),
+        sa.column('updated_at'),
+    )
+    op.execute("DELETE FROM student_period_stat")
+    if not periods:
+        return
+    now = datetime.utcnow()
+    op.bulk_insert(stat_table, [
+        {
+            'student_id': student_id, 'period_type': period_type,
+            'period_key': key, 'submissions': total, 'ac_count': ac,
+            'unique_problems': len(problems), 'updated_at': now,
+        }
+        for (student_id, period_type, key), (total, ac, problems)
+        in periods.items()
+    ])
+
+def downgrade():
+    with op.batch_alter_table('student_period_stat', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_student_period_stat_student_id'))
+
+    op.drop_table('student_period_stat')
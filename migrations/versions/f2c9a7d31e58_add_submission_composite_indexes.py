@@ -0,0 +1,44 @@
+"""Add composite submission indexes and problem difficulty index
+
+Revision ID: f2c9a7d31e58
+Revises: d4e8b2a61f07
+Create Date: 2026-10-17 11:03:48.215930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c9a7d31e58'
+down_revision = 'd4e8b2a61f07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    from sqlalchemy import inspect
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    # Skip indexes that db.create_all may already have created
+    sub_indexes = {ix['name'] for ix in inspector.get_indexes('submission')}
+    with op.batch_alter_table('submission', schema=None) as batch_op:
+        if 'ix_sub_acct_time' not in sub_indexes:
+            batch_op.create_index('ix_sub_acct_time', ['platform_account_id', 'submitted_at'], unique=False)
+        if 'ix_sub_acct_status' not in sub_indexes:
+            batch_op.create_index('ix_sub_acct_status', ['platform_account_id', 'status'], unique=False)
+
+    problem_indexes = {ix['name'] for ix in inspector.get_indexes('problem')}
+    if 'ix_problem_difficulty' not in problem_indexes:
+        with op.batch_alter_table('problem', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_problem_difficulty'), ['difficulty'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('problem', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_problem_difficulty'))
+
+    with op.batch_alter_table('submission', schema=None) as batch_op:
+        batch_op.drop_index('ix_sub_acct_status')
+        batch_op.drop_index('ix_sub_acct_time')
@@ -62,14 +62,17 @@ def cleanup(dry_run: bool = True):
     total_ar = 0
 
     for p in problems:
-        # Delete submissions referencing this problem
-        subs_deleted = Submission.query.filter_by(problem_id_ref=p.id).delete()
-        total_subs += subs_deleted
-
         # AnalysisResults: delete before Problem to avoid cascade conflicts
         ar_deleted = AnalysisResult.query.filter_by(problem_id_ref=p.id).delete()
         total_ar += ar_deleted
 
+        # Delete submissions referencing this problem through the ORM, so the
+        # flush hooks update the solved sets and period stats they fed
+        subs = Submission.query.filter_by(problem_id_ref=p.id).all()
+        for sub in subs:
+            db.session.delete(sub)
+        total_subs += len(subs)
+
         # Clear problem_tags association
         db.session.execute(
             problem_tags.delete().where(problem_tags.c.problem_id == p.id)
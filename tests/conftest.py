@@ -6,6 +6,8 @@ from datetime import date, datetime, timedelta
 import pytest
 
 from app import create_app
+from app.analysis.recommender import invalidate_recommendations
+from app.analysis.weakness import invalidate_weaknesses
 from app.extensions import db as _db
 from app.models import (
     User,
@@ -32,6 +34,9 @@ def app():
 @pytest.fixture()
 def db(app):
     """Provide a clean database for each test."""
+    # Process-level analysis caches must not outlive the database they read
+    invalidate_weaknesses()
+    invalidate_recommendations()
     with app.app_context():
         _db.create_all()
         yield _db
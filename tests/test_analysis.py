@@ -2,6 +2,7 @@
 
 import pytest
 from datetime import datetime, timedelta
+from unittest.mock import patch
 
 from app.extensions import db
 from app.models import (
@@ -10,6 +11,7 @@ from app.models import (
 from app.analysis.engine import AnalysisEngine, STAGE_WEIGHTS
 from app.analysis.weakness import WeaknessDetector, STAGE_EXPECTATIONS, GRADE_STAGE_MAP
 from app.analysis.trend import TrendAnalyzer
+from app.analysis.recommender import ProblemRecommender, invalidate_recommendations
 
 
 class TestAnalysisEngine:
@@ -204,6 +206,47 @@ class TestWeaknessDetector:
         for w in critical:
             assert w['severity'] == 'critical'
 
+    def test_detect_cached_until_submissions_change(self, app, db, sample_data):
+        from app.analysis.engine import AnalysisEngine
+        first = WeaknessDetector(sample_data['student_id']).detect()
+        with patch.object(WeaknessDetector, '_build_buckets',
+                          side_effect=AssertionError('cache miss')), \
+                patch.object(AnalysisEngine, 'get_tag_scores',
+                             side_effect=AssertionError('tags scored')):
+            assert WeaknessDetector(sample_data['student_id']).detect() == first
+
+        db.session.add(Submission(
+            platform_account_id=sample_data['account_id'],
+            platform_record_id='R_weak_cache', status='WA',
+            problem_id_ref=sample_data['problem_ids'][0],
+            submitted_at=datetime.utcnow() - timedelta(days=2),
+        ))
+        db.session.commit()
+        with patch.object(WeaknessDetector, '_build_buckets', autospec=True,
+                          side_effect=WeaknessDetector._build_buckets) as build:
+            WeaknessDetector(sample_data['student_id']).detect()
+        build.assert_called_once()
+
+    def test_detect_cache_cleared_by_problem_write(self, app, db, sample_data):
+        WeaknessDetector(sample_data['student_id']).detect()
+        problem = db.session.get(Problem, sample_data['problem_ids'][0])
+        problem.difficulty = 6
+        db.session.commit()
+        with patch.object(WeaknessDetector, '_build_buckets', autospec=True,
+                          side_effect=WeaknessDetector._build_buckets) as build:
+            WeaknessDetector(sample_data['student_id']).detect()
+        build.assert_called_once()
+
+    def test_fingerprint_cache_is_bounded(self):
+        from app.analysis._cache import FingerprintCache
+        cache = FingerprintCache(maxsize=2, ttl=60)
+        for student_id in (1, 2, 3):
+            cache.set((student_id, 0), 'fp', student_id)
+        assert len(cache) == 2
+        assert cache.get((1, 0), 'fp') is None
+        assert cache.get((3, 0), 'fp') == 3
+        assert cache.get((3, 0), 'other') is None
+
     def test_stage_expectations_valid(self):
         for stage in range(1, 7):
             assert stage in STAGE_EXPECTATIONS
@@ -235,6 +278,15 @@ class TestTrendAnalyzer:
             assert 'submissions' in item
             assert 'ac_count' in item
 
+    def test_weekly_trend_bucket_counts(self, app, db, sample_data):
+        trend = TrendAnalyzer(sample_data['student_id']).get_weekly_trend(12)
+        assert sum(item['submissions'] for item in trend) == 3
+        assert sum(item['ac_count'] for item in trend) == 2
+        assert all(item['week'][4:6] == '-W' for item in trend)
+        assert [item['week'] for item in trend] == sorted(
+            item['week'] for item in trend
+        )
+
     def test_weekly_trend_no_accounts(self, app, db):
         user = User(username='trend_user', email='trend@test.com')
         user.set_password('pw')
@@ -258,3 +310,230 @@ class TestTrendAnalyzer:
 
         analyzer = TrendAnalyzer(student.id)
         assert analyzer.get_monthly_trend() == []
+
+
+
+class TestProblemRecommender:
+    @pytest.fixture(autouse=True)
+    def _clear_cache(self):
+        invalidate_recommendations()
+        yield
+        invalidate_recommendations()
+
+    def test_recommends_unexplored_tag_and_skips_solved(self, app, db, sample_data):
+        tag = Tag(name='bfs', display_name='广度优先搜索', category='search', stage=1)
+        problem = Problem(platform='luogu', problem_id='P1003', title='BFS', difficulty=2)
+        problem.tags.append(tag)
+        db.session.add_all([tag, problem])
+        db.session.commit()
+
+        recs = ProblemRecommender(sample_data['student_id']).recommend()
+
+        rec_ids = [r['problem'].id for r in recs]
+        assert problem.id in rec_ids
+        assert not set(rec_ids) & set(sample_data['problem_ids'])
+        bfs_rec = next(r for r in recs if r['problem'].id == problem.id)
+        assert bfs_rec['priority'] == 3
+        assert bfs_rec['tag'] == '广度优先搜索'
+
+    def test_no_accounts_returns_list(self, app, db):
+        user = User(username='rec_user', email='rec@test.com')
+        user.set_password('pw')
+        db.session.add(user)
+        db.session.flush()
+        student = Student(parent_id=user.id, name='rec_kid')
+        db.session.add(student)
+        db.session.commit()
+
+        assert isinstance(ProblemRecommender(student.id).recommend(), list)
+
+    def test_cached_until_new_submission(self, app, db, sample_data):
+        tag = Tag(name='bfs', display_name='广度优先搜索', category='search', stage=1)
+        problem = Problem(platform='luogu', problem_id='P1003', title='BFS', difficulty=2)
+        problem.tags.append(tag)
+        db.session.add_all([tag, problem])
+        db.session.commit()
+
+        recommender = ProblemRecommender(sample_data['student_id'])
+        first = recommender.recommend()
+        with patch.object(recommender, '_compute') as compute:
+            assert recommender.recommend() == first
+            compute.assert_not_called()
+
+        db.session.add(Submission(
+            platform_account_id=sample_data['account_id'],
+            problem_id_ref=problem.id,
+            platform_record_id='rec_bfs',
+            status='AC',
+            submitted_at=datetime.utcnow(),
+        ))
+        db.session.commit()
+        rec_ids = [r['problem'].id for r in recommender.recommend()]
+        assert problem.id not in rec_ids
+
+    def test_grade_change_not_served_from_cache(self, app, db, sample_data):
+        tag = Tag(name='dp_tree', display_name='树形DP', category='dp', stage=5)
+        problem = Problem(platform='luogu', problem_id='P1352', title='没有上司的舞会',
+                          difficulty=2)
+        problem.tags.append(tag)
+        db.session.add_all([tag, problem])
+        db.session.commit()
+
+        before = ProblemRecommender(sample_data['student_id']).recommend()
+        assert problem.id not in [r['problem'].id for r in before]
+
+        db.session.get(Student, sample_data['student_id']).grade = '高三'
+        db.session.commit()
+        after = ProblemRecommender(sample_data['student_id']).recommend()
+        assert problem.id in [r['problem'].id for r in after]
+
+    def test_cache_cleared_by_problem_or_tag_write(self, app, db, sample_data):
+        recommender = ProblemRecommender(sample_data['student_id'])
+        first = recommender.recommend()
+        tag = Tag(name='bfs', display_name='广度优先搜索', category='search', stage=1)
+        problem = Problem(platform='luogu', problem_id='P1003', title='BFS', difficulty=2)
+        problem.tags.append(tag)
+        db.session.add_all([tag, problem])
+        db.session.commit()
+
+        rec_ids = [r['problem'].id for r in recommender.recommend()]
+        assert problem.id in rec_ids
+        assert len(rec_ids) > len(first)
+
+
+class TestPromptTokenEstimate:
+    def test_estimate_tokens_mixed_text(self):
+        from app.analysis.prompts._common import estimate_tokens
+        # 2 CJK chars + 1 word + 2 digit runs + 2 punctuation
+        assert estimate_tokens('你好 world 12345!,') == 7
+        assert estimate_tokens('') == 0
+        assert estimate_tokens(None) == 0
+
+    def test_estimate_prompt_tokens_multimodal(self):
+        from app.analysis.prompts._common import estimate_prompt_tokens
+        messages = [
+            {'role': 'system', 'content': '中文'},
+            {'role': 'user', 'content': [
+                {'type': 'text', 'text': 'hello'},
+                {'type': 'image', 'source': {'type': 'url', 'url': 'x'}},
+            ]},
+        ]
+        assert estimate_prompt_tokens(messages) == 3
+
+
+class TestProblemPromptSchemas:
+    def test_full_solution_wording_kept_per_prompt(self, app, db):
+        from app.analysis.prompts.problem_comprehensive import build_problem_comprehensive_prompt
+        from app.analysis.prompts.problem_full_solution import build_problem_full_solution_prompt
+        full = build_problem_full_solution_prompt('A+B', '求和')[-1]['content']
+        assert '"explanation": "代码逐段解释，说明每个关键部分的作用"' in full
+        assert '"brief": "简要说明为什么不选择这个方法"' in full
+        assert '"code": "完整的 C++ 代码（可以直接提交的）"' in full
+
+        comprehensive = build_problem_comprehensive_prompt(
+            'A+B', 'luogu', None, '求和')[-1]['content']
+        assert '"explanation": "关键说明"' in comprehensive
+        assert '"brief": "简要说明"}' in comprehensive
+        assert '"code": "完整的 C++ 代码",' in comprehensive
+
+
+class TestReportGenerator:
+    @patch('app.analysis.report_generator.get_provider')
+    def test_report_content_assembled_from_stream(self, mock_get_provider, app, db, sample_data):
+        from app.analysis.report_generator import ReportGenerator
+        provider = mock_get_provider.return_value
+        provider.chat_stream.return_value = iter(['## 周报', '\n本周表现良好'])
+
+        report = ReportGenerator(sample_data['student_id'], app).generate_weekly_report()
+
+        assert report.ai_content == '## 周报\n本周表现良好'
+        assert report.stats['submissions'] == 3
+        provider.chat.assert_not_called()
+
+    @patch('app.analysis.report_generator.get_provider')
+    def test_previous_report_radar_carried_over(self, mock_get_provider, app, db, sample_data):
+        from app.analysis.report_generator import ReportGenerator
+        mock_get_provider.return_value.chat_stream.side_effect = lambda *a, **kw: iter(['ok'])
+
+        generator = ReportGenerator(sample_data['student_id'], app)
+        first = generator.generate_weekly_report(end_date=datetime.utcnow() - timedelta(days=7))
+        second = generator.generate_weekly_report()
+
+        assert second.radar_data_prev == first.radar_data_curr
+        assert second.radar_data_prev is not None
+
+    @patch('app.analysis.report_generator.get_provider')
+    def test_batch_generate(self, mock_get_provider, app, db, sample_data):
+        from app.analysis.report_generator import ReportGenerator
+        mock_get_provider.return_value.chat_stream.side_effect = lambda *a, **kw: iter(['ok'])
+
+        reports = ReportGenerator.batch_generate(None, 'monthly', app)
+
+        assert [r.student_id for r in reports] == [sample_data['student_id']]
+        assert reports[0].report_type == 'monthly'
+        assert reports[0].ai_content == 'ok'
+
+    @patch('app.analysis.report_generator.get_provider')
+    def test_interrupted_stream_keeps_partial_content(self, mock_get_provider, app, db, sample_data):
+        from app.analysis.report_generator import ReportGenerator
+
+        def broken_stream(*args, **kwargs):
+            yield '## 周报'
+            raise ConnectionError('stream reset')
+        mock_get_provider.return_value.chat_stream.side_effect = broken_stream
+
+        report = ReportGenerator(sample_data['student_id'], app).generate_weekly_report()
+
+        assert report.ai_content.startswith('## 周报')
+        assert 'stream reset' in report.ai_content
+
+    @patch('app.analysis.report_generator.get_provider')
+    def test_caller_transaction_not_committed_before_ai_call(self, mock_get_provider, app, db, sample_data):
+        from app.analysis.report_generator import ReportGenerator
+        from app.models import Student
+
+        # A caller change that is flushed but not committed
+        student = db.session.get(Student, sample_data['student_id'])
+        student.notes = 'pending'
+        db.session.flush()
+
+        in_transaction = []
+
+        def stream(*args, **kwargs):
+            in_transaction.append(db.session().in_transaction())
+            return iter(['ok'])
+        mock_get_provider.return_value.chat_stream.side_effect = stream
+
+        report = ReportGenerator(sample_data['student_id'], app).generate_weekly_report()
+        assert report.ai_content == 'ok'
+        # The caller's transaction was still open during the AI call
+        assert in_transaction == [True]
+
+    @patch('app.analysis.report_generator.get_provider')
+    def test_own_read_transaction_released_before_ai_call(self, mock_get_provider, app, db, sample_data):
+        from app.analysis.report_generator import ReportGenerator
+        db.session.commit()
+        in_transaction = []
+
+        def stream(*args, **kwargs):
+            in_transaction.append(db.session().in_transaction())
+            return iter(['ok'])
+        mock_get_provider.return_value.chat_stream.side_effect = stream
+
+        ReportGenerator(sample_data['student_id'], app).generate_weekly_report()
+        assert in_transaction == [False]
+
+    def test_base_chat_stream_falls_back_to_chat(self):
+        from app.analysis.llm.base import BaseLLMProvider, LLMResponse
+
+        class _Provider(BaseLLMProvider):
+            def chat(self, messages, model=None, max_tokens=4096, temperature=0):
+                return LLMResponse(content='full text', model='m', provider='p')
+
+            def list_models(self):
+                return []
+
+            def estimate_cost(self, input_tokens, output_tokens, model):
+                return 0.0
+
+        assert list(_Provider().chat_stream([])) == ['full text']
@@ -17,6 +17,9 @@ from app.models import (
     AnalysisResult,
     AnalysisLog,
     Report,
+    StudentPeriodStat,
+    StudentSolvedProblem,
+    SyncJob,
 )
 
 
@@ -73,8 +76,8 @@ class TestUser:
         db.session.add(s)
         db.session.commit()
 
-        assert user.students.count() == 1
-        assert user.students.first().name == 'child'
+        assert len(user.students) == 1
+        assert user.students[0].name == 'child'
 
 
 # ──────────────────────────────────────────────
@@ -377,3 +380,238 @@ class TestReport:
         assert fetched.report_type == 'weekly'
         assert fetched.ai_content == 'AI generated report content'
         assert fetched.student.name == '小明'
+
+    def test_stats_decoded_once_per_value(self, app, db, sample_data):
+        report = Report(
+            student_id=sample_data['student_id'],
+            report_type='weekly',
+            period_start=datetime.utcnow() - timedelta(days=7),
+            period_end=datetime.utcnow(),
+            stats_json='{"total": 10}',
+        )
+        assert report.stats is report.stats
+        assert report.stats == {'total': 10}
+
+        report.stats_json = '{"total": 11}'
+        assert report.stats == {'total': 11}
+        report.radar_data_curr = 'not json'
+        assert report.curr_scores == {}
+
+
+# ──────────────────────────────────────────────
+# SyncJob model
+# ──────────────────────────────────────────────
+
+class TestSyncJob:
+    def test_cleanup_stale_running(self, app, db, sample_data):
+        now = datetime.utcnow()
+        stale = SyncJob(user_id=sample_data['user_id'], job_type='content_sync',
+                        status='running', started_at=now - timedelta(hours=3))
+        fresh = SyncJob(user_id=sample_data['user_id'], job_type='content_sync',
+                        status='running', started_at=now - timedelta(minutes=5))
+        db.session.add_all([stale, fresh])
+        db.session.commit()
+
+        assert SyncJob.cleanup_stale_running() == 1
+        assert db.session.get(SyncJob, stale.id).status == 'failed'
+        assert db.session.get(SyncJob, stale.id).finished_at is not None
+        assert db.session.get(SyncJob, fresh.id).status == 'running'
+        assert SyncJob.cleanup_stale_running() == 0
+
+
+# ──────────────────────────────────────────────
+# StudentPeriodStat model
+# ──────────────────────────────────────────────
+
+class TestStudentPeriodStat:
+    def _stats(self, student_id, period_type):
+        return {
+            s.period_key: s
+            for s in StudentPeriodStat.query.filter_by(
+                student_id=student_id, period_type=period_type
+            )
+        }
+
+    def test_maintained_on_insert(self, app, db, sample_data):
+        subs = Submission.query.all()
+        months = self._stats(sample_data['student_id'], 'month')
+        assert sum(s.submissions for s in months.values()) == 3
+        assert sum(s.ac_count for s in months.values()) == 2
+
+        at = datetime(2024, 3, 5, 12, 0)
+        db.session.add_all([
+            Submission(
+                platform_account_id=sample_data['account_id'],
+                problem_id_ref=subs[0].problem_id_ref,
+                platform_record_id=f'old{i}',
+                status=status,
+                submitted_at=at + timedelta(hours=i),
+            )
+            for i, status in enumerate(['WA', 'AC'])
+        ])
+        db.session.commit()
+
+        march = self._stats(sample_data['student_id'], 'month')['2024-03']
+        assert (march.submissions, march.ac_count, march.unique_problems) == (2, 1, 1)
+        assert march.pass_rate == 50.0
+        week = self._stats(sample_data['student_id'], 'week')[at.strftime('%Y-W%W')]
+        assert week.submissions == 2
+
+    def test_removed_when_submissions_deleted(self, app, db, sample_data):
+        account = db.session.get(PlatformAccount, sample_data['account_id'])
+        db.session.delete(account)
+        db.session.commit()
+
+        assert StudentPeriodStat.query.filter_by(
+            student_id=sample_data['student_id']
+        ).count() == 0
+
+    def test_removed_with_student(self, app, db, sample_data):
+        student_id = sample_data['student_id']
+        db.session.delete(db.session.get(Student, student_id))
+        db.session.commit()
+
+        assert StudentPeriodStat.query.filter_by(student_id=student_id).count() == 0
+
+    def test_bulk_writes_need_rebuild(self, app, db, sample_data):
+        from sqlalchemy import delete, update
+        from app.models.student_period_stat import rebuild_period_stats
+
+        student_id = sample_data['student_id']
+
+        def snapshot():
+            return {
+                (s.period_type, s.period_key): (s.submissions, s.ac_count, s.unique_problems)
+                for s in StudentPeriodStat.query.filter_by(student_id=student_id)
+            }
+
+        # The rebuild reproduces the rows the flush hook maintains
+        expected = snapshot()
+        db.session.execute(delete(StudentPeriodStat))
+        rebuild_period_stats(db.session.connection(), student_id)
+        db.session.commit()
+        assert snapshot() == expected
+
+        # A bulk UPDATE bypasses the flush hook and leaves the stats stale
+        at = datetime(2024, 3, 5, 12, 0)
+        db.session.execute(update(Submission).values(submitted_at=at))
+        db.session.commit()
+        assert snapshot() == expected
+
+        rebuild_period_stats(db.session.connection(), student_id)
+        db.session.commit()
+        assert snapshot() == {
+            ('week', at.strftime('%Y-W%W')): (3, 2, 2),
+            ('month', '2024-03'): (3, 2, 2),
+        }
+
+    def test_upsert_fallback_for_other_engines(self, app, db, sample_data, monkeypatch):
+        from app.models import _upsert
+        monkeypatch.setattr(_upsert, '_ON_CONFLICT_INSERTS', {})
+        account_id = sample_data['account_id']
+        problem_id = sample_data['problem_ids'][0]
+        at = datetime(2024, 3, 5, 12, 0)
+        for i, status in enumerate(['WA', 'AC']):
+            db.session.add(Submission(
+                platform_account_id=account_id, problem_id_ref=problem_id,
+                platform_record_id=f'fb{i}', status=status, submitted_at=at,
+            ))
+            db.session.commit()
+
+        march = self._stats(sample_data['student_id'], 'month')['2024-03']
+        assert (march.submissions, march.ac_count) == (2, 1)
+
+    @pytest.mark.parametrize('dialect_name, clause', [
+        ('postgresql', 'ON CONFLICT (student_id, period_type, period_key) DO UPDATE'),
+        ('mysql', 'ON DUPLICATE KEY UPDATE'),
+    ])
+    def test_upsert_compiles_for_server_engines(self, dialect_name, clause):
+        from sqlalchemy.dialects import mysql, postgresql
+        from app.models._upsert import upsert
+
+        dialect = {'postgresql': postgresql, 'mysql': mysql}[dialect_name].dialect()
+        executed = []
+
+        class FakeConnection:
+            def __init__(self):
+                self.dialect = dialect
+
+            def execute(self, stmt):
+                executed.append(str(stmt.compile(dialect=dialect)))
+
+        upsert(
+            FakeConnection(), StudentPeriodStat.__table__,
+            {'student_id': 1, 'period_type': 'month', 'period_key': '2024-03'},
+            {'submissions': 2},
+        )
+        assert clause in executed[0]
+
+
+# ──────────────────────────────────────────────
+# StudentSolvedProblem model
+# ──────────────────────────────────────────────
+
+class TestStudentSolvedProblem:
+    def _solved(self, student_id):
+        return {
+            s.problem_id
+            for s in StudentSolvedProblem.query.filter_by(student_id=student_id)
+        }
+
+    def test_maintained_from_ac_submissions(self, app, db, sample_data):
+        student_id = sample_data['student_id']
+        assert self._solved(student_id) == set(sample_data['problem_ids'])
+        assert db.session.get(Student, student_id).max_solved_difficulty == 3
+
+        # Removing the only AC of P1002 drops it from the solved set
+        db.session.delete(db.session.get(Submission, sample_data['submission_ids'][2]))
+        db.session.commit()
+        assert self._solved(student_id) == {sample_data['problem_ids'][0]}
+        assert db.session.get(Student, student_id).max_solved_difficulty == 1
+
+    def test_problem_rerating_updates_max_difficulty(self, app, db, sample_data):
+        problem = db.session.get(Problem, sample_data['problem_ids'][0])
+        problem.difficulty = 7
+        db.session.commit()
+
+        student = db.session.get(Student, sample_data['student_id'])
+        assert student.max_solved_difficulty == 7
+
+    def test_removed_with_student_or_problem(self, app, db, sample_data):
+        problem_id = sample_data['problem_ids'][0]
+        db.session.delete(db.session.get(Problem, problem_id))
+        db.session.commit()
+        assert StudentSolvedProblem.query.filter_by(problem_id=problem_id).count() == 0
+
+        student_id = sample_data['student_id']
+        db.session.delete(db.session.get(Student, student_id))
+        db.session.commit()
+        assert StudentSolvedProblem.query.filter_by(student_id=student_id).count() == 0
+
+    def test_difficulty_clamp_refreshes_max_solved(self, app, db, sample_data):
+        from app import _fix_difficulty_data
+
+        student_id = sample_data['student_id']
+        problem = db.session.get(Problem, sample_data['problem_ids'][0])
+        problem.difficulty = 9
+        db.session.commit()
+        assert db.session.get(Student, student_id).max_solved_difficulty == 9
+
+        _fix_difficulty_data(app)
+        assert db.session.get(Problem, problem.id).difficulty == 7
+        assert db.session.get(Student, student_id).max_solved_difficulty == 7
+
+    def test_bulk_writes_need_rebuild(self, app, db, sample_data):
+        from sqlalchemy import update
+        from app.models.student_solved_problem import rebuild_solved_problems
+
+        student_id = sample_data['student_id']
+        # A bulk UPDATE bypasses the flush hook and leaves the solved set stale
+        db.session.execute(update(Submission).values(status='WA'))
+        db.session.commit()
+        assert self._solved(student_id) == set(sample_data['problem_ids'])
+
+        rebuild_solved_problems(db.session.connection(), student_id)
+        db.session.commit()
+        assert self._solved(student_id) == set()
+        assert db.session.get(Student, student_id).max_solved_difficulty == 0
@@ -267,3 +267,15 @@ class TestProblemClassifier:
         p = Problem.query.get(problem.id)
         greedy_count = sum(1 for t in p.tags if t.name == 'greedy_basic')
         assert greedy_count == 1
+
+    def test_tag_reference_cache_invalidated_on_tag_write(self, app, db):
+        """Adding a Tag should drop the cached tag reference text."""
+        from app.analysis.prompts.problem_classify import get_tag_reference
+
+        self._seed_tags()
+        assert 'dp_linear' in get_tag_reference()
+
+        db.session.add(Tag(name='bfs', display_name='广度优先搜索 BFS',
+                           category='search', stage=3))
+        db.session.commit()
+        assert 'bfs' in get_tag_reference()
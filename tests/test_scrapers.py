@@ -1,10 +1,13 @@
 """Tests for scraper registry, data classes, and enums."""
 
+import json
 import pytest
 from datetime import datetime
 
 from app.scrapers import get_all_scrapers, get_scraper_class, get_scraper_instance
-from app.scrapers.common import ScrapedSubmission, ScrapedProblem, SubmissionStatus
+from app.scrapers.common import (
+    ScrapedSubmission, ScrapedProblem, SubmissionStatus, parse_utc_timestamp,
+)
 
 
 class TestScraperRegistry:
@@ -140,6 +143,26 @@ class TestSubmissionStatus:
         assert len(SubmissionStatus) == 10
 
 
+class TestParseUtcTimestamp:
+    @pytest.mark.parametrize('value', [
+        '2024-01-15T10:20:30Z',
+        '2024-01-15T10:20:30.123Z',
+        '2024-01-15T10:20:30.12Z',
+        '2024-01-15T18:20:30.1234567+08:00',
+        '2024-01-15 10:20:30',
+        '2024-01-15T18:20:30+08:00',
+        1705314030000,
+    ])
+    def test_formats(self, value):
+        assert parse_utc_timestamp(value) == datetime(2024, 1, 15, 10, 20, 30)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            parse_utc_timestamp('yesterday')
+        with pytest.raises(TypeError):
+            parse_utc_timestamp(None)
+
+
 class TestCTOJScraper:
     """Tests for CTOJ (Hydro) scraper logic."""
 
@@ -232,3 +255,400 @@ class TestCTOJScraper:
         assert out is None
         assert examples is None
         assert hint is None
+
+
+class TestBBCOJScraper:
+    """Tests for BBC OJ (HOJ) submission paging."""
+
+    @pytest.fixture
+    def scraper(self, monkeypatch):
+        from app.scrapers.bbcoj import BBCOJScraper
+        scraper = BBCOJScraper(auth_password='pw')
+        monkeypatch.setattr(scraper.rate_limiter, 'min_interval', 0)
+        scraper._ensure_logged_in = lambda uid: True
+        return scraper
+
+    @staticmethod
+    def _fake_pages(total, requested):
+        """Return a _rate_limited_get stand-in serving *total* records."""
+        from unittest.mock import MagicMock
+
+        def fake_get(url, params):
+            page = params['currentPage']
+            limit = params['limit']
+            requested.append(page)
+            first = total - (page - 1) * limit
+            records = [
+                {'submitId': n, 'displayPid': 'P1', 'status': 0,
+                 'submitTime': '2025-01-01T00:00:00Z'}
+                for n in range(first, max(first - limit, 0), -1)
+            ]
+            resp = MagicMock(status_code=200)
+            resp.content = json.dumps({
+                'status': 200, 'data': {'records': records, 'total': total},
+            }).encode('utf-8')
+            return resp
+        return fake_get
+
+    def test_full_sync_yields_all_pages_in_order(self, scraper):
+        requested = []
+        scraper._rate_limited_get = self._fake_pages(65, requested)
+        ids = [int(s.platform_record_id) for s in scraper.fetch_submissions('u')]
+        assert ids == list(range(65, 0, -1))
+        assert sorted(requested) == [1, 2, 3, 4]
+
+    def test_cursor_stops_without_fetching_later_pages(self, scraper):
+        requested = []
+        scraper._rate_limited_get = self._fake_pages(65, requested)
+        ids = [s.platform_record_id
+               for s in scraper.fetch_submissions('u', cursor='58')]
+        assert ids == [str(n) for n in range(65, 58, -1)]
+        # Incremental syncs page through small batches of 5
+        assert requested == [1, 2]
+
+    def test_page_errors_end_paging_quietly(self, scraper):
+        import requests
+
+        def failing_get(url, params):
+            raise requests.ConnectionError('down')
+        scraper._rate_limited_get = failing_get
+        assert list(scraper.fetch_submissions('u')) == []
+
+    def test_unexpected_errors_propagate(self, scraper):
+        requested = []
+        scraper._rate_limited_get = self._fake_pages(3, requested)
+        scraper._parse_submission = lambda record: record['missing']
+        with pytest.raises(KeyError):
+            list(scraper.fetch_submissions('u'))
+
+    def test_map_status_accepts_int_and_str_codes(self, scraper):
+        assert scraper.map_status(0) == 'AC'
+        assert scraper.map_status('-1') == 'WA'
+        assert scraper.map_status(8) == 'PA'
+        assert scraper.map_status(42) == 'UNKNOWN'
+        assert scraper.map_status('abc') == 'UNKNOWN'
+        assert scraper.map_status(None) == 'UNKNOWN'
+
+    def test_map_difficulty_labels_and_numbers(self, scraper):
+        assert scraper.map_difficulty('困难') == 3
+        assert scraper.map_difficulty('Easy') == 1
+        assert scraper.map_difficulty('5') == 5
+        assert scraper.map_difficulty(12) == 7
+        assert scraper.map_difficulty('n/a') == 0
+
+    def test_login_reused_across_instances(self, monkeypatch):
+        from unittest.mock import MagicMock
+        from app.scrapers import base
+        from app.scrapers.bbcoj import BBCOJScraper
+        monkeypatch.setattr(base, '_login_cache', {})
+
+        logins = []
+
+        def fake_post(self, url, method='GET', **kwargs):
+            logins.append(kwargs['json']['password'])
+            resp = MagicMock(status_code=200, headers={'Authorization': 'jwt'})
+            resp.content = b'{"status": 200, "data": {}}'
+            return resp
+        monkeypatch.setattr(BBCOJScraper, '_request_with_retry', fake_post)
+
+        assert BBCOJScraper(auth_password='pw')._ensure_logged_in('u')
+        second = BBCOJScraper(auth_password='pw')
+        assert second._ensure_logged_in('u')
+        assert second.session.headers['Authorization'] == 'jwt'
+        assert logins == ['pw']
+
+        # A different password never reuses the cached login
+        assert BBCOJScraper(auth_password='other')._ensure_logged_in('u')
+        assert logins == ['pw', 'other']
+
+        # validate_account always checks the credentials with a real login
+        assert BBCOJScraper(auth_password='pw').validate_account('u')
+        assert logins == ['pw', 'other', 'pw']
+
+    def test_rejected_cached_login_is_dropped_and_renewed(self, monkeypatch):
+        from unittest.mock import MagicMock
+        from app.scrapers import base
+        from app.scrapers.bbcoj import BBCOJScraper
+        monkeypatch.setattr(base, '_login_cache', {})
+
+        logins = []
+
+        def fake_request(self, url, method='GET', **kwargs):
+            resp = MagicMock(status_code=200)
+            if method == 'POST':
+                logins.append(kwargs['json']['password'])
+                resp.headers = {'Authorization': 'fresh'}
+                resp.content = b'{"status": 200, "data": {}}'
+            elif self.session.headers.get('Authorization') == 'fresh':
+                resp.content = json.dumps({'status': 200, 'data': {
+                    'records': [{'submitId': 1, 'displayPid': 'P1', 'status': 0,
+                                 'submitTime': '2025-01-01T00:00:00Z'}],
+                    'total': 1,
+                }}).encode('utf-8')
+            else:
+                resp.content = b'{"status": 401, "msg": "token expired"}'
+            return resp
+        monkeypatch.setattr(BBCOJScraper, '_request_with_retry', fake_request)
+
+        stale = BBCOJScraper(auth_password='pw')
+        stale.session.headers['Authorization'] = 'revoked'
+        stale._remember_login('u', {'Authorization': 'revoked'})
+
+        scraper = BBCOJScraper(auth_password='pw')
+        ids = [s.platform_record_id for s in scraper.fetch_submissions('u')]
+        assert ids == ['1']
+        assert logins == ['pw']
+        assert base._login_cache[scraper._login_cache_key('u')][0] == {
+            'Authorization': 'fresh'}
+
+    def test_rejected_login_that_cannot_renew_raises(self, monkeypatch):
+        from unittest.mock import MagicMock
+        from app.scrapers import base
+        from app.scrapers.bbcoj import BBCOJScraper
+        monkeypatch.setattr(base, '_login_cache', {})
+
+        def fake_request(self, url, method='GET', **kwargs):
+            resp = MagicMock(status_code=200, headers={})
+            resp.content = b'{"status": 401, "msg": "token expired"}'
+            return resp
+        monkeypatch.setattr(BBCOJScraper, '_request_with_retry', fake_request)
+
+        scraper = BBCOJScraper(auth_password='pw')
+        scraper._remember_login('u', {'Authorization': 'revoked'})
+        with pytest.raises(RuntimeError):
+            list(scraper.fetch_submissions('u'))
+        assert base._login_cache == {}
+
+
+class TestCoderlandsScraper:
+    """Tests for Coderlands UUID persistence."""
+
+    @pytest.fixture
+    def scraper(self, monkeypatch):
+        from app.scrapers import coderlands
+        # Start every test from empty process-wide UUID state
+        monkeypatch.setattr(coderlands, '_shared_uuid_cache', {})
+        monkeypatch.setattr(coderlands, '_persisted_uuid_nos', set())
+        return coderlands.CoderlandsScraper(auth_cookie='abc')
+
+    def test_persist_uuids_fills_only_missing(self, app, db, scraper):
+        from app.models import Problem
+        db.session.add_all([
+            Problem(platform='coderlands', problem_id='P1'),
+            Problem(platform='coderlands', problem_id='P2', platform_uuid='b' * 32),
+        ])
+        db.session.commit()
+
+        scraper._uuid_cache.update({'1': 'a' * 32, '2': 'c' * 32, '3': 'd' * 32})
+        scraper._persist_uuids_to_db()
+
+        uuids = dict(db.session.query(Problem.problem_id, Problem.platform_uuid))
+        assert uuids == {'P1': 'a' * 32, 'P2': 'b' * 32}
+        # Every checked number is marked, including P3 which has no row,
+        # and later scrapers share the marks
+        from app.scrapers.coderlands import CoderlandsScraper
+        assert CoderlandsScraper(auth_cookie='abc')._persisted_uuid_nos == {'1', '2', '3'}
+
+    def test_resolve_uuids_fetches_remaining(self, scraper, monkeypatch):
+        monkeypatch.setattr(scraper, '_load_uuids_from_db', lambda nos: None)
+        monkeypatch.setattr(scraper, '_persist_uuids_to_db', lambda: None)
+        monkeypatch.setattr(
+            scraper, '_fetch_problem_uuid',
+            lambda no: None if no == '9' else no.zfill(32),
+        )
+        scraper._uuid_cache['1'] = 'a' * 32
+
+        result = scraper._resolve_uuids({'1', '2', '3', '9'})
+
+        assert result == {'1': 'a' * 32, '2': '2'.zfill(32), '3': '3'.zfill(32)}
+        assert '9' not in scraper._uuid_cache
+
+    def test_parallel_submissions_keep_problem_order(self, scraper, monkeypatch):
+        from app.scrapers.coderlands import CoderlandsSessionExpired
+
+        def fake_fetch(problem_id, uuid, since):
+            if uuid == 'expired':
+                raise CoderlandsSessionExpired('expired')
+            yield ScrapedSubmission(
+                platform_record_id=f'{problem_id}/1', problem_id=problem_id,
+                status='AC', submitted_at=datetime(2024, 1, 1),
+            )
+        monkeypatch.setattr(scraper, '_fetch_problem_submissions', fake_fetch)
+
+        subs = scraper._iter_submissions_parallel(
+            {'3': 'u3', '1': 'u1', '2': 'u2'}, set(), None,
+        )
+        assert [s.problem_id for s in subs] == ['P3', 'P1', 'P2']
+
+        subs = scraper._iter_submissions_parallel(
+            {'1': 'u1', '2': 'expired'}, set(), None,
+        )
+        with pytest.raises(CoderlandsSessionExpired):
+            list(subs)
+
+    def test_account_id_looked_up_once(self, app, db, scraper, sample_data):
+        from unittest.mock import patch
+        from app.models import PlatformAccount
+        acct = PlatformAccount(
+            student_id=sample_data['student_id'], platform='coderlands',
+            platform_uid='cl_user',
+        )
+        db.session.add(acct)
+        db.session.commit()
+
+        assert scraper._get_account_id('cl_user') == acct.id
+        with patch.object(db.session, 'query') as query:
+            assert scraper._get_account_id('cl_user') == acct.id
+            query.assert_not_called()
+        assert scraper._get_account_id('nobody') is None
+
+    def test_db_problem_status(self, app, db, scraper, sample_data):
+        from app.models import PlatformAccount, Problem, Submission
+        acct = PlatformAccount(
+            student_id=sample_data['student_id'], platform='coderlands',
+            platform_uid='cl_user',
+        )
+        problems = [Problem(platform='coderlands', problem_id=f'P{n}') for n in (1, 2, 3)]
+        db.session.add_all([acct, *problems])
+        db.session.flush()
+        db.session.add_all([
+            Submission(platform_account_id=acct.id, problem_id_ref=problems[0].id,
+                       platform_record_id='a', status='WA',
+                       submitted_at=datetime(2024, 1, 1)),
+            Submission(platform_account_id=acct.id, problem_id_ref=problems[0].id,
+                       platform_record_id='b', status='AC',
+                       submitted_at=datetime(2024, 1, 2)),
+            Submission(platform_account_id=acct.id, problem_id_ref=problems[1].id,
+                       platform_record_id='c', status='WA',
+                       submitted_at=datetime(2024, 1, 3)),
+        ])
+        db.session.commit()
+
+        assert scraper._get_db_problem_status('cl_user') == ({'1', '2', '3'}, {'1'})
+        assert scraper._get_db_problem_status('nobody') == ({'1', '2', '3'}, set())
+
+    def test_add_problem_nos(self):
+        from app.scrapers.coderlands import _add_problem_nos
+        ids = set()
+        _add_problem_nos(' 1001, P1002 p1003,\n1004 ,Pabc', ids)
+        assert ids == {'1001', '1002', '1003', '1004', 'Pabc'}
+
+    def test_problem_no(self):
+        from app.scrapers.coderlands import _problem_no
+        assert _problem_no('P1234') == '1234'
+        assert _problem_no('p7') == '7'
+        assert _problem_no('1234') is None
+        assert _problem_no('P') is None
+        assert _problem_no('P12a') is None
+        assert _problem_no('') is None
+
+    def test_uuid_cache_shared_across_instances(self, monkeypatch):
+        from app.scrapers import coderlands
+        monkeypatch.setattr(coderlands, '_shared_uuid_cache', {})
+        first = coderlands.CoderlandsScraper(auth_cookie='abc')
+        first._uuid_cache['42'] = 'f' * 32
+
+        second = coderlands.CoderlandsScraper(auth_cookie='abc')
+        monkeypatch.setattr(second, '_fetch_problem_uuid', lambda no: None)
+        assert second._problem_id_to_uuid_param('P42') == 'f' * 32
+
+    def test_parse_time_converts_utc8(self):
+        from app.scrapers.coderlands import CoderlandsScraper
+        parse = CoderlandsScraper._parse_time
+        assert parse('2024-01-15 14:30:00') == datetime(2024, 1, 15, 6, 30)
+        assert parse('2024-01-15T14:30:00') == datetime(2024, 1, 15, 6, 30)
+        assert parse('2024-01-15 14:30') == datetime(2024, 1, 15, 6, 30)
+        assert parse('2024-01-15T14:30:00+08:00') == datetime(2024, 1, 15, 6, 30)
+        assert parse('not a time') is None
+        assert parse('') is None
+
+    def test_api_get_decodes_utf8_body(self, scraper, monkeypatch):
+        from unittest.mock import MagicMock
+        resp = MagicMock()
+        resp.content = json.dumps(
+            {'code': 1, 'result': {'title': '数字统计'}}, ensure_ascii=False,
+        ).encode('utf-8')
+        monkeypatch.setattr(scraper, '_rate_limited_get', lambda url, **kw: resp)
+
+        assert scraper._api_get('/server/x') == {'title': '数字统计'}
+
+    def test_unresolvable_problem_is_not_retried(self, scraper, monkeypatch):
+        fetches, sweeps = [], []
+        monkeypatch.setattr(scraper, '_fetch_problem_uuid', fetches.append)
+        monkeypatch.setattr(scraper, '_build_uuid_map_from_lessons',
+                            lambda: sweeps.append(1))
+
+        assert scraper._problem_id_to_uuid_param('P404') == 'P404'
+        assert scraper._problem_id_to_uuid_param('P404') == 'P404'
+        assert fetches == ['404']
+        assert sweeps == [1]
+
+    def test_lesson_traversal_maps_all_lessons(self, scraper, monkeypatch):
+        monkeypatch.setattr(scraper, '_persist_uuids_to_db', lambda: None)
+        lessons = {
+            'L1': [{'uuid': 'a' * 32, 'name': 'P1 A+B'}],
+            'L2': [{'uuid': 'b' * 32, 'name': 'P2 数字统计'},
+                   {'uuid': 'c' * 32, 'name': '课堂笔记'}],
+        }
+
+        def fake_api_get(path):
+            if path.endswith('/myls'):
+                return {'classInfo': {'uuid': 'cls'},
+                        'lessonInfo': [{'uuid': 'L1'}, {'uuid': 'L2'}, {}]}
+            lesson = path.split('uuid=')[1].split('&')[0]
+            return {'dataList': lessons[lesson]}
+
+        monkeypatch.setattr(scraper, '_api_get', fake_api_get)
+        scraper._build_uuid_map_from_lessons()
+
+        assert scraper._uuid_cache == {'1': 'a' * 32, '2': 'b' * 32}
+
+    def test_lesson_traversal_propagates_session_expiry(self, scraper, monkeypatch):
+        from app.scrapers.coderlands import CoderlandsSessionExpired
+
+        def fake_api_get(path):
+            if path.endswith('/myls'):
+                return {'lessonInfo': [{'uuid': 'L1'}, {'uuid': 'L2'}]}
+            raise CoderlandsSessionExpired('expired')
+
+        monkeypatch.setattr(scraper, '_api_get', fake_api_get)
+        with pytest.raises(CoderlandsSessionExpired):
+            scraper._build_uuid_map_from_lessons()
+
+    def test_incremental_sync_overlaps_previous_snapshot(self, scraper, monkeypatch):
+        monkeypatch.setattr(scraper, '_fetch_exercise_data', lambda: ({'1'}, {'2'}))
+        monkeypatch.setattr(scraper, '_get_db_problem_status',
+                            lambda uid: ({'1', '2'}, set()))
+        monkeypatch.setattr(scraper, '_resolve_uuids', lambda nos: {n: n for n in nos})
+        calls = []
+
+        def fake_iter(uuid_map, new_problems, since):
+            calls.append((set(uuid_map), since))
+            return iter(())
+
+        monkeypatch.setattr(scraper, '_iter_submissions_parallel', fake_iter)
+
+        list(scraper.fetch_submissions(
+            'u', since=datetime(2024, 1, 1, 10, 30),
+            cursor='0123456789abcdef|2024-01-01T10:00:00',
+        ))
+
+        assert calls == [({'1', '2'}, datetime(2024, 1, 1, 9, 45))]
+        new_hash, captured_at = scraper._split_cursor(scraper._new_cursor)
+        assert new_hash == scraper._compute_exercise_hash({'1'}, {'2'})
+        assert captured_at is not None
+
+    def test_split_cursor_accepts_bare_hash(self, scraper):
+        assert scraper._split_cursor('0123456789abcdef') == ('0123456789abcdef', None)
+        assert scraper._split_cursor(None) == (None, None)
+
+    def test_result_unwrapping(self):
+        from app.scrapers.coderlands import _result_data, _result_items
+        assert _result_data({'data': {'code': 'x'}}) == {'code': 'x'}
+        assert _result_data({'problemNo': 1}) == {'problemNo': 1}
+        assert _result_data({'data': None}) == {}
+        assert _result_data([1]) == {}
+        assert _result_items({'dataList': [{'uuid': 'a'}]}) == [{'uuid': 'a'}]
+        assert _result_items([{'uuid': 'a'}]) == [{'uuid': 'a'}]
+        assert _result_items({'dataList': None}) == []
+        assert _result_items(None) == []
@@ -258,6 +258,85 @@ class TestSyncService:
         result = service.sync_account(acct_id)
         assert result['new_submissions'] == 0
 
+    @patch('app.services.sync_service.get_scraper_instance')
+    def test_sync_account_inserts_repeated_record_once(self, mock_get_scraper, app, db):
+        user = User(username='sync_dup', email='syncdup@test.com')
+        user.set_password('pw')
+        db.session.add(user)
+        db.session.flush()
+        student = Student(parent_id=user.id, name='sync_dup_kid')
+        db.session.add(student)
+        db.session.flush()
+        acct = PlatformAccount(
+            student_id=student.id,
+            platform='luogu',
+            platform_uid='dup_stream',
+            is_active=True,
+        )
+        db.session.add(acct)
+        db.session.commit()
+        acct_id = acct.id
+
+        mock_scraper = MagicMock()
+        mock_scraper.SUPPORT_CODE_FETCH = False
+        # A record shifted onto the next page mid-sync is yielded twice
+        scraped_subs = [
+            ScrapedSubmission(
+                platform_record_id=record_id,
+                problem_id='P5001',
+                status='WA',
+                submitted_at=datetime.utcnow(),
+            )
+            for record_id in ('rep_003', 'rep_001', 'rep_002', 'rep_001', 'rep_002')
+        ]
+        mock_scraper.fetch_submissions.return_value = iter(scraped_subs)
+        mock_scraper.fetch_problem.return_value = ScrapedProblem(
+            problem_id='P5001',
+            title='Mock Problem',
+        )
+        mock_scraper.map_difficulty.return_value = 1
+        mock_scraper.get_problem_url.return_value = 'https://example.com/P5001'
+        mock_get_scraper.return_value = mock_scraper
+
+        # rep_001 repeats across batches, rep_002 within one
+        with patch('app.services.sync_service._SUBMISSION_BATCH_SIZE', 2):
+            result = SyncService().sync_account(acct_id)
+
+        assert result['new_submissions'] == 3
+        assert Submission.query.filter_by(platform_account_id=acct_id).count() == 3
+
+    @patch('app.services.sync_service.get_scraper_instance')
+    def test_sync_account_flushes_once_per_batch(self, mock_get_scraper, app, db, sample_data):
+        from sqlalchemy import event
+        mock_scraper = MagicMock()
+        mock_scraper.SUPPORT_CODE_FETCH = False
+        problem = db.session.get(Problem, sample_data['problem_ids'][0])
+        mock_scraper.fetch_submissions.return_value = iter([
+            ScrapedSubmission(
+                platform_record_id=f'flush_{i}',
+                problem_id=problem.problem_id,
+                status='WA',
+                submitted_at=datetime.utcnow(),
+            )
+            for i in range(6)
+        ])
+        mock_scraper.fetch_problem.return_value = None
+        mock_get_scraper.return_value = mock_scraper
+
+        flushes = []
+        listener = lambda session, _ctx: flushes.append(len(session.new))
+        event.listen(db.session(), 'after_flush', listener)
+        try:
+            with patch('app.services.sync_service._SUBMISSION_BATCH_SIZE', 3):
+                result = SyncService().sync_account(sample_data['account_id'])
+        finally:
+            event.remove(db.session(), 'after_flush', listener)
+
+        assert result['new_submissions'] == 6
+        # The second batch's existence query flushes the first batch, and the
+        # final commit flushes the second: no flush per record
+        assert [n for n in flushes if n] == [3, 3]
+
     def test_sync_all_accounts(self, app, db):
         user = User(username='syncall', email='syncall@test.com')
         user.set_password('pw')
@@ -62,6 +62,21 @@ class TestUserSettingModel:
         assert UserSetting.get(uid, 'nonexistent') is None
         assert UserSetting.get(uid, 'nonexistent', 'fallback') == 'fallback'
 
+    def test_get_memoized_until_set(self, app, db, sample_data):
+        uid = sample_data['user_id']
+        UserSetting.set(uid, 'ai_provider', 'claude')
+        UserSetting.set(uid, 'ai_model', 'm1')
+        db.session.commit()
+        assert UserSetting.get_all(uid) == {'ai_provider': 'claude', 'ai_model': 'm1'}
+
+        # A write that bypasses set() is not seen within the same context
+        UserSetting.query.filter_by(user_id=uid, key='ai_model').update({'value': 'm2'})
+        assert UserSetting.get(uid, 'ai_model') == 'm1'
+
+        UserSetting.set(uid, 'ai_provider', 'openai')
+        assert UserSetting.get(uid, 'ai_provider') == 'openai'
+        assert UserSetting.get(uid, 'ai_model') == 'm2'
+
     def test_unique_constraint_user_key(self, app, db, sample_data):
         uid = sample_data['user_id']
         s1 = UserSetting(user_id=uid, key='dup_key', value='a')